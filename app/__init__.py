@@ -5,10 +5,11 @@ import contextlib
 import sys
 import json
 from flask import Flask, render_template, jsonify, request
+from werkzeug.exceptions import HTTPException
 from app.blueprints import main_bp, analysis_bp, stats_bp, settings_bp, history_bp
 from app.utilities.logger import logger, start_phase, end_phase, register_shutdown_handler, log_config_summary
 from app.config.config import Config
-from app.models.database import init_db, check_db_health
+from app.models.database import init_db, check_db_health, close_db_connection
 
 # Global instance tracking
 _app_instance = None
@@ -18,8 +19,66 @@ _server_started = False
 # Process tracking for Flask debug mode
 _is_reloader_process = os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
 
-def create_app():
-    """Create and configure the Flask application."""
+# Heading and message for each handled error status, shared by the pages and HTMX fragments
+_ERROR_MESSAGES = {
+    400: ("Bad Request", "The server could not understand your request."),
+    403: ("Access Forbidden", "You do not have permission to access this page."),
+    404: ("Page Not Found", "The page you requested could not be found."),
+    429: ("Rate Limit Exceeded", "You have made too many requests. Please wait a moment and try again."),
+    500: ("Server Error", "An unexpected error occurred. Please try again."),
+}
+
+# Prebuilt error fragments for HTMX requests, which swap in a snippet rather than a full page
+_HTMX_ERROR_FRAGMENTS = {
+    code: f'<div class="alert alert-danger" role="alert">{title}: {message}</div>'.encode('utf-8')
+    for code, (title, message) in _ERROR_MESSAGES.items()
+}
+
+def _render_error(code, **context):
+    """Render the errors/<code>.html page, or the prebuilt fragment for HTMX requests."""
+    # HTMX swaps the response into the page; skip template rendering
+    if request.headers.get('HX-Request') == 'true':
+        return _HTMX_ERROR_FRAGMENTS[code], code
+    
+    title, message = _ERROR_MESSAGES[code]
+    return render_template(f'errors/{code}.html', title=title, message=message, **context), code
+
+def _register_error_handlers(app):
+    """Register the application error handlers."""
+    @app.errorhandler(HTTPException)
+    def handle_http_error(e):
+        # Matched by status code so custom HTTPException subclasses get the page too
+        if e.code not in _ERROR_MESSAGES:
+            return e
+        return _render_error(e.code, error=e)
+    
+    @app.errorhandler(500)
+    def handle_500_error(e):
+        # Unhandled exceptions arrive wrapped in InternalServerError
+        original = getattr(e, 'original_exception', None) or e
+        error_type = type(original).__name__
+        error_message = str(original)
+        
+        if 'OpenAI' in error_type:
+            message = f"OpenAI API Error: {error_message}"
+        elif 'Database' in error_type:
+            message = f"Database Error: {error_message}"
+        elif 'Timeout' in error_type:
+            message = f"Request Timeout: {error_message}"
+        else:
+            message = f"Server Error: {error_message}"
+        
+        logger.error(f"500 Error: {error_type} - {error_message}")
+        return _render_error(500, error=e, details=message)
+
+def create_app(test_config=None):
+    """
+    Create and configure the Flask application.
+    
+    Args:
+        test_config: Optional config overrides, applied before the database is
+            touched so tests never open the configured production database.
+    """
     global _app_instance, _initialization_complete
     
     # Return existing instance if already initialized
@@ -32,6 +91,8 @@ def create_app():
                 static_url_path='/static',
                 template_folder=os.path.abspath('templates'))
     app.config.from_object(Config)
+    if test_config:
+        app.config.update(test_config)
     
     # Configure Flask logging to use our custom logger
     app.logger.handlers = []
@@ -39,6 +100,12 @@ def create_app():
         app.logger.addHandler(handler)
     app.logger.setLevel(logger.level)
     
+    # Release the thread's cached database connection when the context ends
+    app.teardown_appcontext(close_db_connection)
+    
+    # Register error handlers; the reloader process serves requests too
+    _register_error_handlers(app)
+    
     # Only perform full initialization in the worker process, not the reloader
     if _is_reloader_process:
         logger.debug("Running in Flask reloader process - skipping full initialization")
@@ -77,16 +144,18 @@ def create_app():
         for error in validation_errors:
             logger.warning(f"Configuration validation warning: {error}")
     
-    # Check database health before initialization
-    logger.info("Performing database health check...")
-    db_healthy = check_db_health()
-    
-    if not db_healthy:
-        logger.warning("Database health check failed. Attempting to initialize database anyway.")
-    
-    # Initialize database
-    logger.info("Performing database initialization...")
-    init_db()
+    # Run the database checks against the app's DB_PATH, not the Config default
+    with app.app_context():
+        # Check database health before initialization
+        logger.info("Performing database health check...")
+        db_healthy = check_db_health()
+        
+        if not db_healthy:
+            logger.warning("Database health check failed. Attempting to initialize database anyway.")
+        
+        # Initialize database
+        logger.info("Performing database initialization...")
+        init_db()
     
     # Check OpenAI API availability
     logger.info("Checking OpenAI API availability...")
@@ -177,24 +246,6 @@ def create_app():
         
         return response
     
-    # Register error handlers
-    @app.errorhandler(500)
-    def handle_500_error(e):
-        error_type = type(e).__name__
-        error_message = str(e)
-        
-        if 'OpenAI' in error_type:
-            message = f"OpenAI API Error: {error_message}"
-        elif 'Database' in error_type:
-            message = f"Database Error: {error_message}"
-        elif 'Timeout' in error_type:
-            message = f"Request Timeout: {error_message}"
-        else:
-            message = f"Server Error: {error_message}"
-        
-        logger.error(f"500 Error: {error_type} - {error_message}")
-        return render_template('error.html', error=message), 500
-    
     # Register graceful shutdown handler
     def graceful_shutdown(*args, **kwargs):
         """Perform cleanup operations before shutdown.
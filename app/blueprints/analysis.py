@@ -19,7 +19,7 @@ from app.utilities.export import (
 )
 from app.utilities.logger import get_logger, print_status, error, warning, info, debug
 from app.utilities.sanitizers import sanitize_input
-from app.models.database import store_analysis, update_analysis, get_analysis_by_url, track_token_usage, store_indicators, get_indicators_by_url, get_indicators_by_article_id
+from app.models.database import store_analysis, store_analysis_returning_id, update_analysis, get_analysis_by_url, track_token_usage, store_indicators, get_indicators_by_url, get_indicators_by_article_id
 from app.config.config import Config
 
 analysis_bp = Blueprint('analysis', __name__)
@@ -389,8 +389,8 @@ def analysis_result():
                 analysis_result = analyze_article(article_content, url, model=model, verbose=True, structured=True, extract_iocs=True)
                 analysis_time = time.time() - analysis_start
                 
-                # Store the results
-                store_analysis(
+                # Store the results and keep the new article ID
+                article_id = store_analysis_returning_id(
                     url=url,
                     title=article_title,
                     content_length=len(article_content),
@@ -401,10 +401,6 @@ def analysis_result():
                     structured_analysis=analysis_result.get('structured', {})
                 )
                 
-                # Get the article ID
-                new_analysis = get_analysis_by_url(url)
-                article_id = new_analysis.get('id') if new_analysis else None
-                
                 # Extract and store indicators if we have an article ID
                 indicators = {}
                 if article_id:
@@ -1,15 +1,16 @@
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
 import os
 import json
-import sqlite3
 import subprocess
 import sys
 import signal
+import stat
+import tempfile
 import threading
 import time
 from typing import Dict, Any
 from app.config.config import Config
-from app.models.database import get_token_usage_stats
+from app.models.database import get_token_usage_stats, get_db_connection
 from dotenv import load_dotenv
 import logging
 from pathlib import Path
@@ -89,9 +90,9 @@ def update_env():
         elif not new_env_vars["OPENAI_API_KEY"]:
             new_env_vars["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY", "")
         
-        # Read current .env file
+        # Read current .env file in one call; splitlines drops the newlines
         with open(".env", "r") as f:
-            env_content = f.readlines()
+            env_content = f.read().splitlines()
         
         # Update the environment variables in the .env file
         updated_lines = []
@@ -115,9 +116,20 @@ def update_env():
             if key not in updated_vars and value:
                 updated_lines.append(f"{key}={value}")
         
-        # Write back to .env file
-        with open(".env", "w") as f:
-            f.write('\n'.join(updated_lines))
+        # Write to a temp file and swap it in atomically, so a failed write
+        # never leaves a truncated .env behind. mkstemp gives each request its
+        # own 0600 file; it then takes the original mode so the swap keeps it.
+        fd, tmp_path = tempfile.mkstemp(dir=".", prefix=".env.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write('\n'.join(updated_lines))
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(".env").st_mode))
+            os.replace(tmp_path, ".env")
+        except Exception:
+            os.unlink(tmp_path)
+            raise
         
         # Reload environment variables
         load_dotenv(override=True)
@@ -147,22 +159,19 @@ def purge_database():
                 "message": "Confirmation text does not match 'DELETE'. Database was not purged."
             })
         
-        # Connect to the database
-        conn = sqlite3.connect(Config.DB_PATH)
-        cursor = conn.cursor()
-        
-        # Delete all records from all tables
-        cursor.execute("DELETE FROM analysis_results")
-        cursor.execute("DELETE FROM articles")
-        cursor.execute("DELETE FROM token_usage")
-        
-        # Reset auto-increment counters
-        cursor.execute("DELETE FROM sqlite_sequence WHERE name='analysis_results'")
-        cursor.execute("DELETE FROM sqlite_sequence WHERE name='articles'")
-        cursor.execute("DELETE FROM sqlite_sequence WHERE name='token_usage'")
-        
-        conn.commit()
-        conn.close()
+        # Connect to the app's database (DB_PATH from the app config)
+        with get_db_connection() as (conn, cursor):
+            # Delete all records from all tables
+            cursor.execute("DELETE FROM analysis_results")
+            cursor.execute("DELETE FROM articles")
+            cursor.execute("DELETE FROM token_usage")
+            
+            # Reset auto-increment counters
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name='analysis_results'")
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name='articles'")
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name='token_usage'")
+            
+            conn.commit()
         
         return jsonify({"success": True, "message": "Database purged successfully"})
     except Exception as e:
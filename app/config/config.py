@@ -1,5 +1,5 @@
 import os
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Mapping
 from dotenv import load_dotenv
 import json
 import logging
@@ -22,6 +22,86 @@ _openai_api_last_check = 0               # Timestamp of the last API check
 _openai_api_check_lock = threading.Lock() # Lock for thread-safe updates to API status
 _CONFIG_VALIDATION_ERRORS = []           # Stores configuration validation errors
 
+# Default models used when AVAILABLE_MODELS is not set or invalid
+_DEFAULT_MODELS = {
+    "gpt-4o-mini-2024-07-18": {
+        "name": "GPT-4o mini",
+        "recommended_for": "Quick analysis of news articles and blog posts",
+    },
+    "gpt-4o-2024-08-06": {
+        "name": "GPT-4o",
+        "recommended_for": "Detailed analysis of technical reports and research papers",
+    },
+    "gpt-4.5-preview-2025-02-27": {
+        "name": "GPT-4.5 Preview",
+        "recommended_for": "In-depth analysis of complex threat reports and intelligence briefs",
+    }
+}
+
+# Default model pricing information (per 1K tokens)
+_MODEL_PRICES = {
+    "gpt-4o-mini-2024-07-18": {
+        "input": 0.15,
+        "cached": 0.075,
+        "output": 0.6
+    },
+    "gpt-4o-2024-08-06": {
+        "input": 0.5,
+        "cached": 0.25,
+        "output": 1.5
+    },
+    "gpt-4.5-preview-2025-02-27": {
+        "input": 1.0,
+        "cached": 0.5,
+        "output": 3.0
+    }
+}
+
+# Model aliases mapping specific versions to their base models
+_DIRECT_MAP = {
+    "gpt-4o-2024-08-06": "gpt-4o",
+    "gpt-4o-mini-2024-07-18": "gpt-4o-mini",
+    "gpt-4.5-preview-2025-02-27": "gpt-4.5-preview"
+}
+
+# Trailing date (-2024-08-06) or short version (-0125) suffix on versioned model IDs
+_VERSION_SUFFIX = re.compile(r'-(20\d{2}-\d{2}-\d{2}|\d{4})$')
+
+# Log level names accepted in LOG_LEVEL, mapped to logging constants
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL
+}
+
+# Fallback OpenAI temperature when OPENAI_TEMPERATURE is unset or invalid
+_DEFAULT_TEMPERATURE = 0.0
+
+# Base models recognized inside otherwise unmatched model IDs
+_KNOWN_BASE_MODELS = ("gpt-4o", "gpt-4o-mini", "gpt-4.5-preview")
+
+@lru_cache(maxsize=8)
+def _parse_models(raw: Optional[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Parse an AVAILABLE_MODELS value, falling back to the default models.
+    Cached on the raw string, so a changed environment value is parsed afresh.
+    
+    Args:
+        raw: The raw AVAILABLE_MODELS environment value (may be None)
+        
+    Returns:
+        Dictionary of model configurations (shared; do not mutate)
+    """
+    try:
+        return json.loads(raw) if raw else _DEFAULT_MODELS
+    except json.JSONDecodeError:
+        # Log warning and use defaults if parsing fails
+        from app.utilities.logger import warning
+        warning("Failed to parse AVAILABLE_MODELS from environment, using defaults")
+        return _DEFAULT_MODELS
+
 class Config:
     """
     Configuration settings for the ThreatInsight-Analyzer application.
@@ -94,7 +174,7 @@ class Config:
     OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")  # API endpoint
     OPENAI_API_TIMEOUT = int(os.getenv("OPENAI_API_TIMEOUT", "60"))  # Timeout for API requests in seconds
     DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini-2024-07-18")  # Default model for analysis
-    DEFAULT_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.0"))  # Controls randomness
+    DEFAULT_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", str(_DEFAULT_TEMPERATURE)))  # Controls randomness
     MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "1500"))
     
     #######################################################################
@@ -136,23 +216,20 @@ class Config:
     #######################################################################
     
     @staticmethod
-    def get_log_level() -> int:
+    def get_log_level(env: Optional[Mapping[str, str]] = None) -> int:
         """
         Convert the string log level from environment to the corresponding
         logging module constant.
         
+        Args:
+            env: Optional mapping to read LOG_LEVEL from instead of the
+                 value loaded at startup
+        
         Returns:
             The logging level constant (e.g., logging.INFO)
         """
-        level_name = Config.LOG_LEVEL
-        level_map = {
-            "DEBUG": logging.DEBUG,
-            "INFO": logging.INFO,
-            "WARNING": logging.WARNING,
-            "ERROR": logging.ERROR,
-            "CRITICAL": logging.CRITICAL
-        }
-        return level_map.get(level_name, logging.INFO)  # Default to INFO if level not recognized
+        level_name = Config.LOG_LEVEL if env is None else env.get("LOG_LEVEL", "INFO").upper()
+        return _LOG_LEVELS.get(level_name, logging.INFO)  # Default to INFO if level not recognized
     
     @staticmethod
     def get_as_dict() -> Dict[str, Any]:
@@ -207,16 +284,14 @@ class Config:
             errors.append("OPENAI_API_KEY is missing. Set it in .env file or environment.")
             
         # Check database path is writeable
-        # Create the directory if it doesn't exist
-        db_dir = os.path.dirname(Config.DB_PATH)
-        if not os.path.exists(db_dir):
-            try:
-                os.makedirs(db_dir, exist_ok=True)
-            except Exception as e:
-                errors.append(f"Database directory {db_dir} cannot be created: {e}")
-        else:
-            if not os.access(db_dir, os.W_OK):
-                errors.append(f"Database directory {db_dir} is not writeable.")
+        # A missing directory is created on first connection, so check the
+        # nearest existing ancestor instead of creating it here
+        db_dir = os.path.dirname(Config.DB_PATH) or '.'
+        existing = os.path.abspath(db_dir)
+        while not os.path.exists(existing):
+            existing = os.path.dirname(existing)
+        if not os.access(existing, os.W_OK):
+            errors.append(f"Database directory {db_dir} is not writeable.")
         
         # Check log directory is writeable
         # Create the directory if it doesn't exist
@@ -265,31 +340,7 @@ class Config:
         Returns:
             Dictionary of model configurations
         """
-        # Default models if environment variable is not set or invalid
-        default_models = {
-            "gpt-4o-mini-2024-07-18": {
-                "name": "GPT-4o mini",
-                "recommended_for": "Quick analysis of news articles and blog posts",
-            },
-            "gpt-4o-2024-08-06": {
-                "name": "GPT-4o",
-                "recommended_for": "Detailed analysis of technical reports and research papers",
-            },
-            "gpt-4.5-preview-2025-02-27": {
-                "name": "GPT-4.5 Preview",
-                "recommended_for": "In-depth analysis of complex threat reports and intelligence briefs",
-            }
-        }
-        
-        try:
-            # Attempt to parse AVAILABLE_MODELS from environment
-            models_env = os.getenv("AVAILABLE_MODELS")
-            return json.loads(models_env) if models_env else default_models
-        except (json.JSONDecodeError, NameError):
-            # Log warning and use defaults if parsing fails
-            from app.utilities.logger import warning
-            warning("Failed to parse AVAILABLE_MODELS from environment, using defaults")
-            return default_models
+        return _parse_models(os.getenv("AVAILABLE_MODELS"))
 
     @staticmethod
     def get_model_prices() -> Dict[str, Dict[str, float]]:
@@ -300,24 +351,7 @@ class Config:
         Returns:
             Dictionary mapping model IDs to pricing information
         """
-        # Default model pricing information (per 1K tokens)
-        return {
-            "gpt-4o-mini-2024-07-18": {
-                "input": 0.15,
-                "cached": 0.075,
-                "output": 0.6
-            },
-            "gpt-4o-2024-08-06": {
-                "input": 0.5,
-                "cached": 0.25,
-                "output": 1.5
-            },
-            "gpt-4.5-preview-2025-02-27": {
-                "input": 1.0,
-                "cached": 0.5,
-                "output": 3.0
-            }
-        }
+        return _MODEL_PRICES
         
     @staticmethod
     def normalize_model_id(model_id: str) -> str:
@@ -331,24 +365,17 @@ class Config:
         if not model_id:
             return "gpt-4o-mini-2024-07-18"  # Default model if none specified
             
-        # Define model aliases to map specific versions to their base models
-        model_aliases = {
-            "gpt-4o-2024-08-06": "gpt-4o",
-            "gpt-4o-mini-2024-07-18": "gpt-4o-mini",
-            "gpt-4.5-preview-2025-02-27": "gpt-4.5-preview"
-        }
-        
         # Check if there's a direct alias mapping
-        if model_id in model_aliases:
-            return model_aliases[model_id]
+        base_model = _DIRECT_MAP.get(model_id)
+        if base_model is not None:
+            return base_model
         
         # For standard versioned models, try to extract the base model
-        base_model = re.sub(r'-(20\d{2}-\d{2}-\d{2}|\d{4})$', '', model_id)
+        base_model = _VERSION_SUFFIX.sub('', model_id)
         
         # If we didn't find a specific match, try matching to known base models
         if base_model == model_id:
-            known_base_models = ["gpt-4o", "gpt-4o-mini", "gpt-4.5-preview"]
-            for known_model in known_base_models:
+            for known_model in _KNOWN_BASE_MODELS:
                 if known_model in model_id:
                     return known_model
         
@@ -370,7 +397,7 @@ class Config:
         }
     
     @staticmethod
-    def get_default_temperature() -> float:
+    def get_default_temperature(env: Optional[Mapping[str, str]] = None) -> float:
         """
         Get the default temperature setting for OpenAI API calls.
         Temperature controls randomness in the model's output:
@@ -380,10 +407,19 @@ class Config:
         For threat analysis, lower temperatures (0.0-0.3) are preferred
         for more factual, consistent results.
         
+        Args:
+            env: Optional mapping to read OPENAI_TEMPERATURE from instead of
+                 the value loaded at startup
+        
         Returns:
             Default temperature value from OPENAI_TEMPERATURE env var
         """
-        return Config.DEFAULT_TEMPERATURE
+        if env is None:
+            return Config.DEFAULT_TEMPERATURE
+        try:
+            return float(env.get("OPENAI_TEMPERATURE", _DEFAULT_TEMPERATURE))
+        except ValueError:
+            return _DEFAULT_TEMPERATURE
             
     @staticmethod
     def get_default_seed() -> int:
@@ -4,42 +4,168 @@ import os
 import traceback
 import contextlib
 import time
+import atexit
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union, Tuple, Callable, NoReturn
 from contextlib import contextmanager
 
+from flask import current_app, has_app_context
+
+from app.config.config import Config
 from app.utilities.logger import info, debug, error, warning, critical
+from app.utilities.json_utils import json_loads
 
 # Global flag to track initialization status
 _DB_INITIALIZED = False
 _STARTUP_HEALTH_CHECK_COMPLETED = False
 
-# Ensure the data directory exists
-os.makedirs('data', exist_ok=True)
+# Database paths that have already been switched to WAL journaling
+_WAL_ENABLED_PATHS = set()
+
+# Per-connection tuning applied on every new connection
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Per-thread cached connection (attributes: conn, path, depth)
+_tls = threading.local()
+
+def _get_db_path() -> str:
+    """
+    Resolve the database path, preferring the active Flask app's config.
+    
+    Falls back to Config.DB_PATH outside an application context. The path
+    may be a ``file:`` URI (e.g. a shared in-memory database in tests).
+    """
+    if has_app_context():
+        return current_app.config.get('DB_PATH', Config.DB_PATH)
+    return Config.DB_PATH
+
+def _apply_pragmas(conn: sqlite3.Connection, db_path: str) -> None:
+    """
+    Apply performance PRAGMAs to a freshly opened connection.
+    
+    WAL journaling is persistent in the database file, so it is only set once
+    per path and skipped for in-memory databases.
+    """
+    if db_path not in _WAL_ENABLED_PATHS:
+        if 'mode=memory' not in db_path and db_path != ':memory:':
+            conn.execute("PRAGMA journal_mode=WAL")
+        _WAL_ENABLED_PATHS.add(db_path)
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+def close_db_connection(exception: Optional[BaseException] = None) -> None:
+    """
+    Close the calling thread's cached database connection, if any.
+    
+    Registered as a Flask teardown_appcontext handler and at interpreter exit.
+    """
+    conn = getattr(_tls, 'conn', None)
+    _tls.conn = None
+    _tls.path = None
+    if conn is not None:
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            warning(f"Error closing database connection: {e}")
+
+atexit.register(close_db_connection)
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open a configured connection to db_path, creating its directory if needed."""
+    if not db_path.startswith('file:') and db_path != ':memory:':
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30.0, uri=True)  # Add timeout for busy database
+    _apply_pragmas(conn, db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+class _SavepointConnection:
+    """
+    Connection handed to a nested get_db_connection frame.
+    
+    The frame runs inside a SAVEPOINT on the outer frame's connection, so it
+    can't commit or roll back work the outer frame has not finished. commit()
+    keeps the frame's work: it is committed straight away if the outer frame
+    has no open transaction, otherwise it joins the outer transaction.
+    rollback() and errors only undo the frame's own work.
+    """
+    
+    def __init__(self, conn: sqlite3.Connection, name: str):
+        self._conn = conn
+        self._name = name
+        conn.execute(f"SAVEPOINT {name}")
+    
+    def __getattr__(self, attr):
+        return getattr(self._conn, attr)
+    
+    def commit(self) -> None:
+        self._conn.execute(f"RELEASE {self._name}")
+        self._conn.execute(f"SAVEPOINT {self._name}")
+    
+    def rollback(self) -> None:
+        self._conn.execute(f"ROLLBACK TO {self._name}")
+    
+    def release(self) -> None:
+        """Drop the savepoint, discarding work that was not committed."""
+        self.rollback()
+        self._conn.execute(f"RELEASE {self._name}")
 
 @contextmanager
 def get_db_connection():
     """
     Context manager for database connections to ensure proper resource handling.
+    
+    The underlying connection is cached per thread and reused while the
+    database path is unchanged; only the cursor is closed on exit. Any
+    transaction left open by the outermost caller is rolled back, matching
+    the old close-on-exit behaviour. Nested uses run in a savepoint (see
+    _SavepointConnection), or on a private connection if the path changed.
     Usage:
         with get_db_connection() as (conn, cursor):
             cursor.execute(...)
     """
-    from app.config.config import Config
     conn = None
+    cursor = None
+    depth = getattr(_tls, 'depth', 0)
     try:
-        conn = sqlite3.connect(Config.DB_PATH, timeout=30.0)  # Add timeout for busy database
-        conn.row_factory = sqlite3.Row
+        db_path = _get_db_path()
+        if depth and _tls.path == db_path:
+            conn = _SavepointConnection(_tls.conn, f"nested_{depth}")
+        elif depth:
+            # The outer frame is still using the cached connection
+            conn = _connect(db_path)
+        else:
+            conn = getattr(_tls, 'conn', None)
+            if conn is None or _tls.path != db_path:
+                close_db_connection()
+                conn = _connect(db_path)
+                _tls.conn = conn
+                _tls.path = db_path
         cursor = conn.cursor()
-        yield conn, cursor
+        _tls.depth = depth + 1
+        try:
+            yield conn, cursor
+        finally:
+            _tls.depth = depth
     except Exception as e:
         error(f"Database connection error: {e}")
         if conn:
             conn.rollback()
         raise
     finally:
-        if conn:
+        if cursor:
+            cursor.close()
+        if isinstance(conn, _SavepointConnection):
+            conn.release()
+        elif conn and conn is not _tls.conn:
             conn.close()
+        elif conn and conn.in_transaction:
+            conn.rollback()
 
 def execute_query(query: str, params: tuple = (), fetch_type: str = None) -> Any:
     """
@@ -134,7 +260,7 @@ def get_db_version(conn: sqlite3.Connection) -> int:
 def get_latest_db_version() -> int:
     """Get the latest available database version in the codebase."""
     # This should return the latest version number based on available migrations
-    return 2  # Update this when adding new migrations
+    return 3  # Update this when adding new migrations
 
 def init_db(force_initialization=False) -> None:
     """
@@ -156,6 +282,14 @@ def init_db(force_initialization=False) -> None:
         with contextlib.ExitStack() as stack:
             conn, cursor = stack.enter_context(get_db_connection())
             
+            # Fast path: user_version is stamped once the schema is fully migrated
+            if not force_initialization:
+                cursor.execute("PRAGMA user_version")
+                if cursor.fetchone()[0] == get_latest_db_version():
+                    debug("Database schema is up to date, skipping table creation")
+                    _DB_INITIALIZED = True
+                    return
+            
             # Create db_version table to track schema migrations
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS db_version (
@@ -245,6 +379,10 @@ def init_db(force_initialization=False) -> None:
                     conn.commit()
                 except sqlite3.Error as e:
                     warning(f"Could not create some indexes: {e}")
+            
+            # Stamp the schema version so later startups can skip the DDL above
+            cursor.execute(f"PRAGMA user_version = {int(get_db_version(conn))}")
+            conn.commit()
     
             # Mark as initialized
             _DB_INITIALIZED = True
@@ -406,9 +544,19 @@ def migrate_db(conn: sqlite3.Connection, current_version: int) -> None:
             cursor.execute("INSERT INTO db_version (version) VALUES (?)", (2,))
             info("Migration to version 2 completed successfully")
             
+        # Migration to version 3
+        if current_version < 3:
+            info("Migrating database to version 3...")
+            
+            # Covering index so per-type indicator stats are index-only scans
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_indicators_type_value ON indicators (indicator_type, value)')
+            
+            cursor.execute("INSERT INTO db_version (version) VALUES (?)", (3,))
+            info("Migration to version 3 completed successfully")
+            
         # Add future migrations here
-        # if current_version < 3:
-        #     info("Migrating database to version 3...")
+        # if current_version < 4:
+        #     info("Migrating database to version 4...")
             
         conn.commit()
         info(f"Database migrated successfully to version {get_latest_db_version()}")
@@ -418,6 +566,54 @@ def migrate_db(conn: sqlite3.Connection, current_version: int) -> None:
         error(f"Database migration error: {e}")
         raise
 
+def _extract_article_fields(structured_analysis: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
+    """
+    Pull the denormalized article columns out of a structured analysis.
+    
+    Returns:
+        Tuple of (summary, reliability, credibility, threat_actors_json, critical_sectors_json)
+    """
+    summary = structured_analysis.get("summary", "")
+    
+    # Extract source reliability and credibility
+    source_eval = structured_analysis.get("source_evaluation", {})
+    reliability = source_eval.get("reliability", {}).get("level", "Medium") if source_eval else "Medium"
+    credibility = source_eval.get("credibility", {}).get("level", "Medium") if source_eval else "Medium"
+    
+    # Extract threat actors
+    threat_actors = []
+    for actor in structured_analysis.get("threat_actors", []):
+        if "name" in actor:
+            threat_actors.append(actor["name"])
+    
+    # Extract critical sectors
+    critical_sectors = {}
+    for sector in structured_analysis.get("critical_sectors", []):
+        if "name" in sector and "score" in sector:
+            critical_sectors[sector["name"]] = sector["score"]
+    
+    return summary, reliability, credibility, json.dumps(threat_actors), json.dumps(critical_sectors)
+
+def _structured_payload(structured_analysis: Union[Dict[str, Any], str]) -> Tuple[Dict[str, Any], str]:
+    """
+    Return the structured analysis as both a dict and its stored JSON text.
+    
+    A JSON string (e.g. straight from the model response) is stored as-is
+    instead of being re-serialized; dicts are dumped compactly.
+    """
+    if isinstance(structured_analysis, str):
+        return json_loads(structured_analysis), structured_analysis
+    return structured_analysis, json.dumps(structured_analysis, separators=(",", ":"))
+
+_INSERT_ARTICLE_SQL = """
+    INSERT INTO articles (
+        url, title, content_length, extraction_time, analysis_time, model, 
+        created_at, summary, source_reliability, source_credibility, 
+        threat_actors, critical_sectors
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO NOTHING
+"""
+
 def store_analysis(
     url: str, 
     title: str, 
@@ -426,73 +622,133 @@ def store_analysis(
     analysis_time: float, 
     model: str, 
     raw_analysis: str, 
-    structured_analysis: Dict[str, Any]
+    structured_analysis: Union[Dict[str, Any], str],
+    created_at: Optional[str] = None
 ) -> bool:
-    """Store analysis results in the database."""
+    """
+    Store analysis results in the database.
+    
+    Args:
+        created_at: Optional ISO timestamp for the article; defaults to now
+        
+    Returns:
+        True if stored, False if the URL already exists or on error
+    """
+    return store_analysis_returning_id(
+        url, title, content_length, extraction_time, analysis_time,
+        model, raw_analysis, structured_analysis, created_at=created_at
+    ) is not None
+
+def store_analysis_returning_id(
+    url: str, 
+    title: str, 
+    content_length: int, 
+    extraction_time: float, 
+    analysis_time: float, 
+    model: str, 
+    raw_analysis: str, 
+    structured_analysis: Union[Dict[str, Any], str],
+    created_at: Optional[str] = None
+) -> Optional[int]:
+    """
+    Store analysis results and return the new article ID.
+    
+    Saves callers a get_analysis_by_url round-trip to recover the ID.
+    
+    Returns:
+        The new article ID, or None if the URL already exists or on error
+    """
     info(f"Storing analysis results for URL: {url}")
     debug(f"Analysis details: model={model}, content_length={content_length}, extraction_time={extraction_time:.2f}s, analysis_time={analysis_time:.2f}s")
     
     try:
         with get_db_connection() as (conn, cursor):
             # Extract optimized fields
-            summary = structured_analysis.get("summary", "")
-            
-            # Extract source reliability and credibility
-            source_eval = structured_analysis.get("source_evaluation", {})
-            reliability = source_eval.get("reliability", {}).get("level", "Medium") if source_eval else "Medium"
-            credibility = source_eval.get("credibility", {}).get("level", "Medium") if source_eval else "Medium"
-            
-            # Extract threat actors
-            threat_actors = []
-            for actor in structured_analysis.get("threat_actors", []):
-                if "name" in actor:
-                    threat_actors.append(actor["name"])
-            threat_actors_json = json.dumps(threat_actors)
-            
-            # Extract critical sectors
-            critical_sectors = {}
-            for sector in structured_analysis.get("critical_sectors", []):
-                if "name" in sector and "score" in sector:
-                    critical_sectors[sector["name"]] = sector["score"]
-            critical_sectors_json = json.dumps(critical_sectors)
+            structured_analysis, structured_json = _structured_payload(structured_analysis)
+            summary, reliability, credibility, threat_actors_json, critical_sectors_json = \
+                _extract_article_fields(structured_analysis)
             
             # Insert article info with optimized fields
             debug(f"Inserting article info: {title}")
             cursor.execute(
-                """
-                INSERT INTO articles (
-                    url, title, content_length, extraction_time, analysis_time, model, 
-                    created_at, summary, source_reliability, source_credibility, 
-                    threat_actors, critical_sectors
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _INSERT_ARTICLE_SQL,
                 (
                     url, title, content_length, extraction_time, analysis_time, model, 
-                    datetime.now().isoformat(), summary, reliability, credibility, 
+                    created_at or datetime.now().isoformat(), summary, reliability, credibility, 
                     threat_actors_json, critical_sectors_json
                 )
             )
+            if cursor.rowcount == 0:
+                # URL already exists; the UNIQUE index rejected the row
+                warning(f"URL already exists in database: {url}")
+                return None
             article_id = cursor.lastrowid
             
             # Insert analysis results
             debug(f"Inserting analysis results for article_id: {article_id}")
             cursor.execute(
                 "INSERT INTO analysis_results (article_id, raw_text, structured_data) VALUES (?, ?, ?)",
-                (article_id, raw_analysis, json.dumps(structured_analysis))
+                (article_id, raw_analysis, structured_json)
             )
             
             conn.commit()
             info(f"Analysis results stored successfully for URL: {url}")
-            return True
-    except sqlite3.IntegrityError:
-        # URL already exists
-        warning(f"URL already exists in database: {url}")
-        return False
+            return article_id
     except Exception as e:
         error_details = traceback.format_exc()
         error(f"Error storing analysis: {e}")
         error(f"Traceback: {error_details}")
-        return False
+        return None
+
+def store_analyses_bulk(rows: List[Dict[str, Any]]) -> int:
+    """
+    Store many analyses in a single transaction.
+    
+    Each row holds the store_analysis keyword arguments (created_at optional).
+    Rows whose URL already exists are skipped.
+    
+    Args:
+        rows: List of analysis dictionaries
+        
+    Returns:
+        Number of articles inserted (0 on error)
+    """
+    info(f"Bulk storing {len(rows)} analyses")
+    
+    try:
+        with get_db_connection() as (conn, cursor):
+            now = datetime.now().isoformat()
+            article_rows = []
+            result_rows = []
+            for row in rows:
+                structured, structured_json = _structured_payload(row['structured_analysis'])
+                article_rows.append((
+                    row['url'], row['title'], row['content_length'], row['extraction_time'],
+                    row['analysis_time'], row['model'], row.get('created_at') or now,
+                    *_extract_article_fields(structured)
+                ))
+                result_rows.append((row['raw_analysis'], structured_json, row['url']))
+            
+            cursor.executemany(_INSERT_ARTICLE_SQL, article_rows)
+            inserted = cursor.rowcount
+            
+            # Attach results by URL; duplicates already have results and are ignored
+            cursor.executemany(
+                """
+                INSERT OR IGNORE INTO analysis_results (article_id, raw_text, structured_data)
+                SELECT id, ?, ? FROM articles WHERE url = ?
+                """,
+                result_rows
+            )
+            
+            conn.commit()
+            info(f"Bulk stored {inserted} of {len(rows)} analyses")
+            return inserted
+    except Exception as e:
+        error_details = traceback.format_exc()
+        error(f"Error bulk storing analyses: {e}")
+        error(f"Traceback: {error_details}")
+        return 0
 
 def update_analysis(
     url: str, 
@@ -502,7 +758,7 @@ def update_analysis(
     analysis_time: float, 
     model: str, 
     raw_analysis: str, 
-    structured_analysis: Dict[str, Any]
+    structured_analysis: Union[Dict[str, Any], str]
 ) -> bool:
     """
     Update an existing analysis in the database, completely replacing previous data.
@@ -513,38 +769,10 @@ def update_analysis(
     
     try:
         with get_db_connection() as (conn, cursor):
-            # Check if article exists and get its ID
-            cursor.execute("SELECT id FROM articles WHERE url = ?", (url,))
-            result = cursor.fetchone()
-            
-            if not result:
-                error(f"Cannot update analysis: URL not found in database: {url}")
-                return False
-                
-            article_id = result['id']
-            debug(f"Found existing article_id: {article_id} for URL: {url}")
-            
             # Extract optimized fields
-            summary = structured_analysis.get("summary", "")
-            
-            # Extract source reliability and credibility
-            source_eval = structured_analysis.get("source_evaluation", {})
-            reliability = source_eval.get("reliability", {}).get("level", "Medium") if source_eval else "Medium"
-            credibility = source_eval.get("credibility", {}).get("level", "Medium") if source_eval else "Medium"
-            
-            # Extract threat actors
-            threat_actors = []
-            for actor in structured_analysis.get("threat_actors", []):
-                if "name" in actor:
-                    threat_actors.append(actor["name"])
-            threat_actors_json = json.dumps(threat_actors)
-            
-            # Extract critical sectors
-            critical_sectors = {}
-            for sector in structured_analysis.get("critical_sectors", []):
-                if "name" in sector and "score" in sector:
-                    critical_sectors[sector["name"]] = sector["score"]
-            critical_sectors_json = json.dumps(critical_sectors)
+            structured_analysis, structured_json = _structured_payload(structured_analysis)
+            summary, reliability, credibility, threat_actors_json, critical_sectors_json = \
+                _extract_article_fields(structured_analysis)
             
             # Update article information including created_at timestamp
             current_time = datetime.now().isoformat()
@@ -556,29 +784,37 @@ def update_analysis(
                     analysis_time = ?, model = ?, created_at = ?,
                     summary = ?, source_reliability = ?, source_credibility = ?,
                     threat_actors = ?, critical_sectors = ?
-                WHERE id = ?
+                WHERE url = ?
                 """,
                 (
                     title, content_length, extraction_time, analysis_time, model, current_time,
                     summary, reliability, credibility, threat_actors_json, critical_sectors_json,
-                    article_id
+                    url
                 )
             )
             
+            # No matching row means the URL was never stored
+            if cursor.rowcount == 0:
+                error(f"Cannot update analysis: URL not found in database: {url}")
+                return False
+            
             # Update analysis results
-            debug(f"Updating analysis results for article_id: {article_id}")
+            debug(f"Updating analysis results for URL: {url}")
             cursor.execute(
                 """
                 UPDATE analysis_results 
                 SET raw_text = ?, structured_data = ?
-                WHERE article_id = ?
+                WHERE article_id = (SELECT id FROM articles WHERE url = ?)
                 """,
-                (raw_analysis, json.dumps(structured_analysis), article_id)
+                (raw_analysis, structured_json, url)
             )
             
             # Delete existing indicators
-            debug(f"Removing existing indicators for article_id: {article_id}")
-            cursor.execute("DELETE FROM indicators WHERE article_id = ?", (article_id,))
+            debug(f"Removing existing indicators for URL: {url}")
+            cursor.execute(
+                "DELETE FROM indicators WHERE article_id = (SELECT id FROM articles WHERE url = ?)",
+                (url,)
+            )
             
             conn.commit()
             info(f"Analysis results updated successfully for URL: {url}")
@@ -622,7 +858,7 @@ def get_analysis_by_url(url: str) -> Optional[Dict[str, Any]]:
                     critical_sectors = {}
                 
                 try:
-                    structured_data = json.loads(result['structured_data'])
+                    structured_data = json_loads(result['structured_data'])
                 except (json.JSONDecodeError, TypeError):
                     structured_data = {}
                 
@@ -674,14 +910,8 @@ def get_recent_analyses(limit: int = 10) -> List[Dict[str, Any]]:
             results = cursor.fetchall()
             
             info(f"Retrieved {len(results)} recent analyses")
-            return [{
-                'id': row['id'],
-                'url': row['url'],
-                'title': row['title'],
-                'content_length': row['content_length'],
-                'model': row['model'],
-                'created_at': row['created_at']
-            } for row in results]
+            # Selected columns already match the returned keys
+            return [dict(row) for row in results]
     except Exception as e:
         error_details = traceback.format_exc()
         error(f"Error retrieving recent analyses: {e}")
@@ -734,26 +964,20 @@ def get_token_usage_stats() -> Dict[str, Any]:
                     'regular_input': row['total_input'] - row['cached_input']
                 }
             
-            # Get overall totals
-            cursor.execute("""
-                SELECT SUM(input_tokens) as total_input, 
-                       SUM(output_tokens) as total_output,
-                       SUM(CASE WHEN cached = 1 THEN input_tokens ELSE 0 END) as cached_input,
-                       COUNT(DISTINCT model) as model_count
-                FROM token_usage
-            """)
-            
-            overall = cursor.fetchone()
+            # Derive overall totals from the per-model rows rather than rescanning the table
+            total_input = sum(m['total_input'] or 0 for m in model_stats.values())
+            total_output = sum(m['total_output'] or 0 for m in model_stats.values())
+            cached_input = sum(m['cached_input'] or 0 for m in model_stats.values())
             
             stats = {
                 'models': model_stats,
                 'overall': {
-                    'total_input': overall['total_input'] or 0,
-                    'total_output': overall['total_output'] or 0,
-                    'cached_input': overall['cached_input'] or 0,
-                    'regular_input': (overall['total_input'] or 0) - (overall['cached_input'] or 0),
-                    'total_tokens': (overall['total_input'] or 0) + (overall['total_output'] or 0),
-                    'model_count': overall['model_count'] or 0
+                    'total_input': total_input,
+                    'total_output': total_output,
+                    'cached_input': cached_input,
+                    'regular_input': total_input - cached_input,
+                    'total_tokens': total_input + total_output,
+                    'model_count': len(model_stats)
                 }
             }
             
@@ -790,25 +1014,21 @@ def store_indicators(article_id: int, indicators: Dict[str, List[str]]) -> bool:
     
     try:
         with get_db_connection() as (conn, cursor):
-            # Count the indicators
-            total_indicators = sum(len(indicators[itype]) for itype in indicators)
+            # Flatten all types into one batch so a single executemany covers them
+            insert_data = [
+                (article_id, indicator_type, value)
+                for indicator_type, values in indicators.items()
+                for value in values
+            ]
+            total_indicators = len(insert_data)
             debug(f"Preparing to store {total_indicators} indicators")
             
-            # Insert each indicator
-            for indicator_type, values in indicators.items():
-                if not values:
-                    continue
-                    
-                # Use executemany for better performance
-                insert_data = [(article_id, indicator_type, value) for value in values]
-                
+            if insert_data:
                 # Using INSERT OR IGNORE to handle potential duplicates
                 cursor.executemany(
                     "INSERT OR IGNORE INTO indicators (article_id, indicator_type, value) VALUES (?, ?, ?)",
                     insert_data
                 )
-                
-                debug(f"Inserted {len(values)} {indicator_type} indicators")
             
             conn.commit()
             info(f"Successfully stored {total_indicators} indicators for article_id: {article_id}")
@@ -971,9 +1191,8 @@ def get_indicator_stats() -> Dict[str, Any]:
             for row in cursor.fetchall():
                 type_counts[row['indicator_type']] = row['count']
             
-            # Get total count
-            cursor.execute("SELECT COUNT(*) as total FROM indicators")
-            total_count = cursor.fetchone()['total']
+            # Total is the sum of the per-type counts; no second table scan needed
+            total_count = sum(type_counts.values())
             
             # Get article count with indicators
             cursor.execute("""
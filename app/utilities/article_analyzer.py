@@ -5,6 +5,7 @@ Includes functions for content extraction, analysis, and result parsing.
 """
 
 import os
+import asyncio
 import json
 import re
 import traceback
@@ -12,32 +13,281 @@ import time
 import random
 from typing import Dict, List, Optional, Union, Any
 from datetime import datetime
-from openai import OpenAI, RateLimitError, APIError, APITimeoutError
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APIError, APITimeoutError
 
 from app.utilities.logger import info, debug, error, warning, print_status
 from app.models.database import track_token_usage, store_indicators
 from app.utilities.indicator_extractor import extract_indicators, validate_and_clean_indicators, format_indicators_for_display
 from app.config.config import Config
+from app.utilities.json_utils import json_loads, json_dumps
 
-# Initialize OpenAI client
+# Initialize OpenAI clients: the sync one backs analyze_article, the async one
+# is shared by analyze_article_async callers on their own event loop
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 debug("OpenAI client initialized")
 
-def analyze_article(content, url, model=None, verbose=False, structured=True, extract_iocs=True):
+# Upper bound on article characters sent to the model (~4 chars per token)
+MAX_PROMPT_CHARS = int(os.environ.get('ANALYZER_MAX_CHARS', 60000))
+
+# Retry policy for rate-limited or timed-out API calls
+MAX_API_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+
+# Static prompt scaffolding, built once at import rather than on every call
+_SYSTEM_PROMPT = """You are an expert threat intelligence analyst. Analyze the cybersecurity article and create a structured threat intelligence report.
+
+Your analysis must be thorough, technically accurate, and focus on extracting actionable threat intelligence.
+
+Follow this exact structure in your response:
+1. Create a summary of the article
+2. Evaluate the source reliability (High/Medium/Low), credibility (High/Medium/Low), and source type
+3. Identify threat actors with confidence level and description
+4. Extract MITRE ATT&CK techniques with proper IDs, names, and descriptions
+5. List key threat intelligence insights
+6. Note potential source bias concerns
+7. Identify intelligence gaps
+8. Assess impact on critical infrastructure sectors with scores (1-5) and justifications
+
+Format your response as a valid JSON object following the provided schema exactly."""
+
+_USER_TEMPLATE = "Analyze this cybersecurity article from {url} and return the analysis as a JSON object following the exact schema provided:\n\n{content}"
+
+# Used when the model rejects response_format, so the JSON requirement lives in the prompt
+_USER_TEMPLATE_UNFORMATTED = "Analyze this cybersecurity article from {url} and format your response as a valid JSON object following the exact schema provided. Here's the article:\n\n{content}"
+
+# Canonical critical infrastructure sectors the model scores
+SECTORS = (
+    "Threat to National Security",
+    "Chemical Sector",
+    "Commercial Facilities Sector",
+    "Communications Sector",
+    "Critical Manufacturing Sector",
+    "Dams Sector",
+    "Defense Industrial Base Sector",
+    "Emergency Services Sector",
+    "Energy Sector",
+    "Financial Services Sector",
+    "Food & Agriculture Sector",
+    "Government Services & Facilities Sector",
+    "Healthcare & Public Health Sector",
+    "Information Technology Sector",
+    "Nuclear Reactors, Materials, and Waste Sector",
+    "Transportation Systems Sector",
+    "Water & Wastewater Systems Sector"
+)
+
+# Maps snake_case sector keys some models return to their canonical names
+_SECTOR_NAME_MAP = {
+    "energy": "Energy Sector",
+    "water": "Water & Wastewater Systems Sector",
+    "water_and_wastewater": "Water & Wastewater Systems Sector", 
+    "healthcare": "Healthcare & Public Health Sector",
+    "government": "Government Services & Facilities Sector",
+    "transportation": "Transportation Systems Sector",
+    "finance": "Financial Services Sector",
+    "chemical": "Chemical Sector",
+    "communications": "Communications Sector",
+    "critical_manufacturing": "Critical Manufacturing Sector",
+    "dams": "Dams Sector",
+    "defense": "Defense Industrial Base Sector",
+    "emergency_services": "Emergency Services Sector",
+    "food_agriculture": "Food & Agriculture Sector",
+    "information_technology": "Information Technology Sector", 
+    "nuclear": "Nuclear Reactors, Materials, and Waste Sector",
+    "telecommunications": "Communications Sector"
+}
+
+# Text-format sector lines, compiled once. Each pattern captures:
+# 1. Sector name
+# 2. Score (1-5)
+# 3. Justification text
+_SECTOR_PATTERNS = [
+    # Pattern for "1. Name: Score - Justification"
+    re.compile(r'(?:^|\n)(?:\d+\.|\-)\s*(?:\*\*)?([^:]+?)(?:\*\*)?\s*:\s*(?:\*\*)?(\d+)(?:\*\*)?(?:[^-]*?)-\s*(.*?)(?=(?:\n(?:\d+\.|\-))|$)', re.DOTALL),
+    
+    # Pattern for "1. Name: Score high/medium/low relevance..."
+    re.compile(r'(?:^|\n)(?:\d+\.|\-)\s*(?:\*\*)?([^:]+?)(?:\*\*)?:\s*(?:\*\*)?(\d+)(?:\*\*)?(?:\s*-\s*|\s+)([Hh]igh|[Mm]edium|[Ll]ow|[Mm]oderate)(?:\s+relevance\s+)(.*?)(?=(?:\n(?:\d+\.|\-))|$)', re.DOTALL),
+    
+    # Pattern for nested numbered lists "1. Name: 1. Score - Justification"
+    re.compile(r'(?:^|\n)(?:\d+\.|\-)\s*(?:\*\*)?([^:]+?)(?:\*\*)?:\s*(?:\d+\.)\s*(?:\*\*)?(\d+)(?:\*\*)?(?:[^-]*?)-\s*(.*?)(?=(?:\n(?:\d+\.|\-))|$)', re.DOTALL)
+]
+
+# More generic fallback when none of the patterns above match
+_GENERIC_SECTOR_PATTERN = re.compile(r'(?:^|\n)(?:\d+\.|\-)\s*(?:\*\*)?([^:]+?)(?:\*\*)?\s*:?\s*(?:\*\*)?(\d+)(?:\*\*)?(?:[^a-zA-Z\n]*)(.*?)(?=(?:\n(?:\d+\.|\-))|$)', re.DOTALL)
+
+# Single "Name: Score" line for the line-by-line fallback
+_SECTOR_LINE_PATTERN = re.compile(r'(?:\d+\.|\-)\s*([^:]+?):\s*(\d+)')
+
+# Source evaluation labels (casefolded) and the fields they populate
+_SOURCE_EVAL_LABELS = {
+    "reliability": "reliability",
+    "credibility": "credibility",
+    "source type": "source_type"
+}
+
+# "High - justification" values for reliability and credibility, as
+# (pattern for the labelled field, fallback over the whole section)
+_LEVEL_PATTERNS = {
+    "reliability": (
+        re.compile(r'(high|medium|low)(?:[^-\n]*?)-?\s*(.*?)(?=Credibility:|\Z)', re.DOTALL | re.IGNORECASE),
+        re.compile(r'Reliability:\s*(high|medium|low)(?:[^-\n]*?)-?\s*(.*?)(?=Credibility:|\Z)', re.DOTALL | re.IGNORECASE)
+    ),
+    "credibility": (
+        re.compile(r'(high|medium|low)(?:[^-\n]*?)-?\s*(.*?)(?=Source Type:|\Z)', re.DOTALL | re.IGNORECASE),
+        re.compile(r'Credibility:\s*(high|medium|low)(?:[^-\n]*?)-?\s*(.*?)(?=Source Type:|\Z)', re.DOTALL | re.IGNORECASE)
+    )
+}
+
+_SOURCE_TYPE_PATTERN = re.compile(r'Source Type:\s*(.*?)(?=$)', re.DOTALL | re.IGNORECASE)
+
+# Start of a numbered or dashed list item, which ends a multi-line source type
+_LIST_ITEM_PATTERN = re.compile(r'\d+\.|-')
+
+# JSON schema for the threat intelligence report
+_JSON_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "summary": {"type": "string"},
+        "source_evaluation": {
+            "type": "object",
+            "properties": {
+                "reliability": {
+                    "type": "object",
+                    "properties": {
+                        "level": {"type": "string", "enum": ["High", "Medium", "Low"]},
+                        "justification": {"type": "string"}
+                    },
+                    "required": ["level", "justification"]
+                },
+                "credibility": {
+                    "type": "object",
+                    "properties": {
+                        "level": {"type": "string", "enum": ["High", "Medium", "Low"]},
+                        "justification": {"type": "string"}
+                    },
+                    "required": ["level", "justification"]
+                },
+                "source_type": {"type": "string"}
+            },
+            "required": ["reliability", "credibility", "source_type"]
+        },
+        "threat_actors": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "confidence": {"type": "string", "enum": ["High", "Medium", "Low"]},
+                    "description": {"type": "string"},
+                    "aliases": {"type": "array", "items": {"type": "string"}}
+                },
+                "required": ["name", "confidence", "description", "aliases"]
+            }
+        },
+        "mitre_techniques": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "description": "MITRE ATT&CK technique ID (e.g., T1190)"},
+                    "name": {"type": "string"},
+                    "description": {"type": "string"}
+                },
+                "required": ["id", "name", "description"]
+            }
+        },
+        "key_insights": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "potential_issues": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "intelligence_gaps": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "critical_sectors": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "enum": list(SECTORS)
+                    },
+                    "score": {
+                        "type": "integer",
+                        "enum": [1, 2, 3, 4, 5],
+                        "description": "Score indicating sector relevance (1-5)"
+                    },
+                    "justification": {"type": "string"}
+                },
+                "required": ["name", "score", "justification"]
+            }
+        }
+    },
+    "required": [
+        "summary", "source_evaluation", "threat_actors", "mitre_techniques", 
+        "key_insights", "potential_issues", "intelligence_gaps", "critical_sectors"
+    ]
+}
+
+_JSON_SCHEMA_TEXT = json.dumps(_JSON_SCHEMA, indent=2)
+
+def _retry_delay(exc, attempt):
+    """Log a retryable API failure and return the backoff delay before the next attempt."""
+    delay = RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, 0.5)
+    warning(f"OpenAI API call failed ({type(exc).__name__}), retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_API_RETRIES})")
+    return delay
+
+def _create_completion_sync(api_client, **kwargs):
     """
-    Analyze an article using the specified AI model with structured JSON responses.
+    Call the chat completions API, retrying rate limits and timeouts with exponential backoff.
     
     Args:
-        content (str): The article content to analyze
-        url (str): The URL of the article
-        model (str, optional): The OpenAI model to use. Defaults to Config.DEFAULT_MODEL.
-        verbose (bool, optional): Whether to print status updates. Defaults to False.
-        structured (bool, optional): Whether to use structured output. Defaults to True.
-        extract_iocs (bool, optional): Whether to extract indicators of compromise. Defaults to True.
+        api_client: The OpenAI client to use
+        **kwargs: Arguments passed through to chat.completions.create
     
     Returns:
-        dict: A dictionary containing the analysis results and metadata
+        The chat completion response
     """
+    for attempt in range(MAX_API_RETRIES + 1):
+        try:
+            return api_client.chat.completions.create(**kwargs)
+        except (RateLimitError, APITimeoutError) as e:
+            if attempt == MAX_API_RETRIES:
+                raise
+            time.sleep(_retry_delay(e, attempt))
+
+async def _create_completion(api_client, **kwargs):
+    """
+    Call the chat completions API, retrying rate limits and timeouts with exponential backoff.
+    
+    Backoff uses asyncio.sleep so other analyses sharing the event loop keep running.
+    
+    Args:
+        api_client: The AsyncOpenAI client to use
+        **kwargs: Arguments passed through to chat.completions.create
+    
+    Returns:
+        The chat completion response
+    """
+    for attempt in range(MAX_API_RETRIES + 1):
+        try:
+            return await api_client.chat.completions.create(**kwargs)
+        except (RateLimitError, APITimeoutError) as e:
+            if attempt == MAX_API_RETRIES:
+                raise
+            await asyncio.sleep(_retry_delay(e, attempt))
+
+def _prepare_analysis(content, url, model, verbose):
+    """Validate the inputs, resolve the model ID and trim oversized content. Returns (model, content)."""
+
+    
     if not content or not url:
         raise ValueError("Content and URL are required")
     
@@ -65,507 +315,438 @@ def analyze_article(content, url, model=None, verbose=False, structured=True, ex
         print_status(f"Starting analysis of article from {url}")
         print_status(f"Using model: {model}")
     
-    try:
-        # Prepare the system prompt
-        system_prompt = """You are an expert threat intelligence analyst. Analyze the cybersecurity article and create a structured threat intelligence report.
+    # Trim oversized articles on a word boundary rather than sending the full text
+    if len(content) > MAX_PROMPT_CHARS:
+        debug(f"Truncating article content from {len(content)} to {MAX_PROMPT_CHARS} characters")
+        content = content[:MAX_PROMPT_CHARS].rsplit(' ', 1)[0] + ' ...[truncated]'
+    
+    return model, content
 
-Your analysis must be thorough, technically accurate, and focus on extracting actionable threat intelligence.
+def _completion_kwargs(model, url, content, formatted=True):
+    """Build the chat completion arguments, with or without the JSON response_format."""
+    template = _USER_TEMPLATE if formatted else _USER_TEMPLATE_UNFORMATTED
+    kwargs = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": template.format(url=url, content=content)}
+        ],
+        "temperature": 0.2
+    }
+    if formatted:
+        kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
 
-Follow this exact structure in your response:
-1. Create a summary of the article
-2. Evaluate the source reliability (High/Medium/Low), credibility (High/Medium/Low), and source type
-3. Identify threat actors with confidence level and description
-4. Extract MITRE ATT&CK techniques with proper IDs, names, and descriptions
-5. List key threat intelligence insights
-6. Note potential source bias concerns
-7. Identify intelligence gaps
-8. Assess impact on critical infrastructure sectors with scores (1-5) and justifications
+def _is_response_format_error(exc):
+    """Whether the API rejected the JSON response_format rather than the request itself."""
+    return "response_format" in str(exc) or "json" in str(exc).lower()
 
-Format your response as a valid JSON object following the provided schema exactly."""
-        
-        # Define the JSON schema for the threat intelligence report
-        json_schema = {
-            "type": "object",
-            "additionalProperties": False,
-            "properties": {
-                "summary": {"type": "string"},
-                "source_evaluation": {
-                    "type": "object",
-                    "properties": {
-                        "reliability": {
-                            "type": "object",
-                            "properties": {
-                                "level": {"type": "string", "enum": ["High", "Medium", "Low"]},
-                                "justification": {"type": "string"}
-                            },
-                            "required": ["level", "justification"]
-                        },
-                        "credibility": {
-                            "type": "object",
-                            "properties": {
-                                "level": {"type": "string", "enum": ["High", "Medium", "Low"]},
-                                "justification": {"type": "string"}
-                            },
-                            "required": ["level", "justification"]
-                        },
-                        "source_type": {"type": "string"}
-                    },
-                    "required": ["reliability", "credibility", "source_type"]
-                },
-                "threat_actors": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "name": {"type": "string"},
-                            "confidence": {"type": "string", "enum": ["High", "Medium", "Low"]},
-                            "description": {"type": "string"},
-                            "aliases": {"type": "array", "items": {"type": "string"}}
-                        },
-                        "required": ["name", "confidence", "description", "aliases"]
-                    }
-                },
-                "mitre_techniques": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "id": {"type": "string", "description": "MITRE ATT&CK technique ID (e.g., T1190)"},
-                            "name": {"type": "string"},
-                            "description": {"type": "string"}
-                        },
-                        "required": ["id", "name", "description"]
-                    }
-                },
-                "key_insights": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "potential_issues": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "intelligence_gaps": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                },
-                "critical_sectors": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "name": {
-                                "type": "string",
-                                "enum": [
-                                    "Threat to National Security",
-                                    "Chemical Sector",
-                                    "Commercial Facilities Sector",
-                                    "Communications Sector",
-                                    "Critical Manufacturing Sector",
-                                    "Dams Sector",
-                                    "Defense Industrial Base Sector",
-                                    "Emergency Services Sector",
-                                    "Energy Sector",
-                                    "Financial Services Sector",
-                                    "Food & Agriculture Sector",
-                                    "Government Services & Facilities Sector",
-                                    "Healthcare & Public Health Sector",
-                                    "Information Technology Sector",
-                                    "Nuclear Reactors, Materials, and Waste Sector",
-                                    "Transportation Systems Sector",
-                                    "Water & Wastewater Systems Sector"
-                                ]
-                            },
-                            "score": {
-                                "type": "integer",
-                                "enum": [1, 2, 3, 4, 5],
-                                "description": "Score indicating sector relevance (1-5)"
-                            },
-                            "justification": {"type": "string"}
-                        },
-                        "required": ["name", "score", "justification"]
-                    }
-                }
-            },
-            "required": [
-                "summary", "source_evaluation", "threat_actors", "mitre_techniques", 
-                "key_insights", "potential_issues", "intelligence_gaps", "critical_sectors"
-            ]
-        }
+def _log_request(model, url, content):
+    """Log the outgoing API request details."""
+    debug("=========== OPENAI API REQUEST DETAILS ===========")
+    debug(f"Model ID: {model}")
+    debug(f"System Prompt: {_SYSTEM_PROMPT}")
+    debug(f"User Content Length: {len(content)}")
+    debug(f"URL: {url}")
+    debug(f"JSON Schema: {_JSON_SCHEMA_TEXT}")
+    debug("================================================")
+    debug(f"Sending OpenAI API request with model: {model}")
+
+def _log_response(response):
+    """Log a successful API response."""
+    debug("=========== OPENAI API RESPONSE RECEIVED ===========")
+    debug(f"Response Status: Success")
+    debug(f"Response Model: {response.model}")
+    debug(f"Response Usage: {response.usage}")
+    debug("==================================================")
+
+def _log_api_error(e, model):
+    """Log the details of a failed API call."""
+    debug("=========== OPENAI API ERROR DETAILS ===========")
+    debug(f"Error Type: {type(e).__name__}")
+    debug(f"Error Message: {str(e)}")
+    debug(f"Model ID that caused error: {model}")
+    error_response = getattr(e, 'response', None)
+    if error_response:
+        debug(f"Error Response: {error_response}")
+        if hasattr(error_response, 'json'):
+            try:
+                error_json = error_response.json()
+                debug(f"Error JSON: {json.dumps(error_json, indent=2)}")
+            except:
+                debug("Could not parse error response as JSON")
+    debug("================================================")
+
+def _request_analysis(api_client, model, url, content):
+    """Send the analysis request on a sync client, falling back to an unformatted prompt if response_format is rejected."""
+    _log_request(model, url, content)
+    try:
+        try:
+            # First try with JSON response format
+            response = _create_completion_sync(api_client, **_completion_kwargs(model, url, content))
+        except Exception as json_error:
+            # If it's not a JSON format issue, re-raise the original error
+            if not _is_response_format_error(json_error):
+                raise
+            debug(f"JSON response format failed, retrying without format specification: {str(json_error)}")
+            response = _create_completion_sync(api_client, **_completion_kwargs(model, url, content, formatted=False))
+    except Exception as e:
+        _log_api_error(e, model)
+        raise
+    _log_response(response)
+    return response
+
+async def _request_analysis_async(api_client, model, url, content):
+    """Async counterpart of _request_analysis for AsyncOpenAI clients."""
+    _log_request(model, url, content)
+    try:
+        try:
+            # First try with JSON response format
+            response = await _create_completion(api_client, **_completion_kwargs(model, url, content))
+        except Exception as json_error:
+            # If it's not a JSON format issue, re-raise the original error
+            if not _is_response_format_error(json_error):
+                raise
+            debug(f"JSON response format failed, retrying without format specification: {str(json_error)}")
+            response = await _create_completion(api_client, **_completion_kwargs(model, url, content, formatted=False))
+    except Exception as e:
+        _log_api_error(e, model)
+        raise
+    _log_response(response)
+    return response
+
+def _build_analysis_result(response, model, verbose):
+    """Parse the model response into the template structure and attach token usage."""
+    # Parse the response
+    try:
+        # Try to parse as JSON first
+        response_content = response.choices[0].message.content
+        debug(f"Response content type: {type(response_content)}")
+        debug(f"Response content sample: {response_content[:200]}...")
         
-        # Make the API call with structured outputs
-        debug("=========== OPENAI API REQUEST DETAILS ===========")
-        debug(f"Model ID: {model}")
-        debug(f"System Prompt: {system_prompt}")
-        debug(f"User Content Length: {len(content)}")
-        debug(f"URL: {url}")
-        debug(f"JSON Schema: {json.dumps(json_schema, indent=2)}")
-        debug("================================================")
+        # Log the full response for debugging
+        print("========== FULL API RESPONSE ==========")
+        print(response_content)
+        print("=======================================")
         
+        # Parse once; a decode failure means the response isn't plain JSON
         try:
-            debug(f"Sending OpenAI API request with model: {model}")
-            try:
-                # First try with JSON response format
-                response = client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": f"Analyze this cybersecurity article from {url} and return the analysis as a JSON object following the exact schema provided:\n\n{content}"}
-                    ],
-                    response_format={"type": "json_object"},
-                    temperature=0.2
-                )
-            except Exception as json_error:
-                # If JSON format fails, try without specifying response format
-                if "response_format" in str(json_error) or "json" in str(json_error).lower():
-                    debug(f"JSON response format failed, retrying without format specification: {str(json_error)}")
-                    response = client.chat.completions.create(
-                        model=model,
-                        messages=[
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": f"Analyze this cybersecurity article from {url} and format your response as a valid JSON object following the exact schema provided. Here's the article:\n\n{content}"}
-                        ],
-                        temperature=0.2
-                    )
-                else:
-                    # If it's not a JSON format issue, re-raise the original error
-                    raise
-            
-            debug("=========== OPENAI API RESPONSE RECEIVED ===========")
-            debug(f"Response Status: Success")
-            debug(f"Response Model: {response.model}")
-            debug(f"Response Usage: {response.usage}")
-            debug("==================================================")
-        except Exception as e:
-            debug("=========== OPENAI API ERROR DETAILS ===========")
-            debug(f"Error Type: {type(e).__name__}")
-            debug(f"Error Message: {str(e)}")
-            debug(f"Model ID that caused error: {model}")
-            error_response = getattr(e, 'response', None)
-            if error_response:
-                debug(f"Error Response: {error_response}")
-                if hasattr(error_response, 'json'):
-                    try:
-                        error_json = error_response.json()
-                        debug(f"Error JSON: {json.dumps(error_json, indent=2)}")
-                    except:
-                        debug("Could not parse error response as JSON")
-            debug("================================================")
-            raise
+            parsed_response = json_loads(response_content)
+        except json.JSONDecodeError:
+            parsed_response = None
         
-        # Parse the response
-        try:
-            # Try to parse as JSON first
-            response_content = response.choices[0].message.content
-            debug(f"Response content type: {type(response_content)}")
-            debug(f"Response content sample: {response_content[:200]}...")
+        if parsed_response is not None:
+            debug("Successfully parsed response as JSON")
+            print("======= PARSED JSON STRUCTURE =======")
+            print(json_dumps(parsed_response))
+            print("====================================")
             
-            # Log the full response for debugging
-            print("========== FULL API RESPONSE ==========")
-            print(response_content)
-            print("=======================================")
+            # Start with a clean result structure that matches template expectations
+            result = {
+                "summary": parsed_response.get("summary", "No summary available."),
+                "source_evaluation": {
+                    "reliability": {"level": "Medium", "justification": "No justification provided."},
+                    "credibility": {"level": "Medium", "justification": "No justification provided."},
+                    "source_type": "Unknown"
+                },
+                "threat_actors": [],
+                "mitre_techniques": [],
+                "key_insights": [],
+                "potential_issues": [],
+                "intelligence_gaps": [],
+                "critical_sectors": []
+            }
             
-            # Check if the response is valid JSON
-            if is_valid_json(response_content):
-                parsed_response = json.loads(response_content)
-                debug("Successfully parsed response as JSON")
-                print("======= PARSED JSON STRUCTURE =======")
-                print(json.dumps(parsed_response, indent=2))
-                print("====================================")
+            # Handle source_evaluation
+            if "source_evaluation" in parsed_response:
+                source_eval = parsed_response["source_evaluation"]
+                if isinstance(source_eval, dict):
+                    result["source_evaluation"] = source_eval
+            elif all(key in parsed_response for key in ["source_reliability", "source_credibility", "source_type"]):
+                # Handle flat source evaluation fields
+                reliability = parsed_response.get("source_reliability", "Medium")
+                credibility = parsed_response.get("source_credibility", "Medium")
+                source_type = parsed_response.get("source_type", "Unknown")
                 
-                # Start with a clean result structure that matches template expectations
-                result = {
-                    "summary": parsed_response.get("summary", "No summary available."),
-                    "source_evaluation": {
-                        "reliability": {"level": "Medium", "justification": "No justification provided."},
-                        "credibility": {"level": "Medium", "justification": "No justification provided."},
-                        "source_type": "Unknown"
+                # Convert to structured format
+                result["source_evaluation"] = {
+                    "reliability": {
+                        "level": reliability,
+                        "justification": "Based on source analysis."
+                    },
+                    "credibility": {
+                        "level": credibility,
+                        "justification": "Based on source analysis."
                     },
-                    "threat_actors": [],
-                    "mitre_techniques": [],
-                    "key_insights": [],
-                    "potential_issues": [],
-                    "intelligence_gaps": [],
-                    "critical_sectors": []
+                    "source_type": source_type
                 }
+            
+            # Handle threat actors
+            if "threat_actors" in parsed_response:
+                actors = parsed_response["threat_actors"]
+                if isinstance(actors, list):
+                    for actor in actors:
+                        if isinstance(actor, dict):
+                            # Check if actor has all required fields in correct format
+                            actor_name = actor.get("name", "Unknown")
+                            actor_confidence = actor.get("confidence", actor.get("confidence_level", "Medium"))
+                            actor_description = actor.get("description", "No description available.")
+                            actor_aliases = actor.get("aliases", [])
+                            
+                            result["threat_actors"].append({
+                                "name": actor_name,
+                                "confidence": actor_confidence,
+                                "description": actor_description,
+                                "aliases": actor_aliases
+                            })
+                        elif isinstance(actor, str):
+                            # Handle simple string actors
+                            result["threat_actors"].append({
+                                "name": actor,
+                                "confidence": "Medium",
+                                "description": "No description available.",
+                                "aliases": []
+                            })
+            
+            # Handle MITRE techniques
+            mitre_key = next((k for k in parsed_response.keys() if "mitre" in k.lower()), None)
+            if mitre_key and mitre_key in parsed_response:
+                techniques = parsed_response[mitre_key]
+                if isinstance(techniques, list):
+                    for tech in techniques:
+                        if isinstance(tech, dict):
+                            technique_id = tech.get("id", "Unknown")
+                            technique_name = tech.get("name", "Unknown Technique")
+                            technique_desc = tech.get("description", "No description available.")
+                            
+                            result["mitre_techniques"].append({
+                                "id": technique_id,
+                                "name": technique_name,
+                                "description": technique_desc
+                            })
+            
+            # Handle key insights
+            insights_key = next((k for k in parsed_response.keys() if "insight" in k.lower() or "intelligence" in k.lower()), None)
+            if insights_key and insights_key in parsed_response and insights_key != "intelligence_gaps":
+                insights = parsed_response[insights_key]
+                if isinstance(insights, list):
+                    result["key_insights"] = insights
+                elif isinstance(insights, str):
+                    result["key_insights"] = [insights]
+            
+            # Handle potential issues/bias
+            bias_key = next((k for k in parsed_response.keys() if "bias" in k.lower() or "issue" in k.lower()), None)
+            if bias_key and bias_key in parsed_response:
+                bias = parsed_response[bias_key]
+                if isinstance(bias, list):
+                    result["potential_issues"] = bias
+                elif isinstance(bias, str):
+                    result["potential_issues"] = [bias]
+            
+            # Handle intelligence gaps
+            if "intelligence_gaps" in parsed_response:
+                gaps = parsed_response["intelligence_gaps"]
+                if isinstance(gaps, list):
+                    result["intelligence_gaps"] = gaps
+                elif isinstance(gaps, str):
+                    result["intelligence_gaps"] = [gaps]
+            
+            # Handle critical sectors
+            sectors_key = next((k for k in parsed_response.keys() if "sector" in k.lower() or "infrastructure" in k.lower() or "impact" in k.lower()), None)
+            if sectors_key and sectors_key in parsed_response:
+                sectors_data = parsed_response[sectors_key]
                 
-                # Handle source_evaluation
-                if "source_evaluation" in parsed_response:
-                    source_eval = parsed_response["source_evaluation"]
-                    if isinstance(source_eval, dict):
-                        result["source_evaluation"] = source_eval
-                elif all(key in parsed_response for key in ["source_reliability", "source_credibility", "source_type"]):
-                    # Handle flat source evaluation fields
-                    reliability = parsed_response.get("source_reliability", "Medium")
-                    credibility = parsed_response.get("source_credibility", "Medium")
-                    source_type = parsed_response.get("source_type", "Unknown")
+                # Handle different formats for sectors
+                if isinstance(sectors_data, dict) and "sectors" in sectors_data and isinstance(sectors_data["sectors"], list):
+                    # Handle format with nested sectors array
+                    for sector in sectors_data["sectors"]:
+                        if isinstance(sector, dict):
+                            sector_name = sector.get("sector", "Unknown Sector")
+                            sector_score = sector.get("impact_score", 3)
+                            sector_justification = sector.get("justification", "No justification provided.")
+                            
+                            result["critical_sectors"].append({
+                                "name": sector_name,
+                                "score": sector_score,
+                                "justification": sector_justification
+                            })
+                elif isinstance(sectors_data, list):
+                    # Handle format with direct array of sectors
+                    for sector in sectors_data:
+                        if isinstance(sector, dict):
+                            sector_name = sector.get("name", sector.get("sector", "Unknown Sector"))
+                            sector_score = sector.get("score", sector.get("impact_score", 3))
+                            sector_justification = sector.get("justification", "No justification provided.")
+                            
+                            result["critical_sectors"].append({
+                                "name": sector_name,
+                                "score": sector_score,
+                                "justification": sector_justification
+                            })
+                elif isinstance(sectors_data, dict):
+                    # Check if this is a nested structure with sector names as keys
+                    nested_sectors = False
                     
-                    # Convert to structured format
-                    result["source_evaluation"] = {
-                        "reliability": {
-                            "level": reliability,
-                            "justification": "Based on source analysis."
-                        },
-                        "credibility": {
-                            "level": credibility,
-                            "justification": "Based on source analysis."
-                        },
-                        "source_type": source_type
-                    }
-                
-                # Handle threat actors
-                if "threat_actors" in parsed_response:
-                    actors = parsed_response["threat_actors"]
-                    if isinstance(actors, list):
-                        for actor in actors:
-                            if isinstance(actor, dict):
-                                # Check if actor has all required fields in correct format
-                                actor_name = actor.get("name", "Unknown")
-                                actor_confidence = actor.get("confidence", actor.get("confidence_level", "Medium"))
-                                actor_description = actor.get("description", "No description available.")
-                                actor_aliases = actor.get("aliases", [])
-                                
-                                result["threat_actors"].append({
-                                    "name": actor_name,
-                                    "confidence": actor_confidence,
-                                    "description": actor_description,
-                                    "aliases": actor_aliases
-                                })
-                            elif isinstance(actor, str):
-                                # Handle simple string actors
-                                result["threat_actors"].append({
-                                    "name": actor,
-                                    "confidence": "Medium",
-                                    "description": "No description available.",
-                                    "aliases": []
-                                })
-                
-                # Handle MITRE techniques
-                mitre_key = next((k for k in parsed_response.keys() if "mitre" in k.lower()), None)
-                if mitre_key and mitre_key in parsed_response:
-                    techniques = parsed_response[mitre_key]
-                    if isinstance(techniques, list):
-                        for tech in techniques:
-                            if isinstance(tech, dict):
-                                technique_id = tech.get("id", "Unknown")
-                                technique_name = tech.get("name", "Unknown Technique")
-                                technique_desc = tech.get("description", "No description available.")
-                                
-                                result["mitre_techniques"].append({
-                                    "id": technique_id,
-                                    "name": technique_name,
-                                    "description": technique_desc
-                                })
-                
-                # Handle key insights
-                insights_key = next((k for k in parsed_response.keys() if "insight" in k.lower() or "intelligence" in k.lower()), None)
-                if insights_key and insights_key in parsed_response and insights_key != "intelligence_gaps":
-                    insights = parsed_response[insights_key]
-                    if isinstance(insights, list):
-                        result["key_insights"] = insights
-                    elif isinstance(insights, str):
-                        result["key_insights"] = [insights]
-                
-                # Handle potential issues/bias
-                bias_key = next((k for k in parsed_response.keys() if "bias" in k.lower() or "issue" in k.lower()), None)
-                if bias_key and bias_key in parsed_response:
-                    bias = parsed_response[bias_key]
-                    if isinstance(bias, list):
-                        result["potential_issues"] = bias
-                    elif isinstance(bias, str):
-                        result["potential_issues"] = [bias]
-                
-                # Handle intelligence gaps
-                if "intelligence_gaps" in parsed_response:
-                    gaps = parsed_response["intelligence_gaps"]
-                    if isinstance(gaps, list):
-                        result["intelligence_gaps"] = gaps
-                    elif isinstance(gaps, str):
-                        result["intelligence_gaps"] = [gaps]
-                
-                # Handle critical sectors
-                sectors_key = next((k for k in parsed_response.keys() if "sector" in k.lower() or "infrastructure" in k.lower() or "impact" in k.lower()), None)
-                if sectors_key and sectors_key in parsed_response:
-                    sectors_data = parsed_response[sectors_key]
+                    # Check if the dict contains sectorial assessment objects
+                    for key, value in sectors_data.items():
+                        if isinstance(value, dict) and any(k in value for k in ["score", "justification"]):
+                            nested_sectors = True
+                            
+                            # Extract sector info
+                            sector_name = key
+                            sector_score = value.get("score", 3)
+                            sector_justification = value.get("justification", "No justification provided.")
+                            
+                            # Map sector name to standard format
+                            sector_name = _SECTOR_NAME_MAP.get(sector_name, sector_name.replace("_", " ").title() + " Sector")
+                            
+                            # Ensure score is in 1-5 range
+                            normalized_score = min(max(int(sector_score), 1), 5)
+                            
+                            result["critical_sectors"].append({
+                                "name": sector_name, 
+                                "score": normalized_score,
+                                "justification": sector_justification
+                            })
                     
-                    # Handle different formats for sectors
-                    if isinstance(sectors_data, dict) and "sectors" in sectors_data and isinstance(sectors_data["sectors"], list):
-                        # Handle format with nested sectors array
-                        for sector in sectors_data["sectors"]:
-                            if isinstance(sector, dict):
-                                sector_name = sector.get("sector", "Unknown Sector")
-                                sector_score = sector.get("impact_score", 3)
-                                sector_justification = sector.get("justification", "No justification provided.")
-                                
-                                result["critical_sectors"].append({
-                                    "name": sector_name,
-                                    "score": sector_score,
-                                    "justification": sector_justification
-                                })
-                    elif isinstance(sectors_data, list):
-                        # Handle format with direct array of sectors
-                        for sector in sectors_data:
-                            if isinstance(sector, dict):
-                                sector_name = sector.get("name", sector.get("sector", "Unknown Sector"))
-                                sector_score = sector.get("score", sector.get("impact_score", 3))
-                                sector_justification = sector.get("justification", "No justification provided.")
-                                
-                                result["critical_sectors"].append({
-                                    "name": sector_name,
-                                    "score": sector_score,
-                                    "justification": sector_justification
-                                })
-                    elif isinstance(sectors_data, dict):
-                        # Check if this is a nested structure with sector names as keys
-                        nested_sectors = False
+                    # If not a nested structure, handle as before
+                    if not nested_sectors:
+                        # Handle sectors as direct keys with score values
+                        justifications = {}
+                        common_justification = ""
+                        
+                        # Check for justifications dict
+                        if "justifications" in sectors_data and isinstance(sectors_data["justifications"], dict):
+                            justifications = sectors_data["justifications"]
                         
-                        # Check if the dict contains sectorial assessment objects
-                        for key, value in sectors_data.items():
-                            if isinstance(value, dict) and any(k in value for k in ["score", "justification"]):
-                                nested_sectors = True
+                        # Check for a single justification string
+                        if "justification" in sectors_data and isinstance(sectors_data["justification"], str):
+                            common_justification = sectors_data["justification"]
+                        
+                        # Process each sector
+                        for sector, value in sectors_data.items():
+                            # Skip non-sector keys
+                            if sector in ["justifications", "sectors", "overall_impact", "impact_description", "justification"]:
+                                continue
                                 
-                                # Extract sector info
-                                sector_name = key
-                                sector_score = value.get("score", 3)
-                                sector_justification = value.get("justification", "No justification provided.")
+                            if isinstance(value, (int, float)):
+                                # Get justification if available
+                                justification = justifications.get(sector, common_justification or "No justification provided.")
                                 
                                 # Map sector name to standard format
-                                name_mapping = {
-                                    "energy": "Energy Sector",
-                                    "water": "Water & Wastewater Systems Sector",
-                                    "water_and_wastewater": "Water & Wastewater Systems Sector", 
-                                    "healthcare": "Healthcare & Public Health Sector",
-                                    "government": "Government Services & Facilities Sector",
-                                    "transportation": "Transportation Systems Sector",
-                                    "finance": "Financial Services Sector",
-                                    "chemical": "Chemical Sector",
-                                    "communications": "Communications Sector",
-                                    "critical_manufacturing": "Critical Manufacturing Sector",
-                                    "dams": "Dams Sector",
-                                    "defense": "Defense Industrial Base Sector",
-                                    "emergency_services": "Emergency Services Sector",
-                                    "food_agriculture": "Food & Agriculture Sector",
-                                    "information_technology": "Information Technology Sector", 
-                                    "nuclear": "Nuclear Reactors, Materials, and Waste Sector",
-                                    "telecommunications": "Communications Sector"
-                                }
-                                
-                                sector_name = name_mapping.get(sector_name, sector_name.replace("_", " ").title() + " Sector")
+                                sector_name = _SECTOR_NAME_MAP.get(sector, sector.replace("_", " ").title() + " Sector")
                                 
                                 # Ensure score is in 1-5 range
-                                normalized_score = min(max(int(sector_score), 1), 5)
+                                normalized_score = min(max(int(value), 1), 5)
                                 
                                 result["critical_sectors"].append({
                                     "name": sector_name, 
                                     "score": normalized_score,
-                                    "justification": sector_justification
+                                    "justification": justification
                                 })
-                        
-                        # If not a nested structure, handle as before
-                        if not nested_sectors:
-                            # Handle sectors as direct keys with score values
-                            justifications = {}
-                            common_justification = ""
-                            
-                            # Check for justifications dict
-                            if "justifications" in sectors_data and isinstance(sectors_data["justifications"], dict):
-                                justifications = sectors_data["justifications"]
-                            
-                            # Check for a single justification string
-                            if "justification" in sectors_data and isinstance(sectors_data["justification"], str):
-                                common_justification = sectors_data["justification"]
-                            
-                            # Process each sector
-                            for sector, value in sectors_data.items():
-                                # Skip non-sector keys
-                                if sector in ["justifications", "sectors", "overall_impact", "impact_description", "justification"]:
-                                    continue
-                                    
-                                if isinstance(value, (int, float)):
-                                    # Get justification if available
-                                    justification = justifications.get(sector, common_justification or "No justification provided.")
-                                    
-                                    # Map sector name to standard format
-                                    name_mapping = {
-                                        "energy": "Energy Sector",
-                                        "water": "Water & Wastewater Systems Sector",
-                                        "water_and_wastewater": "Water & Wastewater Systems Sector", 
-                                        "healthcare": "Healthcare & Public Health Sector",
-                                        "government": "Government Services & Facilities Sector",
-                                        "transportation": "Transportation Systems Sector",
-                                        "finance": "Financial Services Sector",
-                                        "chemical": "Chemical Sector",
-                                        "communications": "Communications Sector",
-                                        "critical_manufacturing": "Critical Manufacturing Sector",
-                                        "dams": "Dams Sector",
-                                        "defense": "Defense Industrial Base Sector",
-                                        "emergency_services": "Emergency Services Sector",
-                                        "food_agriculture": "Food & Agriculture Sector",
-                                        "information_technology": "Information Technology Sector", 
-                                        "nuclear": "Nuclear Reactors, Materials, and Waste Sector",
-                                        "telecommunications": "Communications Sector"
-                                    }
-                                    
-                                    sector_name = name_mapping.get(sector, sector.replace("_", " ").title() + " Sector")
-                                    
-                                    # Ensure score is in 1-5 range
-                                    normalized_score = min(max(int(value), 1), 5)
-                                    
-                                    result["critical_sectors"].append({
-                                        "name": sector_name, 
-                                        "score": normalized_score,
-                                        "justification": justification
-                                    })
-                
-                debug(f"Final critical sectors count: {len(result['critical_sectors'])}")
-                
-                # Add metadata
-                result["metadata"] = {
-                    "model_used": model,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "version": "1.1.1"
-                }
-                
-                debug("Successfully processed API response to match template format")
-            else:
-                # If not valid JSON, try to extract JSON from the text
-                debug("Response is not valid JSON, attempting to extract JSON")
-                json_match = re.search(r'```json\s*(.*?)\s*```', response_content, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(1)
-                    result = json.loads(json_str)
-                    debug("Successfully extracted JSON from code block")
-                else:
-                    # If no JSON found, fallback to text parsing
-                    debug("No JSON found in response, falling back to text parsing")
-                    result = parse_analysis_response(response_content)
-        except json.JSONDecodeError as e:
-            warning(f"Failed to parse response as JSON: {str(e)}")
-            result = parse_analysis_response(response.choices[0].message.content)
-        
-        # Print final structured data for debugging
-        print("========== FINAL STRUCTURED DATA RETURNING TO TEMPLATE ==========")
-        print(json.dumps(result, indent=2))
-        print("================================================================")
-        
-        # Track token usage
-        input_tokens = response.usage.prompt_tokens
-        output_tokens = response.usage.completion_tokens
-        
-        if verbose:
-            print_status(f"Analysis complete. Tokens used: {input_tokens + output_tokens}")
-        
-        return {
-            "text": json.dumps(result, indent=2),
-            "structured": result,
-            "api_details": {
-                "model": model,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "total_tokens": input_tokens + output_tokens
+            
+            debug(f"Final critical sectors count: {len(result['critical_sectors'])}")
+            
+            # Add metadata
+            result["metadata"] = {
+                "model_used": model,
+                "timestamp": datetime.utcnow().isoformat(),
+                "version": "1.1.1"
             }
+            
+            debug("Successfully processed API response to match template format")
+        else:
+            # If not valid JSON, try to extract JSON from the text
+            debug("Response is not valid JSON, attempting to extract JSON")
+            json_match = re.search(r'```json\s*(.*?)\s*```', response_content, re.DOTALL)
+            if json_match:
+                json_str = json_match.group(1)
+                result = json_loads(json_str)
+                debug("Successfully extracted JSON from code block")
+            else:
+                # If no JSON found, fallback to text parsing
+                debug("No JSON found in response, falling back to text parsing")
+                result = parse_analysis_response(response_content)
+    except json.JSONDecodeError as e:
+        warning(f"Failed to parse response as JSON: {str(e)}")
+        result = parse_analysis_response(response.choices[0].message.content)
+    
+    # Print final structured data for debugging
+    print("========== FINAL STRUCTURED DATA RETURNING TO TEMPLATE ==========")
+    print(json_dumps(result))
+    print("================================================================")
+    
+    # Track token usage
+    input_tokens = response.usage.prompt_tokens
+    output_tokens = response.usage.completion_tokens
+    
+    if verbose:
+        print_status(f"Analysis complete. Tokens used: {input_tokens + output_tokens}")
+    
+    return {
+        "text": json_dumps(result),
+        "structured": result,
+        "api_details": {
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens
         }
-        
+    }
+
+def analyze_article(content, url, model=None, verbose=False, structured=True, extract_iocs=True):
+    """
+    Analyze an article using the specified AI model with structured JSON responses.
+    
+    Uses the shared synchronous client, so it is safe to call from request handlers
+    and from code that is already running inside an event loop.
+    
+    Args:
+        content (str): The article content to analyze
+        url (str): The URL of the article
+        model (str, optional): The OpenAI model to use. Defaults to Config.DEFAULT_MODEL.
+        verbose (bool, optional): Whether to print status updates. Defaults to False.
+        structured (bool, optional): Whether to use structured output. Defaults to True.
+        extract_iocs (bool, optional): Whether to extract indicators of compromise. Defaults to True.
+    
+    Returns:
+        dict: A dictionary containing the analysis results and metadata
+    """
+    model, content = _prepare_analysis(content, url, model, verbose)
+    try:
+        response = _request_analysis(client, model, url, content)
+        return _build_analysis_result(response, model, verbose)
+    except Exception as e:
+        if verbose:
+            print_status(f"Error during analysis: {str(e)}", is_error=True)
+        raise
+
+async def analyze_article_async(content, url, model=None, verbose=False, structured=True, extract_iocs=True, api_client=None):
+    """
+    Analyze an article using the specified AI model with structured JSON responses.
+    
+    Batch callers can run several analyses concurrently, e.g.
+    ``await asyncio.gather(*(analyze_article_async(c, u) for c, u in jobs))``.
+    
+    Args:
+        content (str): The article content to analyze
+        url (str): The URL of the article
+        model (str, optional): The OpenAI model to use. Defaults to Config.DEFAULT_MODEL.
+        verbose (bool, optional): Whether to print status updates. Defaults to False.
+        structured (bool, optional): Whether to use structured output. Defaults to True.
+        extract_iocs (bool, optional): Whether to extract indicators of compromise. Defaults to True.
+        api_client (AsyncOpenAI, optional): Client to use. Defaults to the shared async client.
+    
+    Returns:
+        dict: A dictionary containing the analysis results and metadata
+    """
+    if api_client is None:
+        api_client = async_client
+    
+    model, content = _prepare_analysis(content, url, model, verbose)
+    try:
+        response = await _request_analysis_async(api_client, model, url, content)
+        return _build_analysis_result(response, model, verbose)
     except Exception as e:
         if verbose:
             print_status(f"Error during analysis: {str(e)}", is_error=True)
@@ -646,6 +827,34 @@ def self_validate_structured_data(data: Dict[str, Any]) -> None:
         if "justification" not in sector or not sector["justification"]:
             sector["justification"] = "No justification available."
 
+def _split_source_evaluation(source_text: str) -> Dict[str, str]:
+    """
+    Group the lines of a source evaluation section under their labels in one pass.
+    
+    Labels are matched case-insensitively via _SOURCE_EVAL_LABELS; lines that follow
+    a label belong to it until the next label. A source type ends at the next list item.
+    
+    Args:
+        source_text: The source evaluation section text
+    
+    Returns:
+        Dictionary mapping field names (reliability, credibility, source_type) to their text
+    """
+    fields = {}
+    current = None
+    for line in source_text.splitlines():
+        key, sep, value = line.lstrip('-* \t').partition(':')
+        label = _SOURCE_EVAL_LABELS.get(key.strip().casefold()) if sep else None
+        if label:
+            current = label
+            fields[label] = [value]
+        elif current == "source_type" and _LIST_ITEM_PATTERN.match(line):
+            current = None
+        elif current:
+            fields[current].append(line)
+    
+    return {label: "\n".join(lines).strip() for label, lines in fields.items()}
+
 def parse_analysis_response(text: str) -> Dict[str, Any]:
     """
     Parse the AI response into structured data.
@@ -718,42 +927,32 @@ def parse_analysis_response(text: str) -> Dict[str, Any]:
         source_text = sections["source_eval"].group(1).strip()
         debug("Extracting source evaluation details")
         
-        # Try to extract reliability (multiple patterns to increase chances of success)
-        reliability_match = re.search(r'(?:^|\n)[-*]?\s*Reliability:\s*([Hh]igh|[Mm]edium|[Ll]ow)(?:[^-\n]*?)-?\s*(.*?)(?=(?:^|\n)[-*]?\s*Credibility:|Credibility:|\Z)', source_text, re.DOTALL | re.IGNORECASE)
-        if not reliability_match:
-            reliability_match = re.search(r'Reliability:\s*([Hh]igh|[Mm]edium|[Ll]ow)(?:[^-\n]*?)-?\s*(.*?)(?=Credibility:|\Z)', source_text, re.DOTALL | re.IGNORECASE)
-        
-        if reliability_match:
-            structured_data["source_evaluation"]["reliability"] = {
-                "level": reliability_match.group(1).title(),
-                "justification": reliability_match.group(2).strip()
-            }
-            debug(f"Extracted reliability: {reliability_match.group(1).title()}")
-        else:
-            warning("Failed to extract reliability information")
+        fields = _split_source_evaluation(source_text)
         
-        # Extract credibility (multiple patterns to increase chances of success)
-        credibility_match = re.search(r'(?:^|\n)[-*]?\s*Credibility:\s*([Hh]igh|[Mm]edium|[Ll]ow)(?:[^-\n]*?)-?\s*(.*?)(?=(?:^|\n)[-*]?\s*Source Type:|Source Type:|\Z)', source_text, re.DOTALL | re.IGNORECASE)
-        if not credibility_match:
-            credibility_match = re.search(r'Credibility:\s*([Hh]igh|[Mm]edium|[Ll]ow)(?:[^-\n]*?)-?\s*(.*?)(?=Source Type:|\Z)', source_text, re.DOTALL | re.IGNORECASE)
-        
-        if credibility_match:
-            structured_data["source_evaluation"]["credibility"] = {
-                "level": credibility_match.group(1).title(),
-                "justification": credibility_match.group(2).strip()
-            }
-            debug(f"Extracted credibility: {credibility_match.group(1).title()}")
-        else:
-            warning("Failed to extract credibility information")
+        # Reliability and credibility take the form "Label: High - justification"
+        for label, (field_pattern, fallback_pattern) in _LEVEL_PATTERNS.items():
+            level_match = field_pattern.match(fields.get(label, ""))
+            if not level_match:
+                # Label not at the start of a line, e.g. several fields run together
+                level_match = fallback_pattern.search(source_text)
+            
+            if level_match:
+                structured_data["source_evaluation"][label] = {
+                    "level": level_match.group(1).title(),
+                    "justification": level_match.group(2).strip()
+                }
+                debug(f"Extracted {label}: {level_match.group(1).title()}")
+            else:
+                warning(f"Failed to extract {label} information")
         
-        # Extract source type (multiple patterns to increase chances of success)
-        source_type_match = re.search(r'(?:^|\n)[-*]?\s*Source Type:\s*(.*?)(?=\Z|\n(?:\d+\.|\-))', source_text, re.DOTALL | re.IGNORECASE)
-        if not source_type_match:
-            source_type_match = re.search(r'Source Type:\s*(.*?)(?=$)', source_text, re.DOTALL | re.IGNORECASE)
+        source_type = fields.get("source_type")
+        if source_type is None:
+            source_type_match = _SOURCE_TYPE_PATTERN.search(source_text)
+            source_type = source_type_match.group(1).strip() if source_type_match else None
         
-        if source_type_match:
-            structured_data["source_evaluation"]["source_type"] = source_type_match.group(1).strip()
-            debug(f"Extracted source type: {source_type_match.group(1).strip()}")
+        if source_type is not None:
+            structured_data["source_evaluation"]["source_type"] = source_type
+            debug(f"Extracted source type: {source_type}")
         else:
             warning("Failed to extract source type information")
     else:
@@ -884,38 +1083,17 @@ def parse_analysis_response(text: str) -> Dict[str, Any]:
         sectors_text = sections["sectors"].group(1).strip()
         debug("Extracting critical infrastructure sectors assessment")
         
-        # Better pattern to match sectors in various formats:
-        # - Both numbered and bulleted lists
-        # - With or without asterisks/bold formatting
-        # - Various delimiter formats between name, score and justification
-        
-        # This pattern captures:
-        # 1. Sector name
-        # 2. Score (1-5)
-        # 3. Justification text
-        sector_patterns = [
-            # Pattern for "1. Name: Score - Justification"
-            r'(?:^|\n)(?:\d+\.|\-)\s*(?:\*\*)?([^:]+?)(?:\*\*)?\s*:\s*(?:\*\*)?(\d+)(?:\*\*)?(?:[^-]*?)-\s*(.*?)(?=(?:\n(?:\d+\.|\-))|$)',
-            
-            # Pattern for "1. Name: Score high/medium/low relevance..."
-            r'(?:^|\n)(?:\d+\.|\-)\s*(?:\*\*)?([^:]+?)(?:\*\*)?:\s*(?:\*\*)?(\d+)(?:\*\*)?(?:\s*-\s*|\s+)([Hh]igh|[Mm]edium|[Ll]ow|[Mm]oderate)(?:\s+relevance\s+)(.*?)(?=(?:\n(?:\d+\.|\-))|$)',
-            
-            # Pattern for nested numbered lists "1. Name: 1. Score - Justification"
-            r'(?:^|\n)(?:\d+\.|\-)\s*(?:\*\*)?([^:]+?)(?:\*\*)?:\s*(?:\d+\.)\s*(?:\*\*)?(\d+)(?:\*\*)?(?:[^-]*?)-\s*(.*?)(?=(?:\n(?:\d+\.|\-))|$)'
-        ]
-        
         # Try each pattern and collect all matches
         all_sectors = []
-        for pattern in sector_patterns:
-            sectors = re.findall(pattern, sectors_text, re.DOTALL)
+        for pattern in _SECTOR_PATTERNS:
+            sectors = pattern.findall(sectors_text)
             if sectors:
                 all_sectors.extend(sectors)
-                debug(f"Found {len(sectors)} sectors with pattern {pattern[:30]}...")
+                debug(f"Found {len(sectors)} sectors with pattern {pattern.pattern[:30]}...")
         
         # If no sectors found, try a more generic fallback pattern
         if not all_sectors:
-            generic_pattern = r'(?:^|\n)(?:\d+\.|\-)\s*(?:\*\*)?([^:]+?)(?:\*\*)?\s*:?\s*(?:\*\*)?(\d+)(?:\*\*)?(?:[^a-zA-Z\n]*)(.*?)(?=(?:\n(?:\d+\.|\-))|$)'
-            generic_sectors = re.findall(generic_pattern, sectors_text, re.DOTALL)
+            generic_sectors = _GENERIC_SECTOR_PATTERN.findall(sectors_text)
             all_sectors.extend(generic_sectors)
             debug(f"Found {len(generic_sectors)} sectors with generic fallback pattern")
         
@@ -962,7 +1140,7 @@ def parse_analysis_response(text: str) -> Dict[str, Any]:
                     continue
                 
                 # Look for lines that might be sector definitions
-                sector_line_match = re.search(r'(?:\d+\.|\-)\s*([^:]+?):\s*(\d+)', line)
+                sector_line_match = _SECTOR_LINE_PATTERN.search(line)
                 if sector_line_match:
                     sector_name = sector_line_match.group(1).strip()
                     sector_score = int(sector_line_match.group(2))
@@ -1025,7 +1203,7 @@ def parse_mitre_technique(text: str) -> Dict[str, str]:
 # Helper function to check if a string is valid JSON
 def is_valid_json(json_string):
     try:
-        json.loads(json_string)
+        json_loads(json_string)
         return True
     except json.JSONDecodeError:
         return False 
\ No newline at end of file
@@ -17,8 +17,12 @@ This module is primarily used by the article analysis pipeline to obtain the tex
 that will be analyzed by the OpenAI API for threat intelligence insights.
 """
 
+import http.cookiejar
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import soupsieve as sv
 import re
 import time
 from typing import Optional, Dict, List, Tuple
@@ -27,6 +31,56 @@ from urllib.parse import urlparse
 
 from app.utilities.logger import print_status, info, debug, error, warning
 
+# Shared session so repeated extractions reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    # Ignore Retry-After so a server cannot stall the worker beyond the request
+    # timeout, and return the last response so raise_for_status reports it
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+# Every user's extractions share the session, so it must never keep cookies
+_SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+# Common article containers, in priority order
+CONTAINER_SELECTORS = [
+    'article', 'main', '.post-content', '.article-content', '.entry-content', 
+    '#content', '.content', '.post', '.article', '.story-body', '.story',
+    '.post-body', '.news-article', '.blog-post', '.node-content',
+    '[itemprop="articleBody"]', '.body', '.entry', '.story-text'
+]
+
+# One grouped selector finds every candidate in a single pass over the DOM;
+# the per-selector patterns then pick the winner by priority
+_CONTAINER_SEL = sv.compile(', '.join(CONTAINER_SELECTORS))
+_CONTAINER_PATTERNS = [sv.compile(selector) for selector in CONTAINER_SELECTORS]
+
+# Common noise phrases stripped from extracted text
+NOISE_PATTERNS = [
+    r'Share this article',
+    r'Share on:',
+    r'Related articles',
+    r'You might also like',
+    r'Click to share',
+    r'Comments \(\d+\)',
+    r'Read more',
+    r'Subscribe to our newsletter',
+    r'Sign up for our newsletter',
+    r'Advertisement',
+]
+
+_NOISE_PATTERN = re.compile('|'.join(NOISE_PATTERNS), re.IGNORECASE)
+_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+
 def extract_article_content(url: str, verbose: bool = True) -> Optional[str]:
     """
     Extract article content using multiple methods and combine the best results.
@@ -64,7 +118,7 @@ def extract_article_content(url: str, verbose: bool = True) -> Optional[str]:
         # Send the HTTP request
         debug(f"Sending HTTP request to {url} with timeout=20 seconds")
         start_time = time.time()
-        response = requests.get(url, headers=headers, timeout=20)
+        response = _SESSION.get(url, headers=headers, timeout=20)
         elapsed = time.time() - start_time
         
         debug(f"Received response in {elapsed:.2f} seconds (Status: {response.status_code})")
@@ -74,65 +128,27 @@ def extract_article_content(url: str, verbose: bool = True) -> Optional[str]:
         
         response.raise_for_status()
         
-        # Parse the HTML content
+        # Parse the HTML content and pick the best extraction
         debug(f"Parsing HTML content ({len(response.text)} bytes)")
         parse_start = time.time()
         
         if verbose:
             print_status(f"Parsing HTML content ({len(response.text)} bytes)")
-            parse_start = time.time()
-            
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        parse_elapsed = time.time() - parse_start
-        debug(f"HTML parsed in {parse_elapsed:.2f} seconds")
-        
-        if verbose:
-            print_status(f"HTML parsed in {parse_elapsed:.2f} seconds")
             print_status("Applying multiple extraction methods...")
         
-        # Try multiple methods and combine the results
-        extraction_results = []
-        
-        # Method 1: Extract using common article containers
-        method1_text = extract_by_containers(soup, verbose)
-        if method1_text and len(method1_text) > 200:
-            extraction_results.append((method1_text, len(method1_text), "container_based"))
-            debug(f"Container method retrieved {len(method1_text)} characters")
+        final_text, method_used = _extract_best_text(response.text)
         
-        # Method 2: Extract using paragraphs
-        method2_text = extract_by_paragraphs(soup, verbose)
-        if method2_text and len(method2_text) > 200:
-            extraction_results.append((method2_text, len(method2_text), "paragraph_based"))
-            debug(f"Paragraph method retrieved {len(method2_text)} characters")
+        parse_elapsed = time.time() - parse_start
+        debug(f"HTML parsed and extracted in {parse_elapsed:.2f} seconds")
         
-        # Method 3: Extract using text density
-        method3_text = extract_by_text_density(soup, verbose)
-        if method3_text and len(method3_text) > 200:
-            extraction_results.append((method3_text, len(method3_text), "density_based"))
-            debug(f"Density method retrieved {len(method3_text)} characters")
+        if verbose:
+            print_status(f"HTML parsed and extracted in {parse_elapsed:.2f} seconds")
         
-        # Select the best result (prioritize by length but consider quality)
-        if not extraction_results:
+        if method_used is None:
             warning(f"All extraction methods failed for {url}")
             if verbose:
                 print_status(f"All extraction methods failed. Trying fallback method...", is_error=True)
-            
-            # Fallback: Get all text from body with minimal cleaning
-            fallback_text = soup.body.get_text(" ", strip=True)
-            fallback_text = clean_extracted_text(fallback_text)
-            
-            if fallback_text and len(fallback_text) > 200:
-                debug(f"Fallback method retrieved {len(fallback_text)} characters")
-                return fallback_text
-            return None
-        
-        # Sort by length (descending)
-        extraction_results.sort(key=lambda x: x[1], reverse=True)
-        
-        # Pick the longest result that isn't garbage
-        final_text = extraction_results[0][0]
-        method_used = extraction_results[0][2]
+            return final_text
         
         info(f"Extraction complete. Retrieved {len(final_text)} characters using {method_used} method from {url}")
         debug(f"Content sample: \n{final_text[:200]}...")
@@ -173,6 +189,55 @@ def extract_article_content(url: str, verbose: bool = True) -> Optional[str]:
             print_status(f"Traceback: {error_details}", is_error=True)
         return None
 
+def _extract_best_text(html: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Parse HTML and return the best extraction as (text, method).
+    
+    The extraction methods decompose nodes, so each call builds its own soup.
+    
+    Args:
+        html: The raw HTML of the page
+        
+    Returns:
+        Tuple of extracted text (or None) and the method used; the method is
+        None when every method failed and the text is the body fallback
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Try multiple methods and combine the results
+    extraction_results = []
+    
+    # Method 1: Extract using common article containers
+    method1_text = extract_by_containers(soup)
+    if method1_text and len(method1_text) > 200:
+        extraction_results.append((method1_text, len(method1_text), "container_based"))
+        debug(f"Container method retrieved {len(method1_text)} characters")
+    
+    # Method 2: Extract using paragraphs
+    method2_text = extract_by_paragraphs(soup)
+    if method2_text and len(method2_text) > 200:
+        extraction_results.append((method2_text, len(method2_text), "paragraph_based"))
+        debug(f"Paragraph method retrieved {len(method2_text)} characters")
+    
+    # Method 3: Extract using text density
+    method3_text = extract_by_text_density(soup)
+    if method3_text and len(method3_text) > 200:
+        extraction_results.append((method3_text, len(method3_text), "density_based"))
+        debug(f"Density method retrieved {len(method3_text)} characters")
+    
+    if not extraction_results:
+        # Fallback: Get all text from body with minimal cleaning
+        fallback_text = clean_extracted_text(soup.body.get_text(" ", strip=True))
+        
+        if fallback_text and len(fallback_text) > 200:
+            debug(f"Fallback method retrieved {len(fallback_text)} characters")
+            return fallback_text, None
+        return None, None
+    
+    # Pick the longest result (the first one wins ties)
+    best_text, _, method_used = max(extraction_results, key=lambda x: x[1])
+    return best_text, method_used
+
 def get_domain_specific_headers(domain: str) -> Dict[str, str]:
     """
     Get headers customized for specific domains to improve extraction.
@@ -230,17 +295,13 @@ def extract_by_containers(soup: BeautifulSoup, verbose: bool = True) -> Optional
         element.decompose()
     
     # Look for common article containers
-    selectors = [
-        'article', 'main', '.post-content', '.article-content', '.entry-content', 
-        '#content', '.content', '.post', '.article', '.story-body', '.story',
-        '.post-body', '.news-article', '.blog-post', '.node-content',
-        '[itemprop="articleBody"]', '.body', '.entry', '.story-text'
-    ]
-    
-    for selector in selectors:
-        content = soup.select(selector)
-        if content:
-            main_content = content[0]
+    candidates = _CONTAINER_SEL.select(soup)
+    if not candidates:
+        return None
+    
+    for pattern in _CONTAINER_PATTERNS:
+        main_content = next((node for node in candidates if pattern.match(node)), None)
+        if main_content is not None:
             text = main_content.get_text(separator='\n')
             return clean_extracted_text(text)
     
@@ -339,7 +400,9 @@ def clean_extracted_text(text: str) -> str:
     Clean up extracted text.
     
     This function removes excessive whitespace, common noise phrases, and 
-    other unwanted elements from the extracted text.
+    other unwanted elements from the extracted text. The text comes from
+    BeautifulSoup, which has already decoded HTML entities, so entities are
+    not decoded again; literal text such as "&lt;" in an article stays as is.
     
     Args:
         text: The raw extracted text to clean
@@ -356,23 +419,9 @@ def clean_extracted_text(text: str) -> str:
     text = '\n'.join(line for line in lines if line)
     
     # Remove excessive newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _EXCESS_NEWLINES.sub('\n\n', text)
     
     # Remove common noise phrases
-    noise_patterns = [
-        r'Share this article',
-        r'Share on:',
-        r'Related articles',
-        r'You might also like',
-        r'Click to share',
-        r'Comments \(\d+\)',
-        r'Read more',
-        r'Subscribe to our newsletter',
-        r'Sign up for our newsletter',
-        r'Advertisement',
-    ]
-    
-    for pattern in noise_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = _NOISE_PATTERN.sub('', text)
     
     return text 
\ No newline at end of file
@@ -16,12 +16,28 @@ These functions are used primarily by the report generation and download feature
 in the application's user interface.
 """
 import os
-import json
 import csv
 import tempfile
 from typing import Dict, Any, Optional, List, Union
 import datetime
+from functools import lru_cache
 from app.utilities.helpers import sanitize_filename
+from app.utilities.json_utils import json_dumps_bytes
+
+# Write buffer for row-oriented exports, so many small rows become a few large writes
+_EXPORT_BUFFER_SIZE = 256 * 1024
+
+# File extension for each export format
+_EXPORT_EXTENSIONS = {
+    "json": "json",
+    "csv": "csv",
+    "pdf": "pdf",
+    "markdown": "md"
+}
+
+# Longest base name (before the extension), leaving room for the directory path
+_MAX_BASE_NAME_LENGTH = 240
+_TIMESTAMP_SUFFIX_LENGTH = len("_YYYYmmdd_HHMMSS")
 
 def get_export_filename(domain: Optional[str], format_type: str) -> str:
     """
@@ -40,30 +56,15 @@ def get_export_filename(domain: Optional[str], format_type: str) -> str:
         (e.g., 'example_com_20230101_123045.json')
     """
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    
+    extension = _EXPORT_EXTENSIONS.get(format_type.lower(), "txt")
+    return f"{_export_name_prefix(domain)}_{timestamp}.{extension}"
+
+@lru_cache(maxsize=1024)
+def _export_name_prefix(domain: Optional[str]) -> str:
+    """Sanitized, length-capped filename prefix for a domain (the timestamp is added per call)."""
     if not domain:
-        base_name = f"analysis_{timestamp}"
-    else:
-        # Sanitize domain for filename
-        safe_domain = sanitize_filename(domain)
-        base_name = f"{safe_domain}_{timestamp}"
-    
-    # Map format to file extension
-    extensions = {
-        "json": "json",
-        "csv": "csv",
-        "pdf": "pdf",
-        "markdown": "md"
-    }
-    
-    extension = extensions.get(format_type.lower(), "txt")
-    
-    # Ensure filename isn't too long for filesystem
-    max_length = 240  # Allow space for path and extension
-    if len(base_name) > max_length:
-        base_name = base_name[:max_length]
-    
-    return f"{base_name}.{extension}"
+        return "analysis"
+    return sanitize_filename(domain)[:_MAX_BASE_NAME_LENGTH - _TIMESTAMP_SUFFIX_LENGTH]
 
 def export_analysis_as_json(
     analysis_data: Dict[str, Any], 
@@ -94,9 +95,10 @@ def export_analysis_as_json(
             filename = get_export_filename(domain, "json")
             file_path = os.path.join(tempfile.gettempdir(), filename)
         
-        # Write JSON to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(analysis_data, f, indent=2, ensure_ascii=False)
+        # Serialize once and write the encoded bytes in a single call
+        payload = json_dumps_bytes(analysis_data)
+        with open(file_path, 'wb') as f:
+            f.write(payload)
         
         return {
             "success": True,
@@ -109,6 +111,131 @@ def export_analysis_as_json(
             "message": f"Error exporting analysis as JSON: {str(e)}"
         }
 
+def _iter_csv_rows(analysis_data: Dict[str, Any]):
+    """Yield the two-column CSV rows for an analysis, section by section."""
+    # Extract structured data
+    structured = analysis_data.get("structured", {})
+    
+    # Basic metadata
+    yield ["URL", analysis_data.get("url", "Not provided")]
+    yield ["Analysis Date", datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
+    yield ["Model Used", analysis_data.get("model", "Unknown")]
+    yield []  # Empty row as separator
+    
+    # Summary
+    yield ["SUMMARY", structured.get("summary", "")]
+    yield []  # Empty row as separator
+    
+    # Source evaluation
+    source_eval = structured.get("source_evaluation", {})
+    yield ["SOURCE EVALUATION", ""]
+    yield ["Reliability", 
+           f"{source_eval.get('reliability', {}).get('level', 'Unknown')} - " +
+           f"{source_eval.get('reliability', {}).get('justification', '')}"]
+    yield ["Credibility", 
+           f"{source_eval.get('credibility', {}).get('level', 'Unknown')} - " +
+           f"{source_eval.get('credibility', {}).get('justification', '')}"]
+    yield ["Source Type", source_eval.get("source_type", "Unknown")]
+    yield []  # Empty row as separator
+    
+    # Threat Actors
+    threat_actors = structured.get("threat_actors", [])
+    if threat_actors:
+        yield ["THREAT ACTORS", ""]
+        for idx, actor in enumerate(threat_actors, 1):
+            aliases = ", ".join(actor.get("aliases", [])) if "aliases" in actor and actor["aliases"] else "None"
+            yield [f"Actor {idx}", 
+                   f"Name: {actor.get('name', 'Unknown')}, " +
+                   f"Confidence: {actor.get('confidence', 'Unknown')}, " +
+                   f"Aliases: {aliases}, " +
+                   f"Description: {actor.get('description', '')}"]
+        yield []  # Empty row as separator
+    
+    # MITRE ATT&CK techniques
+    mitre_techniques = structured.get("mitre_techniques", [])
+    if mitre_techniques:
+        yield ["MITRE ATT&CK TECHNIQUES", ""]
+        for idx, technique in enumerate(mitre_techniques, 1):
+            yield [f"Technique {idx}", 
+                   f"ID: {technique.get('id', 'Unknown')}, " +
+                   f"Name: {technique.get('name', 'Unknown')}, " +
+                   f"Description: {technique.get('description', '')}"]
+        yield []  # Empty row as separator
+    
+    # Key insights
+    key_insights = structured.get("key_insights", [])
+    if key_insights:
+        yield ["KEY THREAT INTELLIGENCE INSIGHTS", ""]
+        for idx, insight in enumerate(key_insights, 1):
+            yield [f"Insight {idx}", insight]
+        yield []  # Empty row as separator
+    
+    # Potential issues
+    potential_issues = structured.get("potential_issues", [])
+    if potential_issues:
+        yield ["POTENTIAL BIAS OR ISSUES", ""]
+        for idx, issue in enumerate(potential_issues, 1):
+            yield [f"Issue {idx}", issue]
+        yield []  # Empty row as separator
+        
+    # Intelligence Gaps
+    intelligence_gaps = structured.get("intelligence_gaps", [])
+    if intelligence_gaps:
+        yield ["INTELLIGENCE GAPS", ""]
+        for idx, gap in enumerate(intelligence_gaps, 1):
+            yield [f"Gap {idx}", gap]
+        yield []  # Empty row as separator
+    
+    # Critical sectors
+    critical_sectors = structured.get("critical_sectors", [])
+    if critical_sectors:
+        yield ["CRITICAL INFRASTRUCTURE SECTORS", ""]
+        for sector in critical_sectors:
+            yield [sector.get("name", "Unknown"), 
+                   f"Score: {sector.get('score', 0)}/5, " +
+                   f"Justification: {sector.get('justification', '')}"]
+        yield []  # Empty row as separator
+    
+    # Indicators (if available)
+    indicators = structured.get("indicators", {})
+    if indicators and indicators.get("total_count", 0) > 0:
+        yield ["INDICATORS OF COMPROMISE", f"Total Count: {indicators.get('total_count', 0)}"]
+        
+        # Add IP addresses
+        ip_addresses = indicators.get("ip_addresses", [])
+        if ip_addresses:
+            yield ["IP Addresses", ""]
+            for ip in ip_addresses:
+                yield ["", ip]
+        
+        # Add domains
+        domains = indicators.get("domains", [])
+        if domains:
+            yield ["Domains", ""]
+            for domain_item in domains:
+                yield ["", domain_item]
+        
+        # Add URLs
+        urls = indicators.get("urls", [])
+        if urls:
+            yield ["URLs", ""]
+            for url_item in urls:
+                yield ["", url_item]
+        
+        # Add file hashes
+        file_hashes = indicators.get("file_hashes", [])
+        if file_hashes:
+            yield ["File Hashes", ""]
+            for hash_item in file_hashes:
+                yield ["", hash_item]
+        
+        # Add email addresses
+        email_addresses = indicators.get("email_addresses", [])
+        if email_addresses:
+            yield ["Email Addresses", ""]
+            for email in email_addresses:
+                yield ["", email]
+
 def export_analysis_as_csv(
     analysis_data: Dict[str, Any], 
     domain: Optional[str] = None,
@@ -138,136 +265,10 @@ def export_analysis_as_csv(
             filename = get_export_filename(domain, "csv")
             file_path = os.path.join(tempfile.gettempdir(), filename)
         
-        # Extract structured data
-        structured = analysis_data.get("structured", {})
-        
-        # Prepare rows for CSV
-        rows = []
-        
-        # Basic metadata
-        rows.append(["URL", analysis_data.get("url", "Not provided")])
-        rows.append(["Analysis Date", datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
-        rows.append(["Model Used", analysis_data.get("model", "Unknown")])
-        rows.append([])  # Empty row as separator
-        
-        # Summary
-        rows.append(["SUMMARY", structured.get("summary", "")])
-        rows.append([])  # Empty row as separator
-        
-        # Source evaluation
-        source_eval = structured.get("source_evaluation", {})
-        rows.append(["SOURCE EVALUATION", ""])
-        rows.append(["Reliability", 
-                    f"{source_eval.get('reliability', {}).get('level', 'Unknown')} - " +
-                    f"{source_eval.get('reliability', {}).get('justification', '')}"])
-        rows.append(["Credibility", 
-                    f"{source_eval.get('credibility', {}).get('level', 'Unknown')} - " +
-                    f"{source_eval.get('credibility', {}).get('justification', '')}"])
-        rows.append(["Source Type", source_eval.get("source_type", "Unknown")])
-        rows.append([])  # Empty row as separator
-        
-        # Threat Actors
-        threat_actors = structured.get("threat_actors", [])
-        if threat_actors:
-            rows.append(["THREAT ACTORS", ""])
-            for idx, actor in enumerate(threat_actors, 1):
-                aliases = ", ".join(actor.get("aliases", [])) if "aliases" in actor and actor["aliases"] else "None"
-                rows.append([f"Actor {idx}", 
-                           f"Name: {actor.get('name', 'Unknown')}, " +
-                           f"Confidence: {actor.get('confidence', 'Unknown')}, " +
-                           f"Aliases: {aliases}, " +
-                           f"Description: {actor.get('description', '')}"])
-            rows.append([])  # Empty row as separator
-        
-        # MITRE ATT&CK techniques
-        mitre_techniques = structured.get("mitre_techniques", [])
-        if mitre_techniques:
-            rows.append(["MITRE ATT&CK TECHNIQUES", ""])
-            for idx, technique in enumerate(mitre_techniques, 1):
-                rows.append([f"Technique {idx}", 
-                           f"ID: {technique.get('id', 'Unknown')}, " +
-                           f"Name: {technique.get('name', 'Unknown')}, " +
-                           f"Description: {technique.get('description', '')}"])
-            rows.append([])  # Empty row as separator
-        
-        # Key insights
-        key_insights = structured.get("key_insights", [])
-        if key_insights:
-            rows.append(["KEY THREAT INTELLIGENCE INSIGHTS", ""])
-            for idx, insight in enumerate(key_insights, 1):
-                rows.append([f"Insight {idx}", insight])
-            rows.append([])  # Empty row as separator
-        
-        # Potential issues
-        potential_issues = structured.get("potential_issues", [])
-        if potential_issues:
-            rows.append(["POTENTIAL BIAS OR ISSUES", ""])
-            for idx, issue in enumerate(potential_issues, 1):
-                rows.append([f"Issue {idx}", issue])
-            rows.append([])  # Empty row as separator
-            
-        # Intelligence Gaps
-        intelligence_gaps = structured.get("intelligence_gaps", [])
-        if intelligence_gaps:
-            rows.append(["INTELLIGENCE GAPS", ""])
-            for idx, gap in enumerate(intelligence_gaps, 1):
-                rows.append([f"Gap {idx}", gap])
-            rows.append([])  # Empty row as separator
-        
-        # Critical sectors
-        critical_sectors = structured.get("critical_sectors", [])
-        if critical_sectors:
-            rows.append(["CRITICAL INFRASTRUCTURE SECTORS", ""])
-            for sector in critical_sectors:
-                rows.append([sector.get("name", "Unknown"), 
-                           f"Score: {sector.get('score', 0)}/5, " +
-                           f"Justification: {sector.get('justification', '')}"])
-            rows.append([])  # Empty row as separator
-        
-        # Indicators (if available)
-        indicators = structured.get("indicators", {})
-        if indicators and indicators.get("total_count", 0) > 0:
-            rows.append(["INDICATORS OF COMPROMISE", f"Total Count: {indicators.get('total_count', 0)}"])
-            
-            # Add IP addresses
-            ip_addresses = indicators.get("ip_addresses", [])
-            if ip_addresses:
-                rows.append(["IP Addresses", ""])
-                for ip in ip_addresses:
-                    rows.append(["", ip])
-            
-            # Add domains
-            domains = indicators.get("domains", [])
-            if domains:
-                rows.append(["Domains", ""])
-                for domain_item in domains:
-                    rows.append(["", domain_item])
-            
-            # Add URLs
-            urls = indicators.get("urls", [])
-            if urls:
-                rows.append(["URLs", ""])
-                for url_item in urls:
-                    rows.append(["", url_item])
-            
-            # Add file hashes
-            file_hashes = indicators.get("file_hashes", [])
-            if file_hashes:
-                rows.append(["File Hashes", ""])
-                for hash_item in file_hashes:
-                    rows.append(["", hash_item])
-            
-            # Add email addresses
-            email_addresses = indicators.get("email_addresses", [])
-            if email_addresses:
-                rows.append(["Email Addresses", ""])
-                for email in email_addresses:
-                    rows.append(["", email])
-        
-        # Write CSV file
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        # Write CSV file through a large buffer; flushed once on close
+        with open(file_path, 'w', newline='', encoding='utf-8', buffering=_EXPORT_BUFFER_SIZE) as f:
             writer = csv.writer(f)
-            writer.writerows(rows)
+            writer.writerows(_iter_csv_rows(analysis_data))
         
         return {
             "success": True,
@@ -405,22 +406,19 @@ def export_analysis_as_markdown(
         # Add key insights
         if "key_insights" in structured and structured["key_insights"]:
             markdown_lines.append("## Key Threat Intelligence Insights")
-            for insight in structured["key_insights"]:
-                markdown_lines.append(f"- {insight}")
+            markdown_lines.extend(f"- {insight}" for insight in structured["key_insights"])
             markdown_lines.append("")  # Empty line
         
         # Add potential issues
         if "potential_issues" in structured and structured["potential_issues"]:
             markdown_lines.append("## Potential Bias or Issues")
-            for issue in structured["potential_issues"]:
-                markdown_lines.append(f"- {issue}")
+            markdown_lines.extend(f"- {issue}" for issue in structured["potential_issues"])
             markdown_lines.append("")  # Empty line
             
         # Add intelligence gaps
         if "intelligence_gaps" in structured and structured["intelligence_gaps"]:
             markdown_lines.append("## Intelligence Gaps")
-            for gap in structured["intelligence_gaps"]:
-                markdown_lines.append(f"- {gap}")
+            markdown_lines.extend(f"- {gap}" for gap in structured["intelligence_gaps"])
             markdown_lines.append("")  # Empty line
         
         # Add critical sectors
@@ -447,32 +445,27 @@ def export_analysis_as_markdown(
                 
                 if "ip_addresses" in indicators and indicators["ip_addresses"]:
                     markdown_lines.append("### IP Addresses")
-                    for ip in indicators["ip_addresses"]:
-                        markdown_lines.append(f"- `{ip}`")
+                    markdown_lines.extend(f"- `{ip}`" for ip in indicators["ip_addresses"])
                     markdown_lines.append("")  # Empty line
                 
                 if "domains" in indicators and indicators["domains"]:
                     markdown_lines.append("### Domains")
-                    for domain_item in indicators["domains"]:
-                        markdown_lines.append(f"- `{domain_item}`")
+                    markdown_lines.extend(f"- `{domain_item}`" for domain_item in indicators["domains"])
                     markdown_lines.append("")  # Empty line
                 
                 if "urls" in indicators and indicators["urls"]:
                     markdown_lines.append("### URLs")
-                    for url_item in indicators["urls"]:
-                        markdown_lines.append(f"- `{url_item}`")
+                    markdown_lines.extend(f"- `{url_item}`" for url_item in indicators["urls"])
                     markdown_lines.append("")  # Empty line
                 
                 if "file_hashes" in indicators and indicators["file_hashes"]:
                     markdown_lines.append("### File Hashes")
-                    for hash_item in indicators["file_hashes"]:
-                        markdown_lines.append(f"- `{hash_item}`")
+                    markdown_lines.extend(f"- `{hash_item}`" for hash_item in indicators["file_hashes"])
                     markdown_lines.append("")  # Empty line
                 
                 if "email_addresses" in indicators and indicators["email_addresses"]:
                     markdown_lines.append("### Email Addresses")
-                    for email in indicators["email_addresses"]:
-                        markdown_lines.append(f"- `{email}`")
+                    markdown_lines.extend(f"- `{email}`" for email in indicators["email_addresses"])
                     markdown_lines.append("")  # Empty line
         
         # Add a footer
@@ -568,8 +561,7 @@ def generate_pdf(markdown_path: str, output_path: str) -> bool:
             content = md_file.read()
         
         with open(output_path, 'w', encoding='utf-8') as pdf_file:
-            pdf_file.write("PDF PLACEHOLDER\n\n")
-            pdf_file.write(content)
+            pdf_file.write("PDF PLACEHOLDER\n\n" + content)
         
         return True
     except Exception:
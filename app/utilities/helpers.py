@@ -15,10 +15,28 @@ These utilities are designed to be simple, pure functions that don't rely on app
 or external services, making them easily testable and reusable across the application.
 """
 import re
-from datetime import datetime
+import math
+import time
+import ipaddress
+import unicodedata
+from functools import lru_cache
+from urllib.parse import urlsplit
 import json
 from typing import Dict, Any, Optional, Union, List
 
+import tldextract
+
+from app.utilities.json_utils import json_loads, json_dumps
+
+# Pattern used by the slug helper, compiled once at import
+_SLUG_NONALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+# Characters that are invalid or awkward in filenames, plus ASCII whitespace, mapped to '_'
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '\\/*?:"<>|%! \t\n\r\v\f'})
+
+# Offline public-suffix lookup using the snapshot bundled with tldextract
+_tld_extract = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
 def format_timestamp(timestamp: Optional[Union[int, float]]) -> str:
     """
     Format a Unix timestamp to a human-readable date string.
@@ -35,11 +53,15 @@ def format_timestamp(timestamp: Optional[Union[int, float]]) -> str:
     try:
         if timestamp is None:
             return "N/A"
-        dt = datetime.fromtimestamp(float(timestamp))
-        return dt.strftime("%b %d, %Y %H:%M")
-    except (ValueError, TypeError):
+        return _format_epoch_seconds(math.floor(float(timestamp)))
+    except (ValueError, TypeError, OverflowError, OSError):
         return "N/A"
 
+@lru_cache(maxsize=1024)
+def _format_epoch_seconds(seconds: int) -> str:
+    """Format whole epoch seconds in local time; cached since the output is minute-resolution."""
+    return time.strftime("%b %d, %Y %H:%M", time.localtime(seconds))
+
 def format_seconds(seconds: Optional[Union[int, float]]) -> str:
     """
     Format seconds into a human-readable duration string.
@@ -58,23 +80,22 @@ def format_seconds(seconds: Optional[Union[int, float]]) -> str:
         if seconds is None:
             return "N/A"
         
-        seconds = float(seconds)
-        if seconds < 0:
-            seconds = 0
-            
+        # Work in whole seconds so divmod stays in integer arithmetic
+        seconds = max(int(float(seconds)), 0)
+        
         hours, remainder = divmod(seconds, 3600)
         minutes, seconds = divmod(remainder, 60)
         
         parts = []
-        if hours > 0:
-            parts.append(f"{int(hours)} hour{'s' if hours != 1 else ''}")
-        if minutes > 0:
-            parts.append(f"{int(minutes)} minute{'s' if minutes != 1 else ''}")
-        if seconds > 0 or (hours == 0 and minutes == 0):
-            parts.append(f"{int(seconds)} second{'s' if seconds != 1 else ''}")
+        if hours:
+            parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
+        if minutes:
+            parts.append(f"{minutes} minute{'s' if minutes != 1 else ''}")
+        if seconds or not parts:
+            parts.append(f"{seconds} second{'s' if seconds != 1 else ''}")
             
         return " ".join(parts)
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, OverflowError):
         return "N/A"
 
 def parse_domain_from_url(url: Optional[str]) -> str:
@@ -94,24 +115,24 @@ def parse_domain_from_url(url: Optional[str]) -> str:
     if not url:
         return ""
     
-    # Remove protocol
-    domain = url.lower()
-    if "://" in domain:
-        domain = domain.split("://", 1)[1]
-    
-    # Remove path
-    domain = domain.split("/", 1)[0]
+    try:
+        host = urlsplit(url if "://" in url else f"http://{url}").hostname
+    except ValueError:
+        host = None
     
-    # Remove subdomain (keep only second-level domain)
-    parts = domain.split(".")
-    if len(parts) > 2 and not re.match(r'\d+\.\d+\.\d+\.\d+', domain):
-        # Check for country code TLDs (e.g., .co.uk, .com.au)
-        if len(parts) > 2 and parts[-2] in ["co", "com", "org", "net", "ac", "gov", "edu"]:
-            domain = ".".join(parts[-3:])
-        else:
-            domain = ".".join(parts[-2:])
+    return _registrable_domain(host or url.lower())
+
+@lru_cache(maxsize=4096)
+def _registrable_domain(host: str) -> str:
+    """Return the registrable domain for a hostname, leaving IP addresses untouched."""
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
     
-    return domain
+    ext = _tld_extract(host)
+    return ".".join(part for part in (ext.domain, ext.suffix) if part) or host
 
 def generate_slug(text: Optional[str]) -> str:
     """
@@ -129,25 +150,17 @@ def generate_slug(text: Optional[str]) -> str:
     if not text:
         return ""
     
-    # Convert to lowercase
-    slug = text.lower()
-    
-    # Replace non-alphanumeric with hyphens
-    slug = re.sub(r'[^a-z0-9]+', '-', slug)
+    # Fold accented characters to their ASCII base before lowercasing
+    slug = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
     
-    # Remove leading/trailing hyphens
-    slug = slug.strip('-')
-    
-    # Remove consecutive hyphens
-    slug = re.sub(r'-+', '-', slug)
-    
-    return slug
+    # Replace runs of non-alphanumerics with a single hyphen and trim the ends
+    return _SLUG_NONALNUM_RE.sub('-', slug).strip('-')
 
 def sanitize_filename(filename: Optional[str]) -> str:
     """
     Sanitize a string to be used as a filename.
     
-    Removes invalid filename characters and replaces spaces with underscores
+    Replaces invalid filename characters and whitespace with underscores
     to create a valid filename for any filesystem.
     
     Args:
@@ -159,16 +172,9 @@ def sanitize_filename(filename: Optional[str]) -> str:
     if not filename:
         return ""
     
-    # Replace invalid characters with underscores
-    sanitized = re.sub(r'[\\/*?:"<>|]', '_', filename)
-    
-    # Replace multiple spaces with a single space
-    sanitized = re.sub(r'\s+', ' ', sanitized)
-    
-    # Replace spaces with underscores
-    sanitized = sanitized.replace(' ', '_')
-    
-    return sanitized
+    # Map invalid characters and whitespace to underscores in one pass, then
+    # collapse runs of underscores and trim them from the ends
+    return '_'.join(part for part in filename.translate(_SANITIZE_TABLE).split('_') if part)
 
 def format_json_for_display(data: Any) -> str:
     """
@@ -187,12 +193,12 @@ def format_json_for_display(data: Any) -> str:
         # If data is a string, try to parse it as JSON
         if isinstance(data, str):
             try:
-                data = json.loads(data)
+                data = json_loads(data)
             except json.JSONDecodeError:
                 return data
         
         # Format the JSON with indentation
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return json_dumps(data)
     except Exception:
         # If anything goes wrong, return the original data as a string
         return str(data)
@@ -201,12 +207,12 @@ def truncate_text(text: Optional[str], max_length: int, ellipsis: str = "...") -
     """
     Truncate text to a maximum length, adding ellipsis if needed.
     
-    Ensures text doesn't exceed a specified maximum length by cutting it off
-    and adding an ellipsis if necessary.
+    Cuts text that exceeds the maximum length at that many characters, drops
+    any whitespace left dangling at the cut, and appends the ellipsis.
     
     Args:
         text: Input text to truncate
-        max_length: Maximum allowed length of the result including ellipsis
+        max_length: Maximum number of characters kept from the text (ellipsis not included)
         ellipsis: String to append to truncated text (default: "...")
         
     Returns:
@@ -215,17 +221,18 @@ def truncate_text(text: Optional[str], max_length: int, ellipsis: str = "...") -
     if not text:
         return ""
     
+    # Short text is returned as-is without copying
     if len(text) <= max_length:
         return text
     
-    return text[:max_length - len(ellipsis)] + ellipsis
+    return text[:max_length].rstrip() + ellipsis
 
 def calculate_percentages(data: Optional[Dict[str, Union[int, float]]]) -> Dict[str, float]:
     """
     Calculate percentages for a dictionary of values.
     
     Converts a dictionary of numeric values into a dictionary of percentage values
-    based on the sum of all values. Handles negative values by filtering them out.
+    based on the sum of all values. Negative values are treated as zero.
     
     Args:
         data: Dictionary of values to convert to percentages
@@ -236,17 +243,18 @@ def calculate_percentages(data: Optional[Dict[str, Union[int, float]]]) -> Dict[
     if not data:
         return {}
     
-    # Filter out negative values and convert to float
-    filtered_data = {k: float(v) for k, v in data.items() if v is not None and float(v) >= 0}
+    # Clamp negative values to zero and convert to float
+    values = {k: max(float(v), 0.0) for k, v in data.items() if v is not None}
     
     # Calculate total
-    total = sum(filtered_data.values())
+    total = sum(values.values())
     
-    # Calculate percentages
+    # Calculate percentages with a single scale factor
     if total == 0:
-        return {k: 0 for k in filtered_data}
+        return dict.fromkeys(values, 0)
     
-    return {k: round(v / total * 100, 2) for k, v in filtered_data.items()}
+    scale = 100.0 / total
+    return {k: round(v * scale, 2) for k, v in values.items()}
 
 def calculate_size_reduction(original_size: Optional[Union[int, float]], 
                             new_size: Optional[Union[int, float]]) -> float:
@@ -300,10 +308,13 @@ def format_currency(amount: Optional[Union[int, float]], currency_symbol: str =
             amount = 0
         
         amount = float(amount)
+        sign = "-" if amount < 0 else ""
+        amount = abs(amount)
         
-        if amount < 0:
-            return f"-{currency_symbol}{abs(amount):,.2f}"
+        # Whole amounts skip float formatting and just get a fixed cents suffix
+        if amount.is_integer():
+            return f"{sign}{currency_symbol}{int(amount):,}.00"
         
-        return f"{currency_symbol}{amount:,.2f}"
+        return f"{sign}{currency_symbol}{amount:,.2f}"
     except (ValueError, TypeError):
         return f"{currency_symbol}0.00" 
\ No newline at end of file
@@ -75,24 +75,70 @@ REGEX_PATTERNS = {
     "mitre_technique": r"\b[Tt](?:actic )?(\d{4})(?:\.(\d{3}))?\b"
 }
 
-# Common false positives to filter out (especially for domains and IPs)
+# Compiled once at import; extraction is case-insensitive for every type
+COMPILED_PATTERNS = {
+    indicator_type: re.compile(pattern, re.IGNORECASE)
+    for indicator_type, pattern in REGEX_PATTERNS.items()
+}
+
+# The three hash types are runs of hex digits that differ only in length, so one
+# scan finds all of them and the run length decides the type
+_HASH_PATTERN = re.compile(r"\b[a-fA-F0-9]{32}(?:[a-fA-F0-9]{8}(?:[a-fA-F0-9]{24})?)?\b")
+_HASH_TYPES_BY_LENGTH = {32: "md5", 40: "sha1", 64: "sha256"}
+
+# Literal text every match of a type must contain (checked against lowercased content);
+# when it is absent from the article the pattern's scan is skipped entirely
+_REQUIRED_LITERALS = {
+    "email": "@",
+    "url": "http",
+    "cve": "cve-",
+    "ipv6": ":",
+}
+
+# UI grouping used by format_indicators_for_display: (category, ((type, label), ...))
+_DISPLAY_CATEGORIES = (
+    ("Network Indicators", (
+        ("ipv4", "IPv4 Addresses"),
+        ("ipv6", "IPv6 Addresses"),
+        ("domain", "Domains"),
+        ("url", "URLs"),
+    )),
+    ("File Indicators", (
+        ("md5", "MD5 Hashes"),
+        ("sha1", "SHA1 Hashes"),
+        ("sha256", "SHA256 Hashes"),
+    )),
+    ("Other Indicators", (
+        ("email", "Email Addresses"),
+        ("cve", "CVE IDs"),
+        ("mitre_technique", "MITRE ATT&CK Techniques"),
+    )),
+)
+
+# Format checks used by validate_and_clean_indicators
+_CVE_FORMAT = re.compile(r'^CVE-\d{4}-\d{4,}$', re.IGNORECASE)
+_MITRE_FORMAT = re.compile(r'^T\d{4}(?:\.\d{3})?$')
+_VERSION_LIKE = re.compile(r'^[0-9\.]+$')
+
+# Common false positives to filter out (especially for domains and IPs); lowercase
+# frozensets so each candidate match is a single hash lookup
 FALSE_POSITIVES = {
-    "ipv4": [
+    "ipv4": frozenset({
         "0.0.0.0", "127.0.0.1", "255.255.255.255",
         # Version numbers and other common patterns that match IPv4 format
         "1.0.0.1", "1.1.1.1", "8.8.8.8", "8.8.4.4"
-    ],
-    "domain": [
+    }),
+    "domain": frozenset({
         # Common examples used in documentation
         "example.com", "domain.com", "test.com", "company.com",
         # Common placeholder domains
         "yourcompany.com", "attacker.com", "victim.com"
-    ],
-    "url": [
+    }),
+    "url": frozenset({
         # Generic URLs
         "http://example.com", "https://example.com", 
         "http://www.example.com", "https://www.example.com"
-    ]
+    })
 }
 
 def extract_indicators(content: str, url: str = None) -> Dict[str, List[str]]:
@@ -137,10 +183,24 @@ def extract_indicators(content: str, url: str = None) -> Dict[str, List[str]]:
         except Exception as e:
             warning(f"Could not parse article URL: {url}, error: {e}")
     
-    # Extract indicators using regular expressions
-    for indicator_type, pattern in REGEX_PATTERNS.items():
-        matches = re.findall(pattern, content, re.IGNORECASE)
-        debug(f"Found {len(matches)} potential {indicator_type} matches")
+    # Scan for all three hash types in a single pass
+    hash_matches = {hash_type: [] for hash_type in _HASH_TYPES_BY_LENGTH.values()}
+    for hex_value in _HASH_PATTERN.findall(content):
+        hash_matches[_HASH_TYPES_BY_LENGTH[len(hex_value)]].append(hex_value)
+    
+    lowered_content = content.lower()
+    
+    # Extract indicators using the precompiled regular expressions
+    for indicator_type, pattern in COMPILED_PATTERNS.items():
+        if indicator_type in hash_matches:
+            found = hash_matches[indicator_type]
+        elif _REQUIRED_LITERALS.get(indicator_type, "") not in lowered_content:
+            found = []
+        else:
+            found = pattern.findall(content)
+        debug(f"Found {len(found)} potential {indicator_type} matches")
+        # Deduplicate up front so each distinct match is validated only once
+        matches = set(found)
         
         # Process MITRE ATT&CK techniques differently since they have groups
         if indicator_type == "mitre_technique":
@@ -160,7 +220,7 @@ def extract_indicators(content: str, url: str = None) -> Dict[str, List[str]]:
         # Process other indicator types
         for match in matches:
             # Skip false positives and article self-references
-            if indicator_type in FALSE_POSITIVES and match.lower() in [fp.lower() for fp in FALSE_POSITIVES[indicator_type]]:
+            if match.lower() in FALSE_POSITIVES.get(indicator_type, ()):
                 continue
                 
             # Additional validation for specific types
@@ -207,13 +267,36 @@ def extract_indicators(content: str, url: str = None) -> Dict[str, List[str]]:
     info(f"Extraction complete. Found indicators: {sum(len(indicators) for indicators in results.values())}")
     return results
 
+def _clean_cve(value: str) -> Optional[str]:
+    """Ensure proper CVE format and standardize to uppercase."""
+    return value.upper() if _CVE_FORMAT.match(value) else None
+
+def _clean_mitre_technique(value: str) -> Optional[str]:
+    """Ensure proper MITRE technique format."""
+    return value if _MITRE_FORMAT.match(value) else None
+
+def _clean_hash(value: str) -> Optional[str]:
+    """Filter out values that look like version numbers and lowercase the rest."""
+    return None if _VERSION_LIKE.match(value) else value.lower()
+
+# Per-type validation; each cleaner returns the normalized value or None to drop it.
+# Types without an entry pass through unchanged.
+_INDICATOR_CLEANERS = {
+    "cve": _clean_cve,
+    "mitre_technique": _clean_mitre_technique,
+    "md5": _clean_hash,
+    "sha1": _clean_hash,
+    "sha256": _clean_hash,
+}
+
 def validate_and_clean_indicators(indicators: Dict[str, List[str]]) -> Dict[str, List[str]]:
     """
     Apply additional validation and cleaning to extracted indicators.
     
     This function performs further validation and standardization of extracted indicators
     to ensure they meet format requirements and filter out additional false positives
-    that weren't caught in the initial extraction.
+    that weren't caught in the initial extraction. Duplicate values are removed,
+    keeping the first occurrence.
     
     Args:
         indicators: Dictionary of extracted indicators by type
@@ -224,26 +307,11 @@ def validate_and_clean_indicators(indicators: Dict[str, List[str]]) -> Dict[str,
     clean_indicators = {}
     
     for indicator_type, values in indicators.items():
-        clean_values = []
-        
-        for value in values:
-            # Additional validation based on indicator type
-            if indicator_type == "cve":
-                # Ensure proper CVE format
-                if re.match(r'^CVE-\d{4}-\d{4,}$', value, re.IGNORECASE):
-                    clean_values.append(value.upper())  # Standardize format
-            elif indicator_type == "mitre_technique":
-                # Ensure proper MITRE technique format
-                if re.match(r'^T\d{4}(?:\.\d{3})?$', value):
-                    clean_values.append(value)
-            elif indicator_type in ["md5", "sha1", "sha256"]:
-                # Filter out values that look like version numbers
-                if not re.match(r'^[0-9\.]+$', value):
-                    clean_values.append(value.lower())
-            else:
-                clean_values.append(value)
-        
-        clean_indicators[indicator_type] = clean_values
+        cleaner = _INDICATOR_CLEANERS.get(indicator_type)
+        if cleaner is not None:
+            values = (cleaned for cleaned in map(cleaner, values) if cleaned is not None)
+        # dict.fromkeys drops duplicates (after normalization) while keeping first-seen order
+        clean_indicators[indicator_type] = list(dict.fromkeys(values))
     
     return clean_indicators
 
@@ -264,32 +332,15 @@ def format_indicators_for_display(indicators: Dict[str, List[str]]) -> Dict[str,
     formatted = {
         "categories": [
             {
-                "name": "Network Indicators",
-                "types": [
-                    {"type": "IPv4 Addresses", "indicator_values": indicators["ipv4"], "count": len(indicators["ipv4"])},
-                    {"type": "IPv6 Addresses", "indicator_values": indicators["ipv6"], "count": len(indicators["ipv6"])},
-                    {"type": "Domains", "indicator_values": indicators["domain"], "count": len(indicators["domain"])},
-                    {"type": "URLs", "indicator_values": indicators["url"], "count": len(indicators["url"])}
-                ]
-            },
-            {
-                "name": "File Indicators",
-                "types": [
-                    {"type": "MD5 Hashes", "indicator_values": indicators["md5"], "count": len(indicators["md5"])},
-                    {"type": "SHA1 Hashes", "indicator_values": indicators["sha1"], "count": len(indicators["sha1"])},
-                    {"type": "SHA256 Hashes", "indicator_values": indicators["sha256"], "count": len(indicators["sha256"])}
-                ]
-            },
-            {
-                "name": "Other Indicators",
+                "name": category_name,
                 "types": [
-                    {"type": "Email Addresses", "indicator_values": indicators["email"], "count": len(indicators["email"])},
-                    {"type": "CVE IDs", "indicator_values": indicators["cve"], "count": len(indicators["cve"])},
-                    {"type": "MITRE ATT&CK Techniques", "indicator_values": indicators["mitre_technique"], "count": len(indicators["mitre_technique"])}
+                    {"type": label, "indicator_values": indicators[indicator_type], "count": len(indicators[indicator_type])}
+                    for indicator_type, label in type_labels
                 ]
             }
+            for category_name, type_labels in _DISPLAY_CATEGORIES
         ],
-        "total_count": sum(len(indicators[itype]) for itype in indicators)
+        "total_count": sum(len(values) for values in indicators.values())
     }
     
     return formatted 
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+JSON Utilities Module
+=====================
+
+Shared JSON encoding and decoding for the application. orjson is used when it
+is installed and the standard library json module otherwise, so every caller
+gets the same output either way:
+
+- Decoding falls back to json for input orjson rejects but json accepts
+  (e.g. NaN and Infinity literals written by json.dumps).
+- Encoding always produces 2-space indented, non-ASCII-escaped UTF-8 text.
+  Values orjson cannot encode (integers wider than 64 bits, datetimes) go
+  through json, which handles or rejects them exactly as before.
+- NaN and Infinity floats are the one remaining difference: orjson writes them
+  as null, while json writes the bare (non-standard) literals.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes pass through to the stdlib fallback so they raise TypeError as json does
+_ORJSON_DUMP_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson is not None else 0
+)
+
+def json_loads(data: Any) -> Any:
+    """
+    Parse JSON text or bytes.
+    
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON
+        TypeError: If the input is not a str, bytes or bytearray
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json; let json make the final call
+            pass
+    return json.loads(data)
+
+def json_dumps(obj: Any) -> str:
+    """Serialize to 2-space indented JSON text."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_DUMP_OPTIONS).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize to 2-space indented JSON encoded as UTF-8."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_DUMP_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
@@ -20,7 +20,10 @@ import sys
 import logging
 import json
 import time
-from logging.handlers import RotatingFileHandler
+import queue
+import atexit
+from functools import lru_cache
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from typing import Optional, Any, Dict, Union, Callable
 import traceback
@@ -200,6 +203,15 @@ def get_startup_timings() -> Dict[str, float]:
     """
     return _startup_phases
 
+# Level names accepted by structured_log
+_LEVELS_BY_NAME = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL,
+}
+
 def structured_log(level: str, message: str, **kwargs) -> None:
     """
     Create structured log entry with additional context.
@@ -213,6 +225,10 @@ def structured_log(level: str, message: str, **kwargs) -> None:
         message: Main log message
         **kwargs: Additional context data to include in the structured log
     """
+    levelno = _LEVELS_BY_NAME.get(level)
+    if levelno is None or not logger.isEnabledFor(levelno):
+        return
+    
     # Add timestamp
     context = {
         'timestamp': datetime.utcnow().isoformat(),
@@ -224,16 +240,7 @@ def structured_log(level: str, message: str, **kwargs) -> None:
         context.update(kwargs)
     
     # Create structured message
-    if level == 'debug':
-        logger.debug(json.dumps(context))
-    elif level == 'info':
-        logger.info(json.dumps(context))
-    elif level == 'warning':
-        logger.warning(json.dumps(context))
-    elif level == 'error':
-        logger.error(json.dumps(context))
-    elif level == 'critical':
-        logger.critical(json.dumps(context))
+    logger.log(levelno, json.dumps(context))
 
 def print_status(message: str, is_error: bool = False) -> None:
     """
@@ -247,6 +254,9 @@ def print_status(message: str, is_error: bool = False) -> None:
         message: The message to log
         is_error: Whether this is an error message (determines log level)
     """
+    level = logging.ERROR if is_error else logging.INFO
+    if not logger.isEnabledFor(level):
+        return
     if is_error:
         logger.error(message)
     else:
@@ -264,6 +274,9 @@ def debug(message: str, **kwargs) -> None:
         message: The debug message to log
         **kwargs: Optional context data for structured logging
     """
+    # Disabled levels return before any structured context is serialized
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     if kwargs:
         structured_log('debug', message, **kwargs)
     else:
@@ -280,6 +293,8 @@ def info(message: str, **kwargs) -> None:
         message: The info message to log
         **kwargs: Optional context data for structured logging
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
     if kwargs:
         structured_log('info', message, **kwargs)
     else:
@@ -296,6 +311,8 @@ def warning(message: str, **kwargs) -> None:
         message: The warning message to log
         **kwargs: Optional context data for structured logging
     """
+    if not logger.isEnabledFor(logging.WARNING):
+        return
     if kwargs:
         structured_log('warning', message, **kwargs)
     else:
@@ -312,6 +329,8 @@ def error(message: str, **kwargs) -> None:
         message: The error message to log
         **kwargs: Optional context data for structured logging
     """
+    if not logger.isEnabledFor(logging.ERROR):
+        return
     if kwargs:
         structured_log('error', message, **kwargs)
     else:
@@ -328,6 +347,8 @@ def critical(message: str, **kwargs) -> None:
         message: The critical message to log
         **kwargs: Optional context data for structured logging
     """
+    if not logger.isEnabledFor(logging.CRITICAL):
+        return
     if kwargs:
         structured_log('critical', message, **kwargs)
     else:
@@ -401,6 +422,27 @@ def register_shutdown_handler(app, callback: Callable) -> None:
     # Mark as registered to avoid duplicates
     _shutdown_handler_registered = True
 
+# Background listeners started by setup_logging
+_queue_listeners = []
+
+def stop_queue_listeners() -> None:
+    """
+    Stop the background listeners started by setup_logging.
+    
+    Each listener writes out any records still queued before its thread exits,
+    then its buffered handlers are flushed. Registered with atexit so pending
+    records are not lost on shutdown.
+    """
+    while _queue_listeners:
+        listener = _queue_listeners.pop()
+        # Python < 3.12 raises when stopping a listener that was already stopped
+        if listener._thread is not None:
+            listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+
+atexit.register(stop_queue_listeners)
+
 # Functions needed for tests
 def setup_logging(
     logger_name: str, 
@@ -414,7 +456,9 @@ def setup_logging(
     
     This utility function creates and configures a logger with both file and
     console output. It's primarily used for unit tests and isolated components
-    that need their own logging configuration.
+    that need their own logging configuration. The logger itself only gets a
+    QueueHandler; a background QueueListener owns the file and console handlers,
+    and file writes are batched through a MemoryHandler (LOG_BUFFER records).
     
     Args:
         logger_name: Name of the logger to create
@@ -455,23 +499,43 @@ def setup_logging(
         backupCount=backup_count
     )
     file_handler.setFormatter(custom_formatter)
-    custom_logger.addHandler(file_handler)
+    
+    # Buffer file writes into batches; ERROR and above flush immediately
+    buffered_handler = MemoryHandler(
+        capacity=int(os.environ.get('LOG_BUFFER', 512)),
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True
+    )
+    handlers = [buffered_handler]
     
     # Add console handler for development
     if os.environ.get('FLASK_ENV') == 'development':
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(custom_formatter)
-        custom_logger.addHandler(console_handler)
+        handlers.append(console_handler)
+    
+    # Handlers run on a listener thread; logging calls only enqueue the record
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _queue_listeners.append(listener)
+    
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.listener = listener
+    custom_logger.addHandler(queue_handler)
     
     return custom_logger
 
+@lru_cache(maxsize=256)
 def get_logger(module_name: str) -> logging.Logger:
     """
     Get a logger for a module.
     
     This is a convenience function that returns a logger with a standardized
     name format for a specific module. It ensures consistent logger naming
-    across the application.
+    across the application. Results are cached per module name, skipping the
+    logging manager's locked lookup on repeat calls.
     
     Args:
         module_name: Name of the module requesting a logger
@@ -482,6 +546,9 @@ def get_logger(module_name: str) -> logging.Logger:
     logger_name = f"app.{module_name}"
     return logging.getLogger(logger_name)
 
+# Request logger resolved once instead of per request
+_REQ_LOGGER = get_logger('requests')
+
 def log_request(req: Request) -> None:
     """
     Log an incoming HTTP request.
@@ -493,11 +560,13 @@ def log_request(req: Request) -> None:
     Args:
         req: Flask request object to log
     """
-    req_logger = get_logger('requests')
-    req_logger.info(
-        f"Request: {req.method} {req.path} - "
-        f"IP: {req.remote_addr} - "
-        f"User-Agent: {req.user_agent.string}"
+    # Skip reading request attributes entirely when INFO is disabled
+    if not _REQ_LOGGER.isEnabledFor(logging.INFO):
+        return
+    # Lazy %-formatting: the line is only rendered if a handler emits it
+    _REQ_LOGGER.info(
+        "Request: %s %s - IP: %s - User-Agent: %s",
+        req.method, req.path, req.remote_addr, req.user_agent.string
     )
 
 def log_exception(exception: Exception, module: str) -> None:
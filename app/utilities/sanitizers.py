@@ -22,20 +22,16 @@ def sanitize_input(value, allow_html=False):
     # Store original value for comparison
     original_value = value
         
-    # Decode URL encoding
-    value = urllib.parse.unquote(value)
+    # Decode URL encoding; unquote also decodes multi-byte UTF-8 escapes
+    if '%' in value:
+        value = urllib.parse.unquote(value)
     
-    # Check for NULL bytes before removing them
-    has_null_bytes = '\0' in value
-    if has_null_bytes:
-        logging.warning(f"NULL byte detected in input: {repr(value)}")
-    
-    # Remove NULL bytes
-    value = value.replace('\0', '')
-    
-    # Log if value changed due to sanitization (other than NULL byte removal)
-    if value != original_value and not has_null_bytes:
-        logging.info(f"Input sanitized: {repr(original_value)} -> {repr(value)}")
+    # Remove NULL bytes, or log if value changed due to URL decoding
+    if '\0' in value:
+        logging.warning("NULL byte detected in input: %r", value)
+        value = value.replace('\0', '')
+    elif value is not original_value and value != original_value:
+        logging.info("Input sanitized: %r -> %r", original_value, value)
     
     # Escape HTML unless explicitly allowed
     if not allow_html:
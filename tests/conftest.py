@@ -1,51 +1,100 @@
 import os
 import sys
 import pytest
-import tempfile
-import shutil
 import sqlite3
-from flask import Flask, template_rendered
+import threading
+from functools import lru_cache
+from flask import Blueprint, Flask, template_rendered
+from jinja2 import FileSystemBytecodeCache
 from contextlib import contextmanager
+from werkzeug.exceptions import BadRequest, Forbidden, HTTPException, TooManyRequests
 
 # Add the project root directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app
-from app.models.database import init_db, get_db_connection
+from app.models.database import init_db, get_db_connection, execute_query
+from app.utilities.indicator_extractor import extract_indicators
 
-@pytest.fixture
+# Shared-cache in-memory database; lives as long as one connection stays open
+TEST_DB_URI = 'file:test_article_analysis?mode=memory&cache=shared'
+
+# Tables emptied between tests (db_version is kept so the schema stays valid)
+_DATA_TABLES = ('indicators', 'token_usage', 'analysis_results', 'articles')
+
+def _raiser(make_exc):
+    """Build a view function that raises a freshly built exception."""
+    def view():
+        raise make_exc()
+    return view
+
+class _CustomHTTPError(HTTPException):
+    """HTTP 400 with a custom name/description for the error context test."""
+    code = 400
+    name = "Custom Error"
+    description = "This is a custom error description"
+
+# Routes used by the error handler tests
+_ERROR_TRIGGER_ROUTES = {
+    '/test-400': lambda: BadRequest("Bad request"),
+    '/test-403': lambda: Forbidden("Forbidden"),
+    '/test-429': lambda: TooManyRequests("Too many requests"),
+    '/test-500': lambda: Exception("Test exception"),
+    '/test-500-htmx': lambda: Exception("Test exception"),
+    '/test-custom-error': _CustomHTTPError,
+}
+
+# Registered on the session app before it serves its first request
+_error_trigger_bp = Blueprint('error_triggers', __name__)
+for _path, _make_exc in _ERROR_TRIGGER_ROUTES.items():
+    _error_trigger_bp.add_url_rule(_path, endpoint=_path.lstrip('/').replace('-', '_'),
+                                   view_func=_raiser(_make_exc))
+
+@pytest.fixture(scope="session")
 def app():
-    """Create and configure a Flask app for testing."""
-    # Create a temporary directory for test files
-    temp_dir = tempfile.mkdtemp()
-    
-    # Create a temporary data directory for the test database
-    os.makedirs(os.path.join(temp_dir, 'data'), exist_ok=True)
-    
+    """Create and configure a Flask app for testing (once per session)."""
     # Set up environment variables for testing
     os.environ['FLASK_ENV'] = 'testing'
     os.environ['SECRET_KEY'] = 'test-key'
     
-    # Create the test application
-    test_app = create_app()
-    
-    # Override configuration for testing
-    test_app.config.update({
+    # Create the test application; the overrides apply before any database access
+    test_app = create_app({
         'TESTING': True,
         'SERVER_NAME': 'localhost.localdomain',
-        'DB_PATH': os.path.join(temp_dir, 'data', 'test_article_analysis.db'),
+        'DB_PATH': TEST_DB_URI,
         'SECRET_KEY': 'test-key',
     })
     
+    # Add the error handler test routes while the app can still take new routes
+    test_app.register_blueprint(_error_trigger_bp)
+    
+    # Load compiled templates from disk instead of recompiling them every run.
+    # With no directory Jinja uses a per-user cache dir it creates with 0700
+    # permissions and refuses to use if another user owns it.
+    test_app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+    
+    # Keep one connection open so the in-memory database survives the session
+    keeper = sqlite3.connect(TEST_DB_URI, uri=True)
+    
     # Establish application context
     with test_app.app_context():
-        # Initialize the test database
-        init_db()
+        # Initialize the test database schema once
+        init_db(force_initialization=True)
         
         yield test_app
     
-    # Clean up the temporary directory
-    shutil.rmtree(temp_dir)
+    keeper.close()
+
+@pytest.fixture(autouse=True)
+def _clean_db(request):
+    """Empty the test database after each test that uses the app."""
+    yield
+    if 'app' not in request.fixturenames:
+        return
+    app = request.getfixturevalue('app')
+    with app.app_context():
+        for table in _DATA_TABLES:
+            execute_query(f"DELETE FROM {table}")
 
 @pytest.fixture
 def client(app):
@@ -64,19 +113,46 @@ def db(app):
         with get_db_connection() as (conn, cursor):
             yield conn, cursor
 
+# Thread-local sink for the module-level template_rendered subscriber
+_tls = threading.local()
+
+def _record_template(sender, template, context, **extra):
+    """Append rendered templates to the active capture list, if any."""
+    recorded = getattr(_tls, 'templates', None)
+    if recorded is not None:
+        recorded.append((template, context))
+
+# Connected once for the session instead of per test
+template_rendered.connect(_record_template)
+
 @contextmanager
 def captured_templates(app):
-    """Capture templates that were rendered during the request."""
-    recorded = []
+    """Capture templates that were rendered during the request.
     
-    def record(sender, template, context, **extra):
-        recorded.append((template, context))
-    
-    template_rendered.connect(record, app)
+    Uses the session-wide subscriber rather than connecting a receiver per
+    use; the test session only ever has the one app.
+    """
+    previous = getattr(_tls, 'templates', None)
+    _tls.templates = recorded = []
     try:
         yield recorded
     finally:
-        template_rendered.disconnect(record, app)
+        _tls.templates = previous
+
+@pytest.fixture
+def rendered_templates():
+    """List of (template, context) pairs rendered during the test."""
+    _tls.templates = []
+    yield _tls.templates
+    _tls.templates = None
+
+@pytest.fixture(scope="session")
+def cached_extract():
+    """extract_indicators memoized on (content, url), shared by every test in the session.
+    
+    Results are shared objects, so tests must not mutate them.
+    """
+    return lru_cache(maxsize=128)(extract_indicators)
 
 @pytest.fixture
 def mock_requests_get(monkeypatch):
@@ -111,6 +187,7 @@ def mock_requests_get(monkeypatch):
         )
     
     monkeypatch.setattr("requests.get", _mock_get)
+    monkeypatch.setattr("app.utilities.article_extractor._SESSION.get", _mock_get)
 
 @pytest.fixture
 def mock_openai_completion(monkeypatch):
@@ -296,11 +296,11 @@ def test_analyze_form_endpoint(client):
 
 def test_full_analysis_workflow(client, mock_requests_get, mock_openai_completion):
     """Test the full analysis workflow from start to finish."""
-    with patch('app.blueprints.analysis.store_analysis') as mock_store, \
+    with patch('app.blueprints.analysis.store_analysis_returning_id') as mock_store, \
          patch('app.blueprints.analysis.store_indicators') as mock_store_indicators:
         
-        # Mock successful storage
-        mock_store.return_value = True
+        # Mock successful storage (returns the new article ID)
+        mock_store.return_value = 999
         mock_store_indicators.return_value = True
         
         # Step 1: Start the analysis
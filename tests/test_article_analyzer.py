@@ -3,8 +3,10 @@ import json
 import time
 from unittest.mock import patch, Mock, MagicMock
 import os
+from types import SimpleNamespace
 
 from app.utilities.article_analyzer import (
+    MAX_PROMPT_CHARS,
     analyze_article,
     parse_analysis_response,
     parse_mitre_technique
@@ -164,6 +166,28 @@ def test_analyze_article_content_truncation():
         assert "structured" in result
         assert result["structured"]["summary"] == "Summary of truncated content"
 
+def test_analyze_article_truncates_prompt():
+    """Test that oversized articles are cut on a word boundary before being sent."""
+    long_content = "This is a test sentence. " * 5000
+    api_response = SimpleNamespace(
+        model="gpt-4o-2024-08-06",
+        usage=SimpleNamespace(prompt_tokens=100, completion_tokens=100),
+        choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"summary": "Summary"})))]
+    )
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = api_response
+    
+    with patch('app.utilities.article_analyzer.client', mock_client):
+        analyze_article(long_content, "https://example.com/long-article", model="gpt-4o-2024-08-06")
+    
+    prompt = mock_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+    article = prompt.split("\n\n", 1)[1]
+    body, marker = article[:-len(' ...[truncated]')], article[-len(' ...[truncated]'):]
+    assert marker == ' ...[truncated]'
+    assert len(body) <= MAX_PROMPT_CHARS
+    # The cut falls between words
+    assert long_content.startswith(body) and long_content[len(body)] == ' '
+
 def test_analyze_article_with_temperature(mock_openai_completion):
     """Test article analysis with custom temperature setting."""
     content = "This is a test article about cybersecurity threats."
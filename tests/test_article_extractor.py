@@ -1,9 +1,13 @@
+import io
+import http.client
 import pytest
 from unittest.mock import patch, Mock
 import requests
+from requests.cookies import MockRequest, MockResponse
 from bs4 import BeautifulSoup
 
 from app.utilities.article_extractor import (
+    _SESSION,
     extract_article_content, 
     get_domain_specific_headers, 
     extract_by_containers, 
@@ -43,6 +47,16 @@ def test_extract_article_content_success(mock_requests_get):
     assert "CVE-2023-1234" in content
     assert "192.168.1.100" in content
 
+def test_session_does_not_keep_cookies():
+    """Test that the shared session drops cookies set by an article site."""
+    jar = _SESSION.cookies.copy()  # keeps the session's cookie policy
+    request = requests.Request('GET', 'https://example.com/article').prepare()
+    headers = http.client.parse_headers(io.BytesIO(b"Set-Cookie: session=abc; Path=/\r\n\r\n"))
+    
+    jar.extract_cookies(MockResponse(headers), MockRequest(request))
+    
+    assert len(jar) == 0
+
 def test_extract_article_content_http_error():
     """Test article extraction with HTTP error."""
     class MockErrorResponse:
@@ -52,25 +66,25 @@ def test_extract_article_content_http_error():
         def raise_for_status(self):
             raise requests.exceptions.HTTPError(f"HTTP Status: {self.status_code}")
     
-    with patch('requests.get', return_value=MockErrorResponse()):
+    with patch('app.utilities.article_extractor._SESSION.get', return_value=MockErrorResponse()):
         content = extract_article_content("https://example.com/not-found", verbose=False)
         assert content is None
 
 def test_extract_article_content_timeout():
     """Test article extraction with timeout error."""
-    with patch('requests.get', side_effect=requests.exceptions.Timeout("Request timed out")):
+    with patch('app.utilities.article_extractor._SESSION.get', side_effect=requests.exceptions.Timeout("Request timed out")):
         content = extract_article_content("https://example.com/timeout", verbose=False)
         assert content is None
 
 def test_extract_article_content_connection_error():
     """Test article extraction with connection error."""
-    with patch('requests.get', side_effect=requests.exceptions.ConnectionError("Connection error")):
+    with patch('app.utilities.article_extractor._SESSION.get', side_effect=requests.exceptions.ConnectionError("Connection error")):
         content = extract_article_content("https://example.com/connection-error", verbose=False)
         assert content is None
 
 def test_extract_article_content_general_exception():
     """Test article extraction with general exception."""
-    with patch('requests.get', side_effect=Exception("General error")):
+    with patch('app.utilities.article_extractor._SESSION.get', side_effect=Exception("General error")):
         content = extract_article_content("https://example.com/error", verbose=False)
         assert content is None
 
@@ -261,7 +275,7 @@ def test_multiple_extraction_methods(mock_requests_get):
     </html>
     """
     
-    with patch('requests.get') as mock_get:
+    with patch('app.utilities.article_extractor._SESSION.get') as mock_get:
         mock_response = Mock()
         mock_response.text = mock_html
         mock_response.status_code = 200
@@ -290,7 +304,7 @@ def test_extraction_all_methods_fail():
     </html>
     """
     
-    with patch('requests.get') as mock_get:
+    with patch('app.utilities.article_extractor._SESSION.get') as mock_get:
         mock_response = Mock()
         mock_response.text = mock_html
         mock_response.status_code = 200
@@ -309,7 +323,7 @@ def test_extract_article_verbose_mode():
     # Use a basic mock to test the verbose path without actually printing
     mock_html = "<html><body><article>Test verbose content</article></body></html>"
     
-    with patch('requests.get') as mock_get, \
+    with patch('app.utilities.article_extractor._SESSION.get') as mock_get, \
          patch('app.utilities.article_extractor.print_status') as mock_print:
         mock_response = Mock()
         mock_response.text = mock_html
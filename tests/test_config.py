@@ -4,7 +4,14 @@ import json
 import logging
 from unittest.mock import patch
 
-from app.config.config import Config
+from app.config.config import Config, _parse_models
+
+@pytest.fixture(autouse=True)
+def clear_config_caches():
+    """Reset memoized config parsing so environment patches take effect per test."""
+    _parse_models.cache_clear()
+    yield
+    _parse_models.cache_clear()
 
 def test_config_basic_properties():
     """Test basic configuration properties."""
@@ -14,28 +21,18 @@ def test_config_basic_properties():
     assert Config.LOG_MAX_SIZE == 10 * 1024 * 1024  # 10 MB
     assert Config.LOG_BACKUP_COUNT == 5
 
-def test_get_log_level():
+@pytest.mark.parametrize("level_name,expected", [
+    (None, logging.INFO),
+    ("DEBUG", logging.DEBUG),
+    ("WARNING", logging.WARNING),
+    ("ERROR", logging.ERROR),
+    ("CRITICAL", logging.CRITICAL),
+    ("INVALID_LEVEL", logging.INFO),  # Invalid levels default to INFO
+])
+def test_get_log_level(level_name, expected):
     """Test log level retrieval."""
-    # Test default log level (INFO)
-    with patch.dict(os.environ, {}, clear=True):
-        assert Config.get_log_level() == logging.INFO
-    
-    # Test setting log level via environment
-    with patch.dict(os.environ, {"LOG_LEVEL": "DEBUG"}):
-        assert Config.get_log_level() == logging.DEBUG
-    
-    with patch.dict(os.environ, {"LOG_LEVEL": "WARNING"}):
-        assert Config.get_log_level() == logging.WARNING
-    
-    with patch.dict(os.environ, {"LOG_LEVEL": "ERROR"}):
-        assert Config.get_log_level() == logging.ERROR
-    
-    with patch.dict(os.environ, {"LOG_LEVEL": "CRITICAL"}):
-        assert Config.get_log_level() == logging.CRITICAL
-    
-    # Test invalid log level (should default to INFO)
-    with patch.dict(os.environ, {"LOG_LEVEL": "INVALID_LEVEL"}):
-        assert Config.get_log_level() == logging.INFO
+    env = {} if level_name is None else {"LOG_LEVEL": level_name}
+    assert Config.get_log_level(env) == expected
 
 def test_get_available_models():
     """Test model configuration retrieval."""
@@ -118,19 +115,15 @@ def test_normalize_model_id():
     # Test unknown model (should return as-is)
     assert Config.normalize_model_id("custom-model") == "custom-model"
 
-def test_get_default_temperature():
+@pytest.mark.parametrize("value,expected", [
+    (None, 0.0),
+    ("0.7", 0.7),
+    ("invalid", 0.0),  # Invalid values use the default
+])
+def test_get_default_temperature(value, expected):
     """Test default temperature retrieval."""
-    # Test default when environment variable not set
-    with patch.dict(os.environ, {}, clear=True):
-        assert Config.get_default_temperature() == 0.1
-    
-    # Test with valid environment variable
-    with patch.dict(os.environ, {"OPENAI_TEMPERATURE": "0.7"}):
-        assert Config.get_default_temperature() == 0.7
-    
-    # Test with invalid environment variable (should use default)
-    with patch.dict(os.environ, {"OPENAI_TEMPERATURE": "invalid"}):
-        assert Config.get_default_temperature() == 0.1
+    env = {} if value is None else {"OPENAI_TEMPERATURE": value}
+    assert Config.get_default_temperature(env) == expected
 
 def test_get_default_seed():
     """Test default seed retrieval."""
@@ -143,7 +136,7 @@ def test_config_with_app_context(app):
         # Check that the test app has the overridden configuration
         assert app.config["TESTING"] is True
         assert app.config["SECRET_KEY"] == "test-key"
-        assert app.config["DB_PATH"].endswith("test_article_analysis.db")
+        assert "test_article_analysis" in app.config["DB_PATH"]
         
         # The actual Config class should be unchanged by app context
         assert Config.DB_PATH == os.path.join("data", "article_analysis.db") 
\ No newline at end of file
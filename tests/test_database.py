@@ -1,6 +1,5 @@
 import pytest
 import json
-import time
 from unittest.mock import patch
 from datetime import datetime
 
@@ -9,6 +8,8 @@ from app.models.database import (
     execute_query, 
     init_db, 
     store_analysis, 
+    store_analysis_returning_id, 
+    store_analyses_bulk, 
     update_analysis, 
     get_analysis_by_url, 
     get_recent_analyses, 
@@ -19,6 +20,7 @@ from app.models.database import (
     get_indicators_by_url,
     get_indicator_stats
 )
+from tests.conftest import TEST_DB_URI
 
 # Basic database connection and execution tests
 def test_get_db_connection(app):
@@ -34,6 +36,51 @@ def test_get_db_connection(app):
             assert result is not None
             assert result[0] == 1
 
+def _nesting_rows(cursor):
+    cursor.execute("SELECT name FROM nesting_test ORDER BY name")
+    return [row['name'] for row in cursor.fetchall()]
+
+def test_nested_db_connection(app):
+    """Test that nested connections can't commit or roll back the outer frame's work."""
+    with app.app_context():
+        execute_query("CREATE TABLE IF NOT EXISTS nesting_test (name TEXT)")
+        try:
+            with get_db_connection() as (conn, cursor):
+                cursor.execute("INSERT INTO nesting_test (name) VALUES ('outer')")
+                
+                # An inner failure only undoes the inner frame's work
+                with pytest.raises(ValueError):
+                    with get_db_connection() as (inner_conn, inner_cursor):
+                        inner_cursor.execute("INSERT INTO nesting_test (name) VALUES ('failed')")
+                        raise ValueError("inner failure")
+                assert _nesting_rows(cursor) == ['outer']
+                
+                # An inner commit joins the outer transaction instead of committing it
+                with get_db_connection() as (inner_conn, inner_cursor):
+                    inner_cursor.execute("INSERT INTO nesting_test (name) VALUES ('inner')")
+                    inner_conn.commit()
+                assert _nesting_rows(cursor) == ['inner', 'outer']
+                conn.rollback()
+                assert _nesting_rows(cursor) == []
+                
+                # With nothing pending in the outer frame, an inner commit is durable
+                with get_db_connection() as (inner_conn, inner_cursor):
+                    inner_cursor.execute("INSERT INTO nesting_test (name) VALUES ('committed')")
+                    inner_conn.commit()
+                assert not conn.in_transaction
+            
+            # A nested frame on another database leaves the outer connection open
+            with get_db_connection() as (conn, cursor):
+                app.config['DB_PATH'] = ':memory:'
+                try:
+                    with get_db_connection() as (other_conn, other_cursor):
+                        other_cursor.execute("SELECT 1")
+                finally:
+                    app.config['DB_PATH'] = TEST_DB_URI
+                assert _nesting_rows(cursor) == ['committed']
+        finally:
+            execute_query("DROP TABLE IF EXISTS nesting_test")
+
 def test_execute_query(app):
     """Test the execute_query utility function with different fetch types."""
     with app.app_context():
@@ -98,6 +145,26 @@ def test_store_analysis(app, sample_article_data):
         )
         assert result is False
 
+def test_store_analysis_with_json_string(app, sample_article_data):
+    """Test storing a structured analysis that is already serialized JSON."""
+    with app.app_context():
+        structured_json = json.dumps(sample_article_data['structured_analysis'])
+        result = store_analysis(
+            url=sample_article_data['url'],
+            title=sample_article_data['title'],
+            content_length=sample_article_data['content_length'],
+            extraction_time=sample_article_data['extraction_time'],
+            analysis_time=sample_article_data['analysis_time'],
+            model=sample_article_data['model'],
+            raw_analysis=sample_article_data['raw_analysis'],
+            structured_analysis=structured_json
+        )
+        assert result is True
+        
+        analysis = get_analysis_by_url(sample_article_data['url'])
+        assert analysis['structured_data'] == sample_article_data['structured_analysis']
+        assert analysis['summary'] == sample_article_data['structured_analysis']['summary']
+
 def test_update_analysis(app, sample_article_data):
     """Test updating an existing analysis in the database."""
     with app.app_context():
@@ -154,25 +221,16 @@ def test_update_analysis(app, sample_article_data):
 def test_get_recent_analyses(app, sample_article_data):
     """Test retrieving recent analyses from the database."""
     with app.app_context():
-        # Store multiple analyses
+        # Store multiple analyses in one batch with increasing timestamps
+        rows = []
         for i in range(5):
             modified_data = sample_article_data.copy()
             modified_data['url'] = f"https://example-security.com/article-{i}"
             modified_data['title'] = f"Article {i}"
-            
-            store_analysis(
-                url=modified_data['url'],
-                title=modified_data['title'],
-                content_length=modified_data['content_length'],
-                extraction_time=modified_data['extraction_time'],
-                analysis_time=modified_data['analysis_time'],
-                model=modified_data['model'],
-                raw_analysis=modified_data['raw_analysis'],
-                structured_analysis=modified_data['structured_analysis']
-            )
-            
-            # Add a small delay to ensure different timestamps
-            time.sleep(0.01)
+            modified_data['created_at'] = f"2024-01-01T00:00:{i:02d}"
+            rows.append(modified_data)
+        
+        assert store_analyses_bulk(rows) == 5
         
         # Test retrieving recent analyses with default limit
         recent = get_recent_analyses()
@@ -242,7 +300,7 @@ def test_store_indicators(app, sample_article_data):
     """Test storing and retrieving indicators of compromise."""
     with app.app_context():
         # First store an article to get an article_id
-        store_analysis(
+        article_id = store_analysis_returning_id(
             url=sample_article_data['url'],
             title=sample_article_data['title'],
             content_length=sample_article_data['content_length'],
@@ -253,10 +311,6 @@ def test_store_indicators(app, sample_article_data):
             structured_analysis=sample_article_data['structured_analysis']
         )
         
-        # Get the article ID
-        article = get_analysis_by_url(sample_article_data['url'])
-        article_id = article['id']
-        
         # Store indicators
         indicators = {
             "ipv4": ["192.168.1.1", "10.0.0.1"],
@@ -305,7 +359,7 @@ def test_get_indicator_stats(app, sample_article_data):
     """Test retrieving indicator statistics from the database."""
     with app.app_context():
         # First store an article to get an article_id
-        store_analysis(
+        article_id = store_analysis_returning_id(
             url=sample_article_data['url'],
             title=sample_article_data['title'],
             content_length=sample_article_data['content_length'],
@@ -316,10 +370,6 @@ def test_get_indicator_stats(app, sample_article_data):
             structured_analysis=sample_article_data['structured_analysis']
         )
         
-        # Get the article ID
-        article = get_analysis_by_url(sample_article_data['url'])
-        article_id = article['id']
-        
         # Store indicators
         indicators = {
             "ipv4": ["192.168.1.1", "10.0.0.1"],
@@ -335,7 +385,7 @@ def test_get_indicator_stats(app, sample_article_data):
         modified_data['url'] = "https://example-security.com/article-2"
         modified_data['title'] = "Article 2"
         
-        store_analysis(
+        article_id2 = store_analysis_returning_id(
             url=modified_data['url'],
             title=modified_data['title'],
             content_length=modified_data['content_length'],
@@ -346,9 +396,6 @@ def test_get_indicator_stats(app, sample_article_data):
             structured_analysis=modified_data['structured_analysis']
         )
         
-        article2 = get_analysis_by_url(modified_data['url'])
-        article_id2 = article2['id']
-        
         indicators2 = {
             "ipv4": ["192.168.1.1", "172.16.0.1"],
             "url": ["https://evil-site.com"],
@@ -1,8 +1,6 @@
 import pytest
 from unittest.mock import patch, MagicMock, mock_open
 import json
-import os
-import tempfile
 import csv
 from io import StringIO
 
@@ -11,6 +9,33 @@ from app.utilities.export import (
     export_analysis_as_markdown, get_export_filename
 )
 
+@pytest.fixture
+def analysis_data():
+    """Sample analysis data shared by the export tests."""
+    return {
+        "summary": "Test summary",
+        "source_evaluation": {
+            "reliability": "High",
+            "credibility": "Medium",
+            "source_type": "Blog"
+        },
+        "threat_actors": ["Actor1", "Actor2"],
+        "mitre_techniques": [
+            {"id": "T1234", "name": "Technique 1", "url": "https://attack.mitre.org/techniques/T1234"},
+            {"id": "T5678", "name": "Technique 2", "url": "https://attack.mitre.org/techniques/T5678"}
+        ],
+        "key_insights": ["Insight 1", "Insight 2"],
+        "source_bias": "Low bias",
+        "intelligence_gaps": ["Gap 1", "Gap 2"],
+        "critical_infrastructure_sectors": {
+            "Energy Sector": 4,
+            "Financial Services Sector": 2
+        }
+    }
+
+# File exporters that share the same temp-directory and error-handling behavior
+FILE_EXPORTERS = [export_analysis_as_json, export_analysis_as_csv, export_analysis_as_markdown]
+
 def test_get_export_filename():
     """Test the get_export_filename function."""
     # Test with a standard domain and format
@@ -34,236 +59,131 @@ def test_get_export_filename():
     assert "analysis" in filename
     assert filename.endswith(".md")
 
-def test_export_analysis_as_json():
+@pytest.mark.slow
+def test_export_analysis_as_json(analysis_data, tmp_path):
     """Test exporting analysis as JSON."""
-    # Sample analysis data
-    analysis_data = {
-        "summary": "Test summary",
-        "source_evaluation": {
-            "reliability": "High",
-            "credibility": "Medium"
-        },
-        "threat_actors": ["Actor1", "Actor2"],
-        "mitre_techniques": ["T1234", "T5678"]
-    }
-    
     # Test with file path provided
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        temp_path = temp_file.name
+    temp_path = str(tmp_path / "analysis.json")
     
-    try:
-        # Export to the temporary file
-        result = export_analysis_as_json(analysis_data, "example.com", temp_path)
-        
-        # Check result
-        assert result["success"] is True
-        assert result["file_path"] == temp_path
-        
-        # Verify file contents
-        with open(temp_path, 'r') as f:
-            exported_data = json.load(f)
-            assert exported_data == analysis_data
+    # Export to the temporary file
+    result = export_analysis_as_json(analysis_data, "example.com", temp_path)
     
-    finally:
-        # Clean up
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+    # Check result
+    assert result["success"] is True
+    assert result["file_path"] == temp_path
     
-    # Test without file path (should create in temp directory)
-    with patch('tempfile.gettempdir', return_value='/tmp'), \
-         patch('builtins.open', mock_open()) as mock_file:
-        
+    # Verify file contents
+    with open(temp_path, 'r') as f:
+        exported_data = json.load(f)
+        assert exported_data == analysis_data
+    
+    # Test the single binary write
+    with patch('builtins.open', mock_open()) as mock_file:
         result = export_analysis_as_json(analysis_data, "example.com")
-        
-        # Check result
         assert result["success"] is True
-        assert "/tmp" in result["file_path"]
-        assert "example.com" in result["file_path"]
         
-        # Verify file was written
+        # Verify file was opened in binary mode and written once
         mock_file.assert_called_once()
+        assert mock_file.call_args[0][1] == 'wb'
         handle = mock_file()
         handle.write.assert_called_once()
         
         # Check JSON content
         written_content = handle.write.call_args[0][0]
-        assert "Test summary" in written_content
-        assert "Actor1" in written_content
-        assert "T1234" in written_content
-    
-    # Test with error handling
-    with patch('builtins.open', side_effect=Exception("Test exception")):
-        result = export_analysis_as_json(analysis_data, "example.com")
-        
-        # Check result
-        assert result["success"] is False
-        assert "Error" in result["message"]
+        assert isinstance(written_content, bytes)
+        assert b"Test summary" in written_content
+        assert b"Actor1" in written_content
+        assert b"T1234" in written_content
 
-def test_export_analysis_as_csv():
+@pytest.mark.slow
+def test_export_analysis_as_csv(analysis_data, tmp_path):
     """Test exporting analysis as CSV."""
-    # Sample analysis data
-    analysis_data = {
-        "summary": "Test summary",
-        "source_evaluation": {
-            "reliability": "High",
-            "credibility": "Medium",
-            "source_type": "Blog"
-        },
-        "threat_actors": ["Actor1", "Actor2"],
-        "mitre_techniques": [
-            {"id": "T1234", "name": "Technique 1", "url": "https://attack.mitre.org/techniques/T1234"},
-            {"id": "T5678", "name": "Technique 2", "url": "https://attack.mitre.org/techniques/T5678"}
-        ],
-        "key_insights": ["Insight 1", "Insight 2"],
-        "source_bias": "Low bias",
-        "intelligence_gaps": ["Gap 1", "Gap 2"],
-        "critical_infrastructure_sectors": {
-            "Energy Sector": 4,
-            "Financial Services Sector": 2
-        }
-    }
-    
     # Test with file path provided
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        temp_path = temp_file.name
-    
-    try:
-        # Export to the temporary file
-        result = export_analysis_as_csv(analysis_data, "example.com", temp_path)
-        
-        # Check result
-        assert result["success"] is True
-        assert result["file_path"] == temp_path
-        
-        # Verify file contents
-        with open(temp_path, 'r', newline='') as f:
-            reader = csv.reader(f)
-            rows = list(reader)
-            
-            # Check headers and some content rows
-            assert "Category" in rows[0]
-            assert "Value" in rows[0]
-            
-            # Check for key content
-            found_items = set()
-            for row in rows:
-                if len(row) >= 2:
-                    if row[0] == "Summary":
-                        assert row[1] == "Test summary"
-                        found_items.add("summary")
-                    elif row[0] == "Reliability":
-                        assert row[1] == "High"
-                        found_items.add("reliability")
-                    elif row[0] == "Threat Actor":
-                        if row[1] == "Actor1":
-                            found_items.add("actor1")
-                        elif row[1] == "Actor2":
-                            found_items.add("actor2")
-                    elif row[0] == "MITRE Technique":
-                        if "T1234" in row[1]:
-                            found_items.add("mitre1")
-                        elif "T5678" in row[1]:
-                            found_items.add("mitre2")
-            
-            # Check that all expected items were found
-            assert "summary" in found_items
-            assert "reliability" in found_items
-            assert "actor1" in found_items
-            assert "actor2" in found_items
-            assert "mitre1" in found_items
-            assert "mitre2" in found_items
-            
-    finally:
-        # Clean up
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
-    
-    # Test without file path (should create in temp directory)
-    with patch('tempfile.gettempdir', return_value='/tmp'), \
-         patch('builtins.open', mock_open()) as mock_file:
-        
-        result = export_analysis_as_csv(analysis_data, "example.com")
-        
-        # Check result
-        assert result["success"] is True
-        assert "/tmp" in result["file_path"]
-        assert "example.com" in result["file_path"]
-        
-        # Verify file was created
-        mock_file.assert_called_once()
-    
-    # Test with error handling
-    with patch('builtins.open', side_effect=Exception("Test exception")):
-        result = export_analysis_as_csv(analysis_data, "example.com")
-        
-        # Check result
-        assert result["success"] is False
-        assert "Error" in result["message"]
+    temp_path = str(tmp_path / "analysis.csv")
+    
+    # Export to the temporary file
+    result = export_analysis_as_csv(analysis_data, "example.com", temp_path)
+    
+    # Check result
+    assert result["success"] is True
+    assert result["file_path"] == temp_path
+    
+    # Verify file contents
+    with open(temp_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        rows = list(reader)
+        
+        # Check headers and some content rows
+        assert "Category" in rows[0]
+        assert "Value" in rows[0]
+        
+        # Check for key content
+        found_items = set()
+        for row in rows:
+            if len(row) >= 2:
+                if row[0] == "Summary":
+                    assert row[1] == "Test summary"
+                    found_items.add("summary")
+                elif row[0] == "Reliability":
+                    assert row[1] == "High"
+                    found_items.add("reliability")
+                elif row[0] == "Threat Actor":
+                    if row[1] == "Actor1":
+                        found_items.add("actor1")
+                    elif row[1] == "Actor2":
+                        found_items.add("actor2")
+                elif row[0] == "MITRE Technique":
+                    if "T1234" in row[1]:
+                        found_items.add("mitre1")
+                    elif "T5678" in row[1]:
+                        found_items.add("mitre2")
+        
+        # Check that all expected items were found
+        assert "summary" in found_items
+        assert "reliability" in found_items
+        assert "actor1" in found_items
+        assert "actor2" in found_items
+        assert "mitre1" in found_items
+        assert "mitre2" in found_items
 
-def test_export_analysis_as_markdown():
+@pytest.mark.slow
+def test_export_analysis_as_markdown(analysis_data, tmp_path):
     """Test exporting analysis as Markdown."""
-    # Sample analysis data
-    analysis_data = {
-        "summary": "Test summary",
-        "source_evaluation": {
-            "reliability": "High",
-            "credibility": "Medium",
-            "source_type": "Blog"
-        },
-        "threat_actors": ["Actor1", "Actor2"],
-        "mitre_techniques": [
-            {"id": "T1234", "name": "Technique 1", "url": "https://attack.mitre.org/techniques/T1234"},
-            {"id": "T5678", "name": "Technique 2", "url": "https://attack.mitre.org/techniques/T5678"}
-        ],
-        "key_insights": ["Insight 1", "Insight 2"],
-        "source_bias": "Low bias",
-        "intelligence_gaps": ["Gap 1", "Gap 2"],
-        "critical_infrastructure_sectors": {
-            "Energy Sector": 4,
-            "Financial Services Sector": 2
-        }
-    }
-    
     # Test with file path provided
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        temp_path = temp_file.name
-    
-    try:
-        # Export to the temporary file
-        result = export_analysis_as_markdown(analysis_data, "example.com", temp_path)
-        
-        # Check result
-        assert result["success"] is True
-        assert result["file_path"] == temp_path
-        
-        # Verify file contents
-        with open(temp_path, 'r') as f:
-            content = f.read()
-            
-            # Check for key sections and formatting
-            assert "# Threat Intelligence Analysis: example.com" in content
-            assert "## Summary" in content
-            assert "Test summary" in content
-            assert "## Source Evaluation" in content
-            assert "**Reliability:** High" in content
-            assert "## Threat Actors" in content
-            assert "* Actor1" in content
-            assert "* Actor2" in content
-            assert "## MITRE ATT&CK Techniques" in content
-            assert "[T1234: Technique 1](https://attack.mitre.org/techniques/T1234)" in content
-            assert "## Critical Infrastructure Sectors" in content
-            assert "Energy Sector: 4/5" in content
-    
-    finally:
-        # Clean up
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
-    
-    # Test without file path (should create in temp directory)
+    temp_path = str(tmp_path / "analysis.md")
+    
+    # Export to the temporary file
+    result = export_analysis_as_markdown(analysis_data, "example.com", temp_path)
+    
+    # Check result
+    assert result["success"] is True
+    assert result["file_path"] == temp_path
+    
+    # Verify file contents
+    with open(temp_path, 'r') as f:
+        content = f.read()
+        
+        # Check for key sections and formatting
+        assert "# Threat Intelligence Analysis: example.com" in content
+        assert "## Summary" in content
+        assert "Test summary" in content
+        assert "## Source Evaluation" in content
+        assert "**Reliability:** High" in content
+        assert "## Threat Actors" in content
+        assert "* Actor1" in content
+        assert "* Actor2" in content
+        assert "## MITRE ATT&CK Techniques" in content
+        assert "[T1234: Technique 1](https://attack.mitre.org/techniques/T1234)" in content
+        assert "## Critical Infrastructure Sectors" in content
+        assert "Energy Sector: 4/5" in content
+
+@pytest.mark.parametrize("exporter", FILE_EXPORTERS)
+def test_export_uses_tempdir(exporter, analysis_data):
+    """Test that exports without a file path are written to the temp directory."""
     with patch('tempfile.gettempdir', return_value='/tmp'), \
          patch('builtins.open', mock_open()) as mock_file:
         
-        result = export_analysis_as_markdown(analysis_data, "example.com")
+        result = exporter(analysis_data, "example.com")
         
         # Check result
         assert result["success"] is True
@@ -272,15 +192,18 @@ def test_export_analysis_as_markdown():
         
         # Verify file was created
         mock_file.assert_called_once()
-    
-    # Test with error handling
+
+@pytest.mark.parametrize("exporter", FILE_EXPORTERS)
+def test_export_handles_errors(exporter, analysis_data):
+    """Test that export failures are reported rather than raised."""
     with patch('builtins.open', side_effect=Exception("Test exception")):
-        result = export_analysis_as_markdown(analysis_data, "example.com")
+        result = exporter(analysis_data, "example.com")
         
         # Check result
         assert result["success"] is False
         assert "Error" in result["message"]
 
+@pytest.mark.slow
 @pytest.mark.skip(reason="PDF generation requires external libraries that may not be available in CI")
 def test_export_analysis_as_pdf():
     """Test exporting analysis as PDF."""
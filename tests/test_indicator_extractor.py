@@ -1,3 +1,5 @@
+import re
+
 import pytest
 from unittest.mock import patch
 
@@ -6,147 +8,139 @@ from app.utilities.indicator_extractor import (
     validate_and_clean_indicators,
     format_indicators_for_display,
     REGEX_PATTERNS,
+    COMPILED_PATTERNS,
     FALSE_POSITIVES
 )
 
-def test_extract_indicators_ipv4():
-    """Test extraction of IPv4 addresses."""
-    content = """
-    This article discusses suspicious IP addresses.
-    The main C2 server was at 192.168.1.100.
-    Other addresses involved were 10.0.0.1 and 172.16.2.5.
-    
-    Also discovered was activity from 8.8.8.8 (Google DNS) and 1.1.1.1 (Cloudflare).
-    """
-    
-    indicators = extract_indicators(content)
-    assert "ipv4" in indicators
-    ipv4_indicators = indicators["ipv4"]
-    assert len(ipv4_indicators) > 0
-    
-    # Should find legitimate IPs
-    assert "192.168.1.100" in ipv4_indicators
-    assert "10.0.0.1" in ipv4_indicators
-    assert "172.16.2.5" in ipv4_indicators
-    
-    # Should filter out common DNS servers as potential false positives
-    # Note: This depends on how conservative the filtering is in the implementation
-    if len(FALSE_POSITIVES["ipv4"]) > 0:
-        for fp in FALSE_POSITIVES["ipv4"]:
-            if fp in ["8.8.8.8", "1.1.1.1"]:
-                assert fp not in ipv4_indicators
+def test_patterns_compiled_at_import():
+    """Test that every indicator pattern is compiled once at import and reused."""
+    assert COMPILED_PATTERNS.keys() == REGEX_PATTERNS.keys()
+    for indicator_type, pattern in COMPILED_PATTERNS.items():
+        assert isinstance(pattern, re.Pattern)
+        assert pattern.pattern == REGEX_PATTERNS[indicator_type]
+        assert pattern.flags & re.IGNORECASE
+    
+    # Extraction must use the shared compiled objects rather than recompiling
+    with patch("app.utilities.indicator_extractor.re.compile") as mock_compile:
+        extract_indicators("C2 at 192.168.1.100 exploiting CVE-2023-1234")
+    mock_compile.assert_not_called()
 
-def test_extract_indicators_domain():
-    """Test extraction of domain names."""
-    content = """
-    The attackers used evil-domain.com for phishing.
-    They also utilized malware.org and c2-server.net for command and control.
-    
-    Victims were directed to download files from legitimate-looking.com.
-    """
-    
-    indicators = extract_indicators(content)
-    assert "domain" in indicators
-    domain_indicators = indicators["domain"]
-    assert len(domain_indicators) > 0
-    
-    # Should find all domains
-    assert "evil-domain.com" in domain_indicators
-    assert "malware.org" in domain_indicators
-    assert "c2-server.net" in domain_indicators
-    assert "legitimate-looking.com" in domain_indicators
-    
-    # Test with a URL in the content
-    content_with_url = "The attackers used https://evil-domain.com/path/to/malware for distribution."
-    url_indicators = extract_indicators(content_with_url)
-    
-    # Should extract both the domain and the full URL
-    assert "evil-domain.com" in url_indicators["domain"]
-    assert "https://evil-domain.com/path/to/malware" in url_indicators["url"]
+# Sample article texts for the extraction cases below
+IPV4_CONTENT = """
+This article discusses suspicious IP addresses.
+The main C2 server was at 192.168.1.100.
+Other addresses involved were 10.0.0.1 and 172.16.2.5.
 
-def test_extract_indicators_cve():
-    """Test extraction of CVE identifiers."""
-    content = """
-    The attackers exploited CVE-2023-1234 and CVE-2022-5678.
-    They also attempted to use CVE-2021-98765 but were unsuccessful.
-    """
-    
-    indicators = extract_indicators(content)
-    assert "cve" in indicators
-    cve_indicators = indicators["cve"]
-    assert len(cve_indicators) == 3
-    
-    # Should find all CVEs
-    for cve in ["cve-2023-1234", "cve-2022-5678", "cve-2021-98765"]:
-        assert cve in cve_indicators or cve.upper() in cve_indicators
-    
-    # Test case insensitivity
-    content_lowercase = "The vulnerability cve-2023-1234 was exploited."
-    lowercase_indicators = extract_indicators(content_lowercase)
-    
-    # Check if the CVE is extracted in either lowercase or uppercase
-    lowercase_cves = lowercase_indicators["cve"]
-    assert "cve-2023-1234" in lowercase_cves or "CVE-2023-1234" in lowercase_cves
+Also discovered was activity from 8.8.8.8 (Google DNS) and 1.1.1.1 (Cloudflare).
+"""
 
-def test_extract_indicators_hash():
-    """Test extraction of file hashes."""
-    content = """
-    The malware had the following hashes:
-    MD5: 01234567890123456789012345678901
-    SHA1: 0123456789012345678901234567890123456789
-    SHA256: 0123456789012345678901234567890123456789012345678901234567890123
-    """
-    
-    indicators = extract_indicators(content)
-    
-    # Check MD5 hashes
-    assert "md5" in indicators
-    assert "01234567890123456789012345678901" in indicators["md5"]
-    
-    # Check SHA1 hashes
-    assert "sha1" in indicators
-    assert "0123456789012345678901234567890123456789" in indicators["sha1"]
-    
-    # Check SHA256 hashes
-    assert "sha256" in indicators
-    assert "0123456789012345678901234567890123456789012345678901234567890123" in indicators["sha256"]
+DOMAIN_CONTENT = """
+The attackers used evil-domain.com for phishing.
+They also utilized malware.org and c2-server.net for command and control.
 
-def test_extract_indicators_email():
-    """Test extraction of email addresses."""
-    content = """
-    The phishing campaign originated from attacker@evil-domain.com.
-    Multiple emails were used including support@fake-service.com and 
-    admin@malicious-site.org.
-    """
-    
-    indicators = extract_indicators(content)
-    assert "email" in indicators
-    email_indicators = indicators["email"]
-    assert len(email_indicators) == 3
-    
-    # Should find all email addresses
-    assert "attacker@evil-domain.com" in email_indicators
-    assert "support@fake-service.com" in email_indicators
-    assert "admin@malicious-site.org" in email_indicators
+Victims were directed to download files from legitimate-looking.com.
+"""
 
-def test_extract_indicators_mitre_technique():
-    """Test extraction of MITRE ATT&CK techniques."""
-    content = """
-    The attackers used techniques T1566 (Phishing) and T1204.002 (User Execution: Malicious File).
-    They also employed technique T1059 for execution of malicious code.
-    """
-    
-    indicators = extract_indicators(content)
-    assert "mitre_technique" in indicators
-    mitre_indicators = indicators["mitre_technique"]
-    assert len(mitre_indicators) == 3
-    
-    # Should find all MITRE techniques
-    assert "T1566" in mitre_indicators
-    assert "T1204.002" in mitre_indicators
-    assert "T1059" in mitre_indicators
+URL_CONTENT = "The attackers used https://evil-domain.com/path/to/malware for distribution."
+
+CVE_CONTENT = """
+The attackers exploited CVE-2023-1234 and CVE-2022-5678.
+They also attempted to use CVE-2021-98765 but were unsuccessful.
+"""
+
+HASH_CONTENT = """
+The malware had the following hashes:
+MD5: 01234567890123456789012345678901
+SHA1: 0123456789012345678901234567890123456789
+SHA256: 0123456789012345678901234567890123456789012345678901234567890123
+"""
+
+EMAIL_CONTENT = """
+The phishing campaign originated from attacker@evil-domain.com.
+Multiple emails were used including support@fake-service.com and 
+admin@malicious-site.org.
+"""
+
+MITRE_CONTENT = """
+The attackers used techniques T1566 (Phishing) and T1204.002 (User Execution: Malicious File).
+They also employed technique T1059 for execution of malicious code.
+"""
+
+COMPLEX_CONTENT = """
+Incident Report: Advanced Persistent Threat Campaign
+
+Executive Summary:
+On May 15, 2023, our security team detected suspicious activity from IP address 198.51.100.82.
+Further investigation revealed a spear-phishing campaign targeting executives with emails from
+ceo-office@company-spoofed.com containing malicious attachments.
+
+Technical Details:
+The attackers exploited CVE-2023-32456 in Microsoft Office to execute malicious code.
+Command and control was established with domains evil-c2-server.com and backup-c2.net.
+Additional infrastructure included 203.0.113.45 and 198.51.100.17.
+
+The malware used had the following hashes:
+- MD5: e1d4d4e856e546f95d30649f5178d334
+- SHA256: 7e59b8c53dc651a4eea52a6f42b888d192288bf89c35e8deeecc3dd4f151635a
+
+MITRE ATT&CK Techniques:
+The campaign utilized T1566.001 (Spearphishing Attachment), T1204.002 (User Execution: Malicious File),
+and T1027 (Obfuscated Files or Information) to evade detection.
+
+Remediation:
+Block all communication to the identified infrastructure and scan for indicators of compromise.
+Apply the patch for CVE-2023-32456 immediately.
+"""
+
+# (content, indicator type, values that must be found, values that must not be, exact match)
+EXTRACTION_CASES = [
+    pytest.param(IPV4_CONTENT, "ipv4", {"192.168.1.100", "10.0.0.1", "172.16.2.5"},
+                 FALSE_POSITIVES["ipv4"], False, id="ipv4"),
+    pytest.param(DOMAIN_CONTENT, "domain", {"evil-domain.com", "malware.org", "c2-server.net", "legitimate-looking.com"},
+                 set(), False, id="domain"),
+    pytest.param(URL_CONTENT, "domain", {"evil-domain.com"}, set(), False, id="domain-in-url"),
+    pytest.param(URL_CONTENT, "url", {"https://evil-domain.com/path/to/malware"}, set(), False, id="url"),
+    pytest.param(CVE_CONTENT, "cve", {"CVE-2023-1234", "CVE-2022-5678", "CVE-2021-98765"}, set(), True, id="cve"),
+    pytest.param("The vulnerability cve-2023-1234 was exploited.", "cve", {"CVE-2023-1234"}, set(), True,
+                 id="cve-lowercase"),
+    pytest.param(HASH_CONTENT, "md5", {"01234567890123456789012345678901"}, set(), False, id="md5"),
+    pytest.param(HASH_CONTENT, "sha1", {"0123456789012345678901234567890123456789"}, set(), False, id="sha1"),
+    pytest.param(HASH_CONTENT, "sha256", {"0123456789012345678901234567890123456789012345678901234567890123"},
+                 set(), False, id="sha256"),
+    pytest.param(EMAIL_CONTENT, "email", {"attacker@evil-domain.com", "support@fake-service.com", "admin@malicious-site.org"},
+                 set(), True, id="email"),
+    pytest.param(MITRE_CONTENT, "mitre_technique", {"T1566", "T1204.002", "T1059"}, set(), True, id="mitre"),
+    pytest.param(COMPLEX_CONTENT, "ipv4", {"198.51.100.82", "203.0.113.45", "198.51.100.17"}, set(), False,
+                 id="complex-ipv4"),
+    pytest.param(COMPLEX_CONTENT, "domain", {"evil-c2-server.com", "backup-c2.net", "company-spoofed.com"}, set(), False,
+                 id="complex-domain"),
+    pytest.param(COMPLEX_CONTENT, "email", {"ceo-office@company-spoofed.com"}, set(), False, id="complex-email"),
+    pytest.param(COMPLEX_CONTENT, "cve", {"CVE-2023-32456"}, set(), False, id="complex-cve"),
+    pytest.param(COMPLEX_CONTENT, "md5", {"e1d4d4e856e546f95d30649f5178d334"}, set(), False, id="complex-md5"),
+    pytest.param(COMPLEX_CONTENT, "sha256", {"7e59b8c53dc651a4eea52a6f42b888d192288bf89c35e8deeecc3dd4f151635a"},
+                 set(), False, id="complex-sha256"),
+    pytest.param(COMPLEX_CONTENT, "mitre_technique", {"T1566.001", "T1204.002", "T1027"}, set(), False,
+                 id="complex-mitre"),
+]
+
+@pytest.mark.parametrize("content,indicator_type,expected,unexpected,exact", EXTRACTION_CASES)
+def test_extract_indicators(cached_extract, content, indicator_type, expected, unexpected, exact):
+    """Test extraction of each indicator type from sample article text."""
+    indicators = cached_extract(content, None)
+    assert indicator_type in indicators
+    found = set(indicators[indicator_type])
+    
+    # CVE IDs are case-insensitive; extraction keeps the case used in the text
+    if indicator_type == "cve":
+        found = {value.upper() for value in found}
+    
+    if exact:
+        assert found == expected
+    else:
+        assert expected <= found
+    assert found.isdisjoint(unexpected)
 
-def test_extract_indicators_with_url_exclusion():
+def test_extract_indicators_with_url_exclusion(cached_extract):
     """Test extraction with URL exclusion."""
     content = """
     This article is from https://security-blog.com/2023/05/incident-report.
@@ -154,12 +148,12 @@ def test_extract_indicators_with_url_exclusion():
     """
     
     # Extract without excluding the source URL
-    indicators_without_exclusion = extract_indicators(content)
+    indicators_without_exclusion = cached_extract(content, None)
     assert "security-blog.com" in indicators_without_exclusion["domain"]
     assert "evil-domain.com" in indicators_without_exclusion["domain"]
     
     # Extract with excluding the source URL
-    indicators_with_exclusion = extract_indicators(content, url="https://security-blog.com/2023/05/incident-report")
+    indicators_with_exclusion = cached_extract(content, "https://security-blog.com/2023/05/incident-report")
     assert "security-blog.com" not in indicators_with_exclusion["domain"]
     assert "evil-domain.com" in indicators_with_exclusion["domain"]
 
@@ -186,6 +180,11 @@ def test_validate_and_clean_indicators():
     
     # Check that valid technique IDs are preserved
     assert "T1566" in cleaned["mitre_technique"] or any(t == "T1566" for t in cleaned["mitre_technique"])
+    
+    # Duplicates are dropped after normalization, keeping first-seen order
+    assert cleaned["ipv4"] == ["192.168.1.1", "999.999.999.999", "127.0.0.1"]
+    assert cleaned["cve"] == ["CVE-2023-1234"]
+    assert cleaned["mitre_technique"] == ["T1566", "T9999", "T1566.999"]
 
 def test_format_indicators_for_display():
     """Test formatting indicators for display."""
@@ -229,58 +228,3 @@ def test_format_indicators_for_display():
     other_category = formatted["categories"][2]
     assert other_category["name"] == "Other Indicators"
     assert len(other_category["types"]) == 3  # Email, CVE, MITRE
-
-def test_extract_indicators_complex_text():
-    """Test indicator extraction from complex text with mixed content."""
-    complex_content = """
-    Incident Report: Advanced Persistent Threat Campaign
-    
-    Executive Summary:
-    On May 15, 2023, our security team detected suspicious activity from IP address 198.51.100.82.
-    Further investigation revealed a spear-phishing campaign targeting executives with emails from
-    ceo-office@company-spoofed.com containing malicious attachments.
-    
-    Technical Details:
-    The attackers exploited CVE-2023-32456 in Microsoft Office to execute malicious code.
-    Command and control was established with domains evil-c2-server.com and backup-c2.net.
-    Additional infrastructure included 203.0.113.45 and 198.51.100.17.
-    
-    The malware used had the following hashes:
-    - MD5: e1d4d4e856e546f95d30649f5178d334
-    - SHA256: 7e59b8c53dc651a4eea52a6f42b888d192288bf89c35e8deeecc3dd4f151635a
-    
-    MITRE ATT&CK Techniques:
-    The campaign utilized T1566.001 (Spearphishing Attachment), T1204.002 (User Execution: Malicious File),
-    and T1027 (Obfuscated Files or Information) to evade detection.
-    
-    Remediation:
-    Block all communication to the identified infrastructure and scan for indicators of compromise.
-    Apply the patch for CVE-2023-32456 immediately.
-    """
-    
-    indicators = extract_indicators(complex_content)
-    
-    # Check IP addresses
-    assert "198.51.100.82" in indicators["ipv4"]
-    assert "203.0.113.45" in indicators["ipv4"]
-    assert "198.51.100.17" in indicators["ipv4"]
-    
-    # Check domains
-    assert "evil-c2-server.com" in indicators["domain"]
-    assert "backup-c2.net" in indicators["domain"]
-    assert "company-spoofed.com" in indicators["domain"]
-    
-    # Check emails
-    assert "ceo-office@company-spoofed.com" in indicators["email"]
-    
-    # Check CVEs
-    assert "CVE-2023-32456" in indicators["cve"]
-    
-    # Check hashes
-    assert "e1d4d4e856e546f95d30649f5178d334" in indicators["md5"]
-    assert "7e59b8c53dc651a4eea52a6f42b888d192288bf89c35e8deeecc3dd4f151635a" in indicators["sha256"]
-    
-    # Check MITRE techniques
-    assert "T1566.001" in indicators["mitre_technique"]
-    assert "T1204.002" in indicators["mitre_technique"]
-    assert "T1027" in indicators["mitre_technique"] 
\ No newline at end of file
@@ -1,18 +1,41 @@
 import pytest
 import os
+import re
 import tempfile
 import json
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 import time
 
+from app.utilities.article_extractor import extract_article_content
+from app.utilities.article_analyzer import analyze_article
+from app.utilities.indicator_extractor import extract_indicators
+from app.models.database import (
+    get_analysis_by_url, store_analyses_bulk, get_recent_analyses, update_analysis
+)
+
 # Mark all tests in this file as integration tests
 pytestmark = pytest.mark.integration
 
-@pytest.mark.slow
-def test_full_analysis_workflow_integration(client, mock_requests_get, mock_openai_completion):
-    """Test the full analysis workflow from URL submission to analysis completion."""
-    # Configure the mocks
-    mock_html_content = """
+# Text the analysis result page must show: analysis fields, then extracted indicators
+RESULT_PAGE_NEEDLES = frozenset({
+    b'TestGroup', b'T1566: Phishing', b'Energy Sector', b'Medium',
+    b'192.168.1.100', b'malicious-test-domain.com',
+})
+
+# One alternation over every needle, so the page body is scanned in a single pass
+_RESULT_PAGE_SCAN = re.compile(b'|'.join(re.escape(needle) for needle in sorted(RESULT_PAGE_NEEDLES)))
+
+def _missing_needles(scan, needles, body):
+    """Return the needles that a single scan of body did not find."""
+    return needles - set(scan.findall(body))
+
+def _html_response(text, content):
+    """Minimal stand-in for a successful requests.Response."""
+    return SimpleNamespace(status_code=200, text=text, content=content, raise_for_status=lambda: None)
+
+# Payloads shared across runs: built, serialized and encoded once at import
+WORKFLOW_HTML = """
     <html>
         <head><title>Test Cyber Threat Article</title></head>
         <body>
@@ -26,38 +49,82 @@ def test_full_analysis_workflow_integration(client, mock_requests_get, mock_open
         </body>
     </html>
     """
-    
+WORKFLOW_HTML_BYTES = WORKFLOW_HTML.encode('utf-8')
+WORKFLOW_ANALYSIS_JSON = json.dumps({
+    "summary": "Security researchers discovered a new threat actor called TestGroup using phishing techniques to target energy sector companies.",
+    "source_evaluation": {
+        "reliability": "Medium",
+        "credibility": "Medium",
+        "source_type": "Blog"
+    },
+    "threat_actors": ["TestGroup"],
+    "mitre_techniques": [
+        {"id": "T1566", "name": "Phishing", "url": "https://attack.mitre.org/techniques/T1566"}
+    ],
+    "key_insights": ["New threat actor discovered targeting energy sector", "Using phishing as primary attack vector"],
+    "source_bias": "Low bias",
+    "intelligence_gaps": ["Attribution details", "Campaign timeline"],
+    "critical_infrastructure_sectors": {
+        "Energy Sector": 5,
+        "Information Technology Sector": 2,
+        "Financial Services Sector": 1
+    }
+})
+
+ARTICLE_HTML = """
+    <html>
+        <body>
+            <h1>Test Article Title</h1>
+            <div class="content">
+                <p>This is a test article about a cybersecurity threat.</p>
+                <p>A threat actor group named "TestAPT" has been using malware to target organizations.</p>
+                <p>They utilize spear phishing (T1566) and command and control (T1105) techniques.</p>
+            </div>
+        </body>
+    </html>
+    """
+ARTICLE_HTML_BYTES = ARTICLE_HTML.encode('utf-8')
+ARTICLE_ANALYSIS_JSON = json.dumps({
+    "summary": "Test article about TestAPT threat actor using spear phishing and C2 techniques.",
+    "source_evaluation": {
+        "reliability": "Medium",
+        "credibility": "Medium"
+    },
+    "threat_actors": ["TestAPT"],
+    "mitre_techniques": [
+        {"id": "T1566", "name": "Phishing", "url": "https://attack.mitre.org/techniques/T1566"},
+        {"id": "T1105", "name": "Ingress Tool Transfer", "url": "https://attack.mitre.org/techniques/T1105"}
+    ]
+})
+
+INDICATOR_HTML = """
+    <html>
+        <body>
+            <h1>Test Article Title</h1>
+            <div class="content">
+                <p>This article contains various indicators of compromise.</p>
+                <p>IP addresses: 192.168.1.1, 10.0.0.1, 8.8.8.8</p>
+                <p>Domains: evil-domain.com, malware.test.org</p>
+                <p>Email: attacker@evil-domain.com</p>
+                <p>Hashes: 5f4dcc3b5aa765d61d8327deb882cf99 (MD5),
+                   da39a3ee5e6b4b0d3255bfef95601890afd80709 (SHA1)</p>
+                <p>CVEs: CVE-2021-44228, cve-2020-1234</p>
+            </div>
+        </body>
+    </html>
+    """
+INDICATOR_HTML_BYTES = INDICATOR_HTML.encode('utf-8')
+
+@pytest.mark.slow
+def test_full_analysis_workflow_integration(client, mock_requests_get, mock_openai_completion):
+    """Test the full analysis workflow from URL submission to analysis completion."""
+    # Configure the mocks
     mock_requests_get.return_value.status_code = 200
-    mock_requests_get.return_value.text = mock_html_content
-    mock_requests_get.return_value.content = mock_html_content.encode('utf-8')
+    mock_requests_get.return_value.text = WORKFLOW_HTML
+    mock_requests_get.return_value.content = WORKFLOW_HTML_BYTES
     
     # Mock OpenAI API response for analysis
-    mock_analysis_response = {
-        "choices": [{
-            "message": {
-                "content": json.dumps({
-                    "summary": "Security researchers discovered a new threat actor called TestGroup using phishing techniques to target energy sector companies.",
-                    "source_evaluation": {
-                        "reliability": "Medium",
-                        "credibility": "Medium",
-                        "source_type": "Blog"
-                    },
-                    "threat_actors": ["TestGroup"],
-                    "mitre_techniques": [
-                        {"id": "T1566", "name": "Phishing", "url": "https://attack.mitre.org/techniques/T1566"}
-                    ],
-                    "key_insights": ["New threat actor discovered targeting energy sector", "Using phishing as primary attack vector"],
-                    "source_bias": "Low bias",
-                    "intelligence_gaps": ["Attribution details", "Campaign timeline"],
-                    "critical_infrastructure_sectors": {
-                        "Energy Sector": 5,
-                        "Information Technology Sector": 2,
-                        "Financial Services Sector": 1
-                    }
-                })
-            }
-        }]
-    }
+    mock_analysis_response = {"choices": [{"message": {"content": WORKFLOW_ANALYSIS_JSON}}]}
     
     # Set up OpenAI API mock response
     mock_openai_completion.return_value = mock_analysis_response
@@ -77,23 +144,17 @@ def test_full_analysis_workflow_integration(client, mock_requests_get, mock_open
     status_url = location
     response = client.get(status_url)
     assert response.status_code == 200
-    assert b'Article extraction complete' in response.data
-    assert b'Analysis in progress' in response.data
+    body = response.data
+    assert b'Article extraction complete' in body
+    assert b'Analysis in progress' in body
     
     # Step 3: Get analysis results
     result_url = status_url.replace('/status', '/result')
     response = client.get(result_url)
     assert response.status_code == 200
     
-    # Check that the analysis data is displayed correctly
-    assert b'TestGroup' in response.data
-    assert b'T1566: Phishing' in response.data
-    assert b'Energy Sector' in response.data
-    assert b'Medium' in response.data  # Reliability rating
-    
-    # Check that extracted indicators are present
-    assert b'192.168.1.100' in response.data  # IP address
-    assert b'malicious-test-domain.com' in response.data  # Domain
+    # Check that the analysis data and extracted indicators are displayed
+    assert not _missing_needles(_RESULT_PAGE_SCAN, RESULT_PAGE_NEEDLES, response.data)
     
     # Step 4: Test export functionality
     # Create a temporary directory for exports
@@ -115,127 +176,80 @@ def test_full_analysis_workflow_integration(client, mock_requests_get, mock_open
             assert len(data['mitre_techniques']) > 0
 
 @pytest.mark.slow
-def test_database_persistence_integration():
+def test_database_persistence_integration(app):
     """Test that analyses are properly stored and retrieved from the database."""
-    from app.utilities.database import (
-        connect_db, close_db, get_analysis_by_url, store_analysis,
-        get_recent_analyses, update_analysis
-    )
+    # Runs against the session's shared in-memory database; rows are cleared after the test
+    test_url = 'https://test-site.com/integration-test'
+    test_analysis = {
+        'summary': 'Test summary for integration test',
+        'source_evaluation': {
+            'reliability': {'level': 'High', 'justification': 'Established vendor'},
+            'credibility': {'level': 'Medium', 'justification': 'Partially corroborated'},
+            'source_type': 'Cybersecurity Vendor'
+        },
+        'threat_actors': [{'name': 'TestActor', 'confidence': 'High'}],
+        'mitre_techniques': [
+            {'id': 'T1234', 'name': 'Test Technique', 'url': 'https://attack.mitre.org/techniques/T1234'}
+        ],
+        'key_insights': ['Test insight 1', 'Test insight 2']
+    }
+    article_fields = {
+        'title': 'Integration Test Article',
+        'content_length': len('Sample article text'),
+        'extraction_time': 1.5,
+        'analysis_time': 2.5,
+        'model': 'gpt-4o',
+        'raw_analysis': 'Sample article text',
+    }
     
-    # Initialize test DB
-    db_path = ':memory:'  # Use in-memory database for testing
-    connection = connect_db(db_path)
+    second_url = 'https://test-site.com/second-article'
     
-    try:
-        # Create necessary tables if they don't exist (connect_db should have done this)
-        # Add test data
-        test_url = 'https://test-site.com/integration-test'
-        test_analysis = {
-            'summary': 'Test summary for integration test',
-            'source_evaluation': {
-                'reliability': 'High',
-                'credibility': 'Medium',
-                'source_type': 'Cybersecurity Vendor'
-            },
-            'threat_actors': ['TestActor'],
-            'mitre_techniques': [
-                {'id': 'T1234', 'name': 'Test Technique', 'url': 'https://attack.mitre.org/techniques/T1234'}
-            ],
-            'key_insights': ['Test insight 1', 'Test insight 2'],
-            'extraction_time': 1.5,
-            'analysis_time': 2.5
-        }
-        
-        # Store analysis in DB
-        store_result = store_analysis(test_url, 'Sample article text', test_analysis, connection=connection)
-        assert store_result is True
+    with app.app_context():
+        # Store both analyses in one transaction, the second one newer
+        inserted = store_analyses_bulk([
+            {'url': test_url, 'structured_analysis': test_analysis,
+             'created_at': '2024-01-01T00:00:00', **article_fields},
+            {'url': second_url, 'structured_analysis': {**test_analysis, 'summary': 'Second article summary'},
+             'created_at': '2024-01-02T00:00:00', **article_fields},
+        ])
+        assert inserted == 2
         
         # Retrieve analysis by URL
-        stored_analysis = get_analysis_by_url(test_url, connection=connection)
+        stored_analysis = get_analysis_by_url(test_url)
         assert stored_analysis is not None
         assert stored_analysis['url'] == test_url
-        assert stored_analysis['analysis']['summary'] == 'Test summary for integration test'
-        assert 'TestActor' in stored_analysis['analysis']['threat_actors']
+        assert stored_analysis['structured_data']['summary'] == 'Test summary for integration test'
+        assert stored_analysis['source_reliability'] == 'High'
+        assert 'TestActor' in stored_analysis['threat_actors']
+        
+        # Get recent analyses; most recent should be first
+        recent = get_recent_analyses(limit=2)
+        assert [row['url'] for row in recent] == [second_url, test_url]
         
         # Update analysis
-        updated_analysis = test_analysis.copy()
-        updated_analysis['summary'] = 'Updated summary'
-        update_result = update_analysis(test_url, updated_analysis, connection=connection)
+        updated_analysis = {**test_analysis, 'summary': 'Updated summary'}
+        update_result = update_analysis(test_url, structured_analysis=updated_analysis, **article_fields)
         assert update_result is True
         
         # Verify update
-        retrieved_analysis = get_analysis_by_url(test_url, connection=connection)
-        assert retrieved_analysis['analysis']['summary'] == 'Updated summary'
-        
-        # Test get_recent_analyses
-        # Add another analysis to test ordering
-        store_analysis(
-            'https://test-site.com/second-article',
-            'Another test article text',
-            {**test_analysis, 'summary': 'Second article summary'},
-            connection=connection
-        )
-        
-        # Get recent analyses
-        recent = get_recent_analyses(limit=2, connection=connection)
-        assert len(recent) == 2
-        # Most recent should be first
-        assert recent[0]['url'] == 'https://test-site.com/second-article'
-        assert recent[1]['url'] == test_url
+        retrieved_analysis = get_analysis_by_url(test_url)
+        assert retrieved_analysis['structured_data']['summary'] == 'Updated summary'
         
-    finally:
-        # Clean up
-        close_db(connection)
+        # The update re-stamps created_at, so the refreshed report is now the most recent
+        recent = get_recent_analyses(limit=2)
+        assert [row['url'] for row in recent] == [test_url, second_url]
 
 @pytest.mark.slow
 def test_article_extraction_to_analysis_integration():
     """Test integration between article extraction and analysis components."""
-    from app.utilities.article_extractor import extract_article_content
-    from app.utilities.article_analyzer import analyze_article
-    
-    # Mock the HTML content and requests
-    html_content = """
-    <html>
-        <body>
-            <h1>Test Article Title</h1>
-            <div class="content">
-                <p>This is a test article about a cybersecurity threat.</p>
-                <p>A threat actor group named "TestAPT" has been using malware to target organizations.</p>
-                <p>They utilize spear phishing (T1566) and command and control (T1105) techniques.</p>
-            </div>
-        </body>
-    </html>
-    """
-    
-    with patch('requests.get') as mock_requests_get, \
+    with patch('app.utilities.article_extractor._SESSION.get') as mock_requests_get, \
          patch('app.utilities.article_analyzer.openai_completion') as mock_openai_completion:
         
-        # Configure request mock
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = html_content
-        mock_response.content = html_content.encode('utf-8')
-        mock_requests_get.return_value = mock_response
+        # Configure request mock; a plain namespace is all the extractor reads
+        mock_requests_get.return_value = _html_response(ARTICLE_HTML, ARTICLE_HTML_BYTES)
         
         # Configure OpenAI mock
-        mock_openai_response = {
-            "choices": [{
-                "message": {
-                    "content": json.dumps({
-                        "summary": "Test article about TestAPT threat actor using spear phishing and C2 techniques.",
-                        "source_evaluation": {
-                            "reliability": "Medium",
-                            "credibility": "Medium"
-                        },
-                        "threat_actors": ["TestAPT"],
-                        "mitre_techniques": [
-                            {"id": "T1566", "name": "Phishing", "url": "https://attack.mitre.org/techniques/T1566"},
-                            {"id": "T1105", "name": "Ingress Tool Transfer", "url": "https://attack.mitre.org/techniques/T1105"}
-                        ]
-                    })
-                }
-            }]
-        }
+        mock_openai_response = {"choices": [{"message": {"content": ARTICLE_ANALYSIS_JSON}}]}
         mock_openai_completion.return_value = mock_openai_response
         
         # Test the extraction
@@ -258,34 +272,9 @@ def test_article_extraction_to_analysis_integration():
 @pytest.mark.slow
 def test_indicator_extraction_integration():
     """Test integration between article extraction and indicator extraction."""
-    from app.utilities.article_extractor import extract_article_content
-    from app.utilities.indicator_extractor import extract_indicators
-    
-    # Mock HTML with various indicators
-    html_content = """
-    <html>
-        <body>
-            <h1>Test Article Title</h1>
-            <div class="content">
-                <p>This article contains various indicators of compromise.</p>
-                <p>IP addresses: 192.168.1.1, 10.0.0.1, 8.8.8.8</p>
-                <p>Domains: evil-domain.com, malware.test.org</p>
-                <p>Email: attacker@evil-domain.com</p>
-                <p>Hashes: 5f4dcc3b5aa765d61d8327deb882cf99 (MD5),
-                   da39a3ee5e6b4b0d3255bfef95601890afd80709 (SHA1)</p>
-                <p>CVEs: CVE-2021-44228, cve-2020-1234</p>
-            </div>
-        </body>
-    </html>
-    """
-    
-    with patch('requests.get') as mock_requests_get:
-        # Configure request mock
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = html_content
-        mock_response.content = html_content.encode('utf-8')
-        mock_requests_get.return_value = mock_response
+    with patch('app.utilities.article_extractor._SESSION.get') as mock_requests_get:
+        # Configure request mock; a plain namespace is all the extractor reads
+        mock_requests_get.return_value = _html_response(INDICATOR_HTML, INDICATOR_HTML_BYTES)
         
         # Extract the article content
         extracted_text = extract_article_content('https://test-site.com/indicator-article')
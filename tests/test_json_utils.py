@@ -0,0 +1,45 @@
+import json
+import math
+import datetime
+import pytest
+from app.utilities import json_utils
+from app.utilities.json_utils import json_loads, json_dumps, json_dumps_bytes
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with and without orjson."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_utils, "orjson", None)
+    return request.param
+
+DUMP_CASES = [
+    pytest.param({"a": [1, 2]}, id="nested"),
+    pytest.param({"name": "café"}, id="non-ascii"),
+    pytest.param({"big": 2 ** 70}, id="wide-int"),
+    pytest.param({1: "int-key"}, id="non-str-key"),
+]
+
+@pytest.mark.parametrize("obj", DUMP_CASES)
+def test_json_dumps_matches_stdlib(backend, obj):
+    """Test that both backends produce the stdlib's indented, unescaped output."""
+    expected = json.dumps(obj, indent=2, ensure_ascii=False)
+    assert json_dumps(obj) == expected
+    assert json_dumps_bytes(obj) == expected.encode('utf-8')
+
+def test_json_dumps_rejects_datetimes(backend):
+    """Test that datetimes raise TypeError as they do with the stdlib."""
+    with pytest.raises(TypeError):
+        json_dumps({"created": datetime.datetime(2024, 1, 1)})
+
+def test_json_loads_accepts_nan_literals(backend):
+    """Test that NaN written by json.dumps can be read back."""
+    assert math.isnan(json_loads(json.dumps({"score": float("nan")}))["score"])
+
+@pytest.mark.parametrize("value,error", [
+    ("{not json", json.JSONDecodeError),
+    (None, TypeError),
+])
+def test_json_loads_errors(backend, value, error):
+    """Test that bad input raises the same errors as the stdlib."""
+    with pytest.raises(error):
+        json_loads(value)
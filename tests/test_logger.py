@@ -1,84 +1,89 @@
 import pytest
-import os
 import logging
-import tempfile
-import shutil
 from unittest.mock import patch, MagicMock, mock_open
-import time
 
+from app.utilities import logger as logger_module
 from app.utilities.logger import setup_logging, get_logger, log_request, log_exception
 from app.utilities.logger import debug, info, warning, error, critical, print_status
 
-def test_setup_logging():
+# Shared logger mock; reset before each use instead of building a new MagicMock
+_LOGGER_MOCK = MagicMock()
+
+def _logger_mock():
+    """Return the shared logger mock with its calls and configured return values cleared."""
+    _LOGGER_MOCK.reset_mock(return_value=True, side_effect=True)
+    return _LOGGER_MOCK
+
+def _flush_logging(logger):
+    """Stop a setup_logging logger's queue listeners and flush their buffered handlers."""
+    for handler in logger.handlers:
+        listener = getattr(handler, 'listener', None)
+        if listener is not None:
+            listener.stop()
+            for target in listener.handlers:
+                target.flush()
+
+def test_setup_logging(tmp_path):
     """Test the setup_logging function."""
-    # Create a temporary directory for log files
-    temp_dir = tempfile.mkdtemp()
-    log_path = os.path.join(temp_dir, 'test.log')
+    log_path = tmp_path / 'test.log'
     
-    try:
-        # Test with default parameters
-        with patch('os.path.exists', return_value=False), \
-             patch('os.makedirs') as mock_makedirs, \
-             patch('os.environ.get') as mock_env_get:
-             
-            # Configure mock to return appropriate values based on key
-            def mock_env_side_effect(key, default=None):
-                if key == 'LOG_LEVEL':
-                    return 'INFO'
-                elif key == 'LOG_FORMAT':
-                    return '%(asctime)s - %(levelname)s - %(message)s'
-                elif key == 'FLASK_ENV':
-                    return None
-                return default
-                
-            mock_env_get.side_effect = mock_env_side_effect
-            
-            logger = setup_logging('test_logger', log_path)
-            
-            # Verify logger configuration
-            assert logger.name == 'test_logger'
-            assert logger.level == logging.INFO
-            
-            # Verify directory creation if it doesn't exist
-            mock_makedirs.assert_called_once()
-        
-        # Test with custom log level
-        with patch('os.path.exists', return_value=True), \
-             patch('os.environ.get') as mock_env_get:
-            
-            def mock_env_side_effect(key, default=None):
-                if key == 'LOG_LEVEL':
-                    return 'DEBUG'
-                elif key == 'LOG_FORMAT':
-                    return '%(asctime)s - %(levelname)s - %(message)s'
-                return default
-                
-            mock_env_get.side_effect = mock_env_side_effect
+    # Test with default parameters
+    with patch('os.path.exists', return_value=False), \
+         patch('os.makedirs') as mock_makedirs, \
+         patch('os.environ.get') as mock_env_get:
+         
+        # Configure mock to return appropriate values based on key
+        def mock_env_side_effect(key, default=None):
+            if key == 'LOG_LEVEL':
+                return 'INFO'
+            elif key == 'LOG_FORMAT':
+                return '%(asctime)s - %(levelname)s - %(message)s'
+            elif key == 'FLASK_ENV':
+                return None
+            return default
             
-            logger = setup_logging('test_logger_debug', log_path)
-            assert logger.level == logging.DEBUG
+        mock_env_get.side_effect = mock_env_side_effect
         
-        # Test with rotating file handler
-        logger = setup_logging('test_logger_rotating', log_path, max_bytes=1024, backup_count=3)
-        # Check that a handler was added
-        assert len(logger.handlers) > 0
+        logger = setup_logging('test_logger', log_path)
         
-        # Test actual file creation
-        logger = setup_logging('test_file_logger', log_path)
-        logger.info("Test log message")
+        # Verify logger configuration
+        assert logger.name == 'test_logger'
+        assert logger.level == logging.INFO
         
-        # Give the logger a moment to write to the file
-        time.sleep(0.1)
+        # Verify directory creation if it doesn't exist
+        mock_makedirs.assert_called_once()
+    
+    # Test with custom log level
+    with patch('os.path.exists', return_value=True), \
+         patch('os.environ.get') as mock_env_get:
         
-        # Check if the log file was created and contains the message
-        assert os.path.exists(log_path)
-        with open(log_path, 'r') as f:
-            log_content = f.read()
-            assert "Test log message" in log_content
+        def mock_env_side_effect(key, default=None):
+            if key == 'LOG_LEVEL':
+                return 'DEBUG'
+            elif key == 'LOG_FORMAT':
+                return '%(asctime)s - %(levelname)s - %(message)s'
+            return default
+            
+        mock_env_get.side_effect = mock_env_side_effect
         
-    finally:
-        # Clean up the temporary directory
-        shutil.rmtree(temp_dir)
+        logger = setup_logging('test_logger_debug', log_path)
+        assert logger.level == logging.DEBUG
+    
+    # Test with rotating file handler
+    logger = setup_logging('test_logger_rotating', log_path, max_bytes=1024, backup_count=3)
+    # Check that a handler was added
+    assert len(logger.handlers) > 0
+    
+    # Test actual file creation
+    logger = setup_logging('test_file_logger', log_path)
+    logger.info("Test log message")
+    
+    # Drain the queue and flush the buffered file handler before reading
+    _flush_logging(logger)
+    
+    # Check if the log file was created and contains the message
+    assert log_path.exists()
+    assert "Test log message" in log_path.read_text()
 
 def test_get_logger():
     """Test the get_logger function."""
@@ -107,28 +112,28 @@ def test_log_request():
     mock_request.user_agent.string = "Test User Agent"
     
     # Test basic request logging
-    with patch('app.utilities.logger.get_logger') as mock_get_logger:
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        
+    with patch.object(logger_module, '_REQ_LOGGER', _logger_mock()) as mock_logger:
         log_request(mock_request)
         
         # Verify the logger was called with the correct information
-        mock_get_logger.assert_called_once_with('requests')
         mock_logger.info.assert_called_once()
-        log_message = mock_logger.info.call_args[0][0]
+        log_format, *log_args = mock_logger.info.call_args.args
         
-        # Check log message contains request details
-        assert "GET" in log_message
-        assert "/test/path" in log_message
-        assert "127.0.0.1" in log_message
-        assert "Test User Agent" in log_message
+        # Request details are passed as arguments for lazy formatting
+        assert log_format == "Request: %s %s - IP: %s - User-Agent: %s"
+        assert log_args == ["GET", "/test/path", "127.0.0.1", "Test User Agent"]
+    
+    # Disabled INFO skips the call entirely
+    with patch.object(logger_module, '_REQ_LOGGER', _logger_mock()) as mock_logger:
+        mock_logger.isEnabledFor.return_value = False
+        log_request(mock_request)
+        mock_logger.info.assert_not_called()
 
 def test_log_exception():
     """Test the log_exception function."""
     # Test exception logging
     with patch('app.utilities.logger.get_logger') as mock_get_logger:
-        mock_logger = MagicMock()
+        mock_logger = _logger_mock()
         mock_get_logger.return_value = mock_logger
         
         try:
@@ -160,6 +165,8 @@ def test_logger_performance():
     logger.addHandler(test_handler)
     
     # Get the wrapped logger
+    # Drop cached loggers so get_logger goes through the patched getLogger
+    get_logger.cache_clear()
     with patch('logging.getLogger', return_value=logger):
         app_logger = get_logger('performance_test')
         
@@ -203,6 +210,8 @@ def test_logging_with_extra_context():
     logger.addHandler(test_handler)
     
     # Get wrapped logger
+    # Drop cached loggers so get_logger goes through the patched getLogger
+    get_logger.cache_clear()
     with patch('logging.getLogger', return_value=logger):
         app_logger = get_logger('context_test')
         
@@ -228,7 +237,7 @@ def test_logging_with_extra_context():
 def test_dedicated_logging_functions():
     """Test the dedicated logging functions."""
     # Setup a mock for the logger used by these functions
-    with patch('app.utilities.logger.logger') as mock_logger:
+    with patch('app.utilities.logger.logger', _logger_mock()) as mock_logger:
         # Test each dedicated function
         debug("Debug message")
         mock_logger.debug.assert_called_once_with("Debug message")
@@ -257,4 +266,17 @@ def test_dedicated_logging_functions():
         
         # Test print_status with is_error=True
         print_status("Error status message", is_error=True)
-        mock_logger.error.assert_called_once_with("Error status message") 
\ No newline at end of file
+        mock_logger.error.assert_called_once_with("Error status message") 
+
+def test_dedicated_logging_functions_skip_disabled_levels():
+    """Test that disabled levels return before reaching the logger."""
+    with patch('app.utilities.logger.logger', _logger_mock()) as mock_logger:
+        mock_logger.isEnabledFor.return_value = False
+        
+        debug("Debug message", request_id='abc-123')
+        info("Info message")
+        print_status("Status message")
+        
+        mock_logger.debug.assert_not_called()
+        mock_logger.info.assert_not_called()
+        mock_logger.log.assert_not_called()
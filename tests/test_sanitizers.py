@@ -1,28 +1,22 @@
 import pytest
 from app.utilities.sanitizers import sanitize_input
 
-def test_sanitize_input():
+SANITIZE_CASES = [
+    pytest.param("hello world", {}, "hello world", id="regular-string"),
+    pytest.param(None, {}, None, id="none"),
+    pytest.param(123, {}, 123, id="non-string"),
+    pytest.param("hello%20world", {}, "hello world", id="url-encoded"),
+    pytest.param("caf%C3%A9", {}, "café", id="url-encoded-utf8"),
+    # Quotes are converted to entities
+    pytest.param("<script>alert('XSS')</script>", {},
+                 "&lt;script&gt;alert(&#x27;XSS&#x27;)&lt;/script&gt;", id="html-escaped"),
+    pytest.param("<b>bold text</b>", {"allow_html": True}, "<b>bold text</b>", id="html-allowed"),
+    pytest.param("hello\0world", {}, "helloworld", id="null-bytes"),
+    pytest.param("<script>alert('XSS')</script>%20\0test", {},
+                 "&lt;script&gt;alert(&#x27;XSS&#x27;)&lt;/script&gt; test", id="combined-attacks"),
+]
+
+@pytest.mark.parametrize("value,kwargs,expected", SANITIZE_CASES)
+def test_sanitize_input(value, kwargs, expected):
     """Test the sanitize_input function."""
-    # Test with regular string
-    assert sanitize_input("hello world") == "hello world"
-    
-    # Test with None
-    assert sanitize_input(None) is None
-    
-    # Test with non-string
-    assert sanitize_input(123) == 123
-    
-    # Test with URL-encoded string
-    assert sanitize_input("hello%20world") == "hello world"
-    
-    # Test with HTML content - quotes are converted to entities
-    assert sanitize_input("<script>alert('XSS')</script>") == "&lt;script&gt;alert(&#x27;XSS&#x27;)&lt;/script&gt;"
-    
-    # Test with HTML content and allow_html=True
-    assert sanitize_input("<b>bold text</b>", allow_html=True) == "<b>bold text</b>"
-    
-    # Test with NULL bytes
-    assert sanitize_input("hello\0world") == "helloworld"
-    
-    # Test with combined attacks
-    assert sanitize_input("<script>alert('XSS')</script>%20\0test") == "&lt;script&gt;alert(&#x27;XSS&#x27;)&lt;/script&gt; test" 
\ No newline at end of file
+    assert sanitize_input(value, **kwargs) == expected
@@ -4,13 +4,15 @@ import signal
 import sys
 from app.utilities.logger import logger
 
+# Set by the signal handler; the main loop does the actual shutdown work
+_shutdown = False
+
 def graceful_shutdown(sig, frame):
-    """Test shutdown handler with simple output"""
-    logger.info("Graceful shutdown initiated...")
-    # Add a brief delay to simulate cleanup
-    time.sleep(0.5)
-    logger.info("Cleanup complete, exiting...")
-    sys.exit(0)
+    """Test shutdown handler that only flags the request and writes a notice"""
+    global _shutdown
+    _shutdown = True
+    # Raw write: the handler may interrupt code that holds the logging locks
+    os.write(2, b"shutdown initiated\n")
 
 if __name__ == "__main__":
     # Register signal handler
@@ -20,10 +22,16 @@ if __name__ == "__main__":
     
     try:
         # Keep running until interrupted
-        while True:
-            time.sleep(1)
-            print(".", end="", flush=True)
+        while not _shutdown:
+            time.sleep(1.0)
+            os.write(1, b".")
+        
+        logger.info("Graceful shutdown initiated...")
+        # Add a brief delay to simulate cleanup
+        time.sleep(0.5)
+        logger.info("Cleanup complete, exiting...")
+        sys.exit(0)
     except KeyboardInterrupt:
         logger.info("KeyboardInterrupt caught in main")
     finally:
-        logger.info("Finally block executed") 
\ No newline at end of file
+        logger.info("Finally block executed")
@@ -1,143 +1,129 @@
 import pytest
-from unittest.mock import patch, MagicMock
-import json
-import contextlib
-from flask import template_rendered, Flask
-import flask
+from types import MappingProxyType
 
-@contextlib.contextmanager
-def captured_templates(app):
-    """
-    Context manager to capture templates rendered during a request.
-    """
-    recorded = []
-    def record(sender, template, context, **extra):
-        recorded.append((template, context))
-    template_rendered.connect(record, app)
-    try:
-        yield recorded
-    finally:
-        template_rendered.disconnect(record, app)
+def _freeze(value):
+    """Wrap a dict, and every dict inside it, in a read-only MappingProxyType."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
 
-@pytest.fixture
-def mock_token_usage_stats():
-    return {
-        'models': {
-            'gpt-4o': {
-                'total_input': 3000,
-                'total_output': 2000,
-                'cached_input': 1000,
-                'regular_input': 2000
-            }
-        },
-        'overall': {
+# Shared by every test through the session fixtures, so all three payloads are
+# read-only; tests that need other data swap in their own objects
+TOKEN_USAGE_STATS = _freeze({
+    'models': {
+        'gpt-4o': {
             'total_input': 3000,
             'total_output': 2000,
             'cached_input': 1000,
-            'regular_input': 2000,
-            'total_tokens': 5000,
-            'model_count': 1
+            'regular_input': 2000
         }
+    },
+    'overall': {
+        'total_input': 3000,
+        'total_output': 2000,
+        'cached_input': 1000,
+        'regular_input': 2000,
+        'total_tokens': 5000,
+        'model_count': 1
     }
+})
+
+# The get_recent_analyses stub hands out dict copies of these rows
+RECENT_ANALYSES = (
+    MappingProxyType({
+        'id': 1,
+        'url': 'https://example.com/article1',
+        'title': 'Article 1',
+        'model': 'gpt-4o',
+        'content_length': 5000,
+        'created_at': '2023-06-01T10:00:00'
+    }),
+)
 
-@pytest.fixture
+MODEL_PRICES = _freeze({
+    'gpt-4o': {
+        'input': 10,
+        'output': 30,
+        'cached': 3
+    },
+    'gpt-4o-mini': {
+        'input': 5,
+        'output': 15,
+        'cached': 1
+    },
+    'gpt-4-turbo': {
+        'input': 10,
+        'output': 30,
+        'cached': 3
+    }
+})
+
+@pytest.fixture(scope="session")
+def mock_token_usage_stats():
+    return TOKEN_USAGE_STATS
+
+@pytest.fixture(scope="session")
 def mock_recent_analyses():
-    return [
-        {
-            'id': 1,
-            'url': 'https://example.com/article1',
-            'title': 'Article 1',
-            'model_id': 'gpt-4o',
-            'content_length': 5000,
-            'created_at': '2023-06-01T10:00:00'
-        }
-    ]
+    return RECENT_ANALYSES
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_model_prices():
-    return {
-        'gpt-4o': {
-            'input': 10,
-            'output': 30,
-            'cached': 3
-        },
-        'gpt-4o-mini': {
-            'input': 5,
-            'output': 15,
-            'cached': 1
-        },
-        'gpt-4-turbo': {
-            'input': 10,
-            'output': 30,
-            'cached': 3
-        }
+    return MODEL_PRICES
+
+@pytest.fixture(autouse=True)
+def patched_stats(monkeypatch, mock_token_usage_stats, mock_recent_analyses, mock_model_prices):
+    """Stub the statistics data sources with plain functions; tests override entries as needed."""
+    data = {
+        'token_usage_stats': mock_token_usage_stats,
+        'recent_analyses': mock_recent_analyses,
+        'model_prices': mock_model_prices,
     }
+    monkeypatch.setattr('app.blueprints.statistics.get_token_usage_stats',
+                        lambda: data['token_usage_stats'])
+    # Fresh rows per call, like the database; refresh_statistics rewrites created_at in place
+    monkeypatch.setattr('app.blueprints.statistics.get_recent_analyses',
+                        lambda limit=10: [dict(row) for row in data['recent_analyses']])
+    monkeypatch.setattr('app.blueprints.statistics.Config.get_model_prices',
+                        staticmethod(lambda: data['model_prices']))
+    monkeypatch.setattr('app.blueprints.statistics.Config.normalize_model_id',
+                        staticmethod(lambda model_id: 'gpt-4o'))
+    return data
 
-def test_statistics_endpoint(client, monkeypatch, mock_token_usage_stats, mock_recent_analyses, mock_model_prices):
-    """Test the statistics dashboard endpoint."""
+# The versioned ID has no price of its own; the view maps it to the base model's price
+@pytest.mark.parametrize("model_id", ["gpt-4o", "gpt-4o-2024-08-06"])
+def test_statistics_endpoint(client, patched_stats, mock_token_usage_stats, mock_recent_analyses, model_id):
+    """Test the statistics dashboard endpoint and model price normalization."""
+    patched_stats['token_usage_stats'] = {
+        **mock_token_usage_stats,
+        'models': {model_id: mock_token_usage_stats['models']['gpt-4o']},
+    }
+    patched_stats['recent_analyses'] = [{**row, 'model': model_id} for row in mock_recent_analyses]
     
-    # Patch the necessary functions
-    with patch('app.blueprints.statistics.get_token_usage_stats', return_value=mock_token_usage_stats), \
-         patch('app.blueprints.statistics.get_recent_analyses', return_value=mock_recent_analyses), \
-         patch('app.blueprints.statistics.Config.get_model_prices', return_value=mock_model_prices), \
-         patch('app.blueprints.statistics.Config.normalize_model_id', return_value='gpt-4o'):
-        
-        # Call the endpoint
-        response = client.get('/statistics')
-        
-        # Verify response
-        assert response.status_code == 200
-        # Validate that the response contains HTML
-        assert b'<!DOCTYPE html>' in response.data
-
-def test_refresh_statistics_endpoint(client, monkeypatch, mock_token_usage_stats, mock_recent_analyses, mock_model_prices):
-    """Test the statistics refresh endpoint."""
+    # Call the endpoint
+    response = client.get('/statistics')
     
-    # Patch the necessary functions
-    with patch('app.blueprints.statistics.get_token_usage_stats', return_value=mock_token_usage_stats), \
-         patch('app.blueprints.statistics.get_recent_analyses', return_value=mock_recent_analyses), \
-         patch('app.blueprints.statistics.Config.get_model_prices', return_value=mock_model_prices), \
-         patch('app.blueprints.statistics.Config.normalize_model_id', return_value='gpt-4o'):
-        
-        # Call the endpoint
-        response = client.get('/statistics/refresh')
-        
-        # Verify response
-        assert response.status_code == 200
-        # Check that it's the partial template (no doctype)
-        assert b'<!DOCTYPE html>' not in response.data
-        assert b'card-body' in response.data
+    # Verify response
+    assert response.status_code == 200
+    # Validate that the response is a full HTML page
+    assert response.data.startswith(b'<!DOCTYPE html>')
+    # gpt-4o pricing: (2000 * 10 + 1000 * 3 + 2000 * 30) / 1M
+    assert b'$0.083' in response.data
+    assert b'pricing unavailable' not in response.data
 
-def test_model_price_normalization(client, monkeypatch, mock_token_usage_stats, mock_model_prices):
-    """Test that model prices are properly normalized."""
+def test_refresh_statistics_endpoint(client):
+    """Test the statistics refresh endpoint."""
     
-    # Create a custom analyses list with a versioned model ID
-    custom_analyses = [
-        {
-            'id': 1,
-            'url': 'https://example.com/article1',
-            'title': 'Article 1',
-            'model_id': 'gpt-4o-2024-08-06',  # Using a versioned model ID
-            'content_length': 5000,
-            'created_at': '2023-06-01T10:00:00'
-        }
-    ]
+    # Call the endpoint
+    response = client.get('/statistics/refresh')
     
-    # Patch the necessary functions
-    with patch('app.blueprints.statistics.get_token_usage_stats', return_value=mock_token_usage_stats), \
-         patch('app.blueprints.statistics.get_recent_analyses', return_value=custom_analyses), \
-         patch('app.blueprints.statistics.Config.get_model_prices', return_value=mock_model_prices), \
-         patch('app.blueprints.statistics.Config.normalize_model_id', return_value='gpt-4o'):
-        
-        # Call the endpoint
-        response = client.get('/statistics')
-        
-        # Verify response
-        assert response.status_code == 200
-        # Check basic HTML content
-        assert b'<!DOCTYPE html>' in response.data
+    # Verify response
+    assert response.status_code == 200
+    # Check that it's the partial template (no doctype)
+    body = response.data
+    assert b'<!DOCTYPE html>' not in body
+    assert b'card-body' in body
 
-def test_empty_stats(client, monkeypatch):
+def test_empty_stats(client, patched_stats):
     """Test statistics endpoints with empty data."""
     
     # Create empty data for testing
@@ -161,16 +147,17 @@ def test_empty_stats(client, monkeypatch):
         }
     }
     
-    # Patch the necessary functions
-    with patch('app.blueprints.statistics.get_token_usage_stats', return_value=empty_stats), \
-         patch('app.blueprints.statistics.get_recent_analyses', return_value=empty_analyses), \
-         patch('app.blueprints.statistics.Config.get_model_prices', return_value=basic_model_prices), \
-         patch('app.blueprints.statistics.Config.normalize_model_id', return_value='gpt-4o'):
-        
-        # Test statistics page with empty data
-        response = client.get('/statistics')
-        assert response.status_code == 200
-        
-        # Test refresh endpoint with empty data
-        response = client.get('/statistics/refresh')
-        assert response.status_code == 200 
\ No newline at end of file
+    patched_stats['token_usage_stats'] = empty_stats
+    patched_stats['recent_analyses'] = empty_analyses
+    patched_stats['model_prices'] = basic_model_prices
+    
+    # Only the status matters here; HEAD still runs the view and renders the
+    # templates with empty data, but no body is sent back
+    
+    # Test statistics page with empty data
+    response = client.head('/statistics')
+    assert response.status_code == 200
+    
+    # Test refresh endpoint with empty data
+    response = client.head('/statistics/refresh')
+    assert response.status_code == 200 
\ No newline at end of file